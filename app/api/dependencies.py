@@ -1,42 +1,44 @@
-from typing import Generator, Optional
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import get_db
+from app.core.auth_cache import Principal, decode_token, resolve_principal, watch_user_model
 from app.core.config import settings
 from app.models.user import User
 from app.schemas.auth import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-def get_db() -> Generator:
-    """Database session dependency."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Toute modification ORM d'un utilisateur retire son entrée du cache
+watch_user_model(User)
 
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
-) -> User:
-    """Get current user from token."""
+) -> Principal:
+    """Get current user from token.
+
+    Le décodage du jeton et l'utilisateur sont mis en cache : une requête
+    authentifiée n'interroge la base (ni n'emprunte de connexion) qu'en
+    cas d'absence dans le cache.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
-        )
-        token_data = TokenPayload(**payload)
+        token_data = TokenPayload(**decode_token(token))
     except JWTError:
         raise credentials_exception
+    if token_data.sub is None:
+        raise credentials_exception
     
-    user = db.query(User).filter(User.id == token_data.sub).first()
+    user = resolve_principal(
+        token_data.sub, lambda sub: db.query(User).filter(User.id == sub).first()
+    )
     if not user:
         raise credentials_exception
     if not user.is_active:
@@ -44,8 +46,8 @@ def get_current_user(
     return user
 
 def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Get current active superuser."""
     if not current_user.is_superuser:
         raise HTTPException(
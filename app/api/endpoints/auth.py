@@ -1,10 +1,13 @@
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.api.dependencies import get_db, get_current_user
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.auth_cache import Principal
+from app.core.hashing import HashingOverloadedError, get_password_hash_async, verify_password_async
+from app.core.security import create_access_token
 from app.core.config import settings
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserInDB, Token
@@ -12,16 +15,33 @@ from app.core.security import generate_uuid
 
 router = APIRouter()
 
+def _too_many_requests(e: HashingOverloadedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, retry later",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
+
+    bcrypt runs in the dedicated hashing pool; 429 with Retry-After when it is full.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == form_data.username).first()
+    )
+    try:
+        valid = user is not None and await verify_password_async(
+            form_data.password, user.hashed_password
+        )
+    except HashingOverloadedError as e:
+        raise _too_many_requests(e)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -42,7 +62,7 @@ def login(
     }
 
 @router.post("/register", response_model=UserInDB)
-def register(
+async def register(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
@@ -50,35 +70,47 @@ def register(
     """
     Register new user.
     """
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == user_in.email).first()
+    )
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
     
-    user = db.query(User).filter(User.username == user_in.username).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == user_in.username).first()
+    )
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this username already exists in the system.",
         )
     
+    try:
+        hashed_password = await get_password_hash_async(user_in.password)
+    except HashingOverloadedError as e:
+        raise _too_many_requests(e)
     user = User(
         id=generate_uuid(),
         email=user_in.email,
         username=user_in.username,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         is_superuser=user_in.is_superuser,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+
+    def save():
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+
+    await run_in_threadpool(save)
     return user
 
 @router.get("/me", response_model=UserInDB)
 def read_users_me(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Get current user.
@@ -1,182 +1,205 @@
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.ml_models import MLModel as MLModelDB
-from app.models.dl_models import DLModel as DLModelDB
-from app.schemas.model import ModelCreate, ModelUpdate, ModelResponse
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.response_cache import last_modified, render_json, response_cache
+from app.db.session import get_async_db
+from app.db.migrations import REGISTRY_ARTIFACT_KIND
+from app.models.registry import ModelRegistry
+from app.schemas.model import (
+    ModelCreate, ModelUpdate, ModelResponse,
+    ModelBulkCreate, ModelBulkUpdate, ModelBulkDelete, BulkResponse
+)
+from app.services.bulk import bulk_insert, bulk_update, bulk_delete, summarize
+from app.services.artifact_store import artifact_store, ArtifactNotFoundError
+from app.services.model_cache import load_model, invalidate_model
+from app.services.micro_batching import micro_batcher, BatchMetrics
+from app.services.model_listing import list_models, InvalidCursorError, MAX_PAGE_SIZE
 
 router = APIRouter()
 
+# Table listée par GET /models (framework porté par la table)
+MODEL_SOURCES = [(ModelRegistry, None)]
+
+# Espace d'identifiants des artefacts et du cache des modèles du registre
+KIND = REGISTRY_ARTIFACT_KIND
+
+# Espace du cache de réponses des routes de lecture, vidé à chaque écriture
+RESPONSES = "models"
+
+def _to_response(db_model: ModelRegistry) -> dict:
+    return {
+        "id": db_model.id,
+        "name": db_model.name,
+        "type": db_model.type,
+        "framework": db_model.framework,
+        "accuracy": db_model.accuracy,
+        "created_at": db_model.created_at,
+        "description": db_model.description,
+        "parameters": db_model.parameters
+    }
+
 @router.get("/models", response_model=List[ModelResponse])
-async def get_models(db: Session = Depends(get_db)):
-    """Récupérer tous les modèles"""
-    try:
-        ml_models = db.query(MLModelDB).all()
-        dl_models = db.query(DLModelDB).all()
-        
-        # Combiner les modèles
-        all_models = []
-        for model in ml_models:
-            all_models.append({
-                "id": model.id,
-                "name": model.name,
-                "type": model.type,
-                "framework": "sklearn",
-                "accuracy": model.accuracy,
-                "created_at": model.created_at
-            })
-        
-        for model in dl_models:
-            all_models.append({
-                "id": model.id,
-                "name": model.name,
-                "type": model.type,
-                "framework": "pytorch",
-                "accuracy": model.accuracy,
-                "created_at": model.created_at
-            })
-        
-        return all_models
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def get_models(
+    request: Request,
+    framework: Optional[str] = None,
+    type: Optional[str] = None,
+    name: Optional[str] = None,
+    min_accuracy: Optional[float] = None,
+    max_accuracy: Optional[float] = None,
+    sort: str = Query("created_at", pattern="^(created_at|name|accuracy|id)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Récupérer les modèles, page par page.
+
+    Le curseur de la page suivante est renvoyé dans l'en-tête X-Next-Cursor
+    (absent sur la dernière page) et se repasse tel quel via `cursor`.
+    Les pages sont mises en cache avec un ETag : une requête
+    conditionnelle sur une page inchangée reçoit 304.
+    """
+    async def build():
+        try:
+            rows, next_cursor = await db.run_sync(
+                list_models, MODEL_SOURCES, framework=framework, model_type=type, name=name,
+                min_accuracy=min_accuracy, max_accuracy=max_accuracy,
+                sort=sort, order=order, limit=limit, cursor=cursor
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else {}
+        return render_json(List[ModelResponse], rows), headers
+
+    return await response_cache.respond(request, RESPONSES, build)
 
 @router.post("/models", response_model=ModelResponse)
-async def create_model(model: ModelCreate, db: Session = Depends(get_db)):
+async def create_model(model: ModelCreate, db: AsyncSession = Depends(get_async_db)):
     """Créer un nouveau modèle"""
     try:
-        if model.framework == "sklearn":
-            db_model = MLModelDB(
-                name=model.name,
-                type=model.type,
-                parameters=model.parameters,
-                accuracy=0.0
-            )
-        else:
-            db_model = DLModelDB(
-                name=model.name,
-                type=model.type,
-                parameters=model.parameters,
-                accuracy=0.0
-            )
-        
+        db_model = ModelRegistry(
+            framework=model.framework,
+            name=model.name,
+            type=model.type,
+            description=model.description,
+            parameters=model.parameters,
+            accuracy=0.0
+        )
         db.add(db_model)
-        db.commit()
-        db.refresh(db_model)
-        
-        return {
-            "id": db_model.id,
-            "name": db_model.name,
-            "type": db_model.type,
+        await db.commit()
+        await db.refresh(db_model)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    response_cache.invalidate(RESPONSES)
+    return _to_response(db_model)
+
+# Routes groupées déclarées avant /models/{model_id} pour ne pas être capturées ;
+# les fonctions synchrones de app.services.bulk passent par run_sync
+@router.post("/models/bulk", response_model=BulkResponse)
+async def bulk_create_models(payload: ModelBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """Créer plusieurs modèles en une transaction (INSERT multi-valeurs)"""
+    rows = [
+        {
             "framework": model.framework,
-            "accuracy": db_model.accuracy,
-            "created_at": db_model.created_at
+            "name": model.name,
+            "type": model.type,
+            "description": model.description,
+            "parameters": model.parameters,
+            "accuracy": 0.0
         }
+        for model in payload.models
+    ]
+    try:
+        results = await db.run_sync(bulk_insert, ModelRegistry, rows)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    response_cache.invalidate(RESPONSES)
+    return summarize(results, "created")
 
-@router.get("/models/{model_id}", response_model=ModelResponse)
-async def get_model(model_id: int, db: Session = Depends(get_db)):
-    """Récupérer un modèle spécifique"""
+@router.put("/models/bulk", response_model=BulkResponse)
+async def bulk_update_models(payload: ModelBulkUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Mettre à jour plusieurs modèles en une transaction"""
+    rows = [(item.id, item.dict(exclude_unset=True, exclude={"id"})) for item in payload.models]
     try:
-        # Chercher dans les modèles ML
-        model = db.query(MLModelDB).filter(MLModelDB.id == model_id).first()
-        if model:
-            return {
-                "id": model.id,
-                "name": model.name,
-                "type": model.type,
-                "framework": "sklearn",
-                "accuracy": model.accuracy,
-                "created_at": model.created_at
-            }
-        
-        # Chercher dans les modèles DL
-        model = db.query(DLModelDB).filter(DLModelDB.id == model_id).first()
-        if model:
-            return {
-                "id": model.id,
-                "name": model.name,
-                "type": model.type,
-                "framework": "pytorch",
-                "accuracy": model.accuracy,
-                "created_at": model.created_at
-            }
-        
-        raise HTTPException(status_code=404, detail="Model not found")
+        results = await db.run_sync(bulk_update, ModelRegistry, rows)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    response_cache.invalidate(RESPONSES)
+    for result in results:
+        if result["status"] == "updated":
+            invalidate_model(result["id"], kind=KIND)
+    return summarize(results, "updated")
+
+@router.post("/models/bulk/delete", response_model=BulkResponse)
+async def bulk_delete_models(payload: ModelBulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """Supprimer plusieurs modèles en une transaction"""
+    try:
+        results = await db.run_sync(bulk_delete, ModelRegistry, payload.ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    response_cache.invalidate(RESPONSES)
+    for result in results:
+        if result["status"] == "deleted":
+            artifact_store.delete(result["id"], kind=KIND)
+            invalidate_model(result["id"], kind=KIND)
+    return summarize(results, "deleted")
+
+@router.get("/models/{model_id}", response_model=ModelResponse)
+async def get_model(model_id: int, request: Request,
+                    db: AsyncSession = Depends(get_async_db)):
+    """Récupérer un modèle spécifique (mis en cache, ETag / Last-Modified / 304)"""
+    async def build():
+        db_model = await db.get(ModelRegistry, model_id)
+        if db_model is None:
+            raise HTTPException(status_code=404, detail="Model not found")
+        return (render_json(ModelResponse, _to_response(db_model)),
+                last_modified(db_model.updated_at or db_model.created_at))
+
+    return await response_cache.respond(request, RESPONSES, build)
 
 @router.put("/models/{model_id}", response_model=ModelResponse)
-async def update_model(model_id: int, model_update: ModelUpdate, db: Session = Depends(get_db)):
+async def update_model(model_id: int, model_update: ModelUpdate,
+                       db: AsyncSession = Depends(get_async_db)):
     """Mettre à jour un modèle"""
-    try:
-        # Chercher dans les modèles ML
-        db_model = db.query(MLModelDB).filter(MLModelDB.id == model_id).first()
-        if db_model:
-            for field, value in model_update.dict(exclude_unset=True).items():
-                setattr(db_model, field, value)
-            db.commit()
-            db.refresh(db_model)
-            return {
-                "id": db_model.id,
-                "name": db_model.name,
-                "type": db_model.type,
-                "framework": "sklearn",
-                "accuracy": db_model.accuracy,
-                "created_at": db_model.created_at
-            }
-        
-        # Chercher dans les modèles DL
-        db_model = db.query(DLModelDB).filter(DLModelDB.id == model_id).first()
-        if db_model:
-            for field, value in model_update.dict(exclude_unset=True).items():
-                setattr(db_model, field, value)
-            db.commit()
-            db.refresh(db_model)
-            return {
-                "id": db_model.id,
-                "name": db_model.name,
-                "type": db_model.type,
-                "framework": "pytorch",
-                "accuracy": db_model.accuracy,
-                "created_at": db_model.created_at
-            }
-        
+    db_model = await db.get(ModelRegistry, model_id)
+    if db_model is None:
         raise HTTPException(status_code=404, detail="Model not found")
+    try:
+        for field, value in model_update.dict(exclude_unset=True).items():
+            setattr(db_model, field, value)
+        await db.commit()
+        await db.refresh(db_model)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    invalidate_model(model_id, kind=KIND)
+    response_cache.invalidate(RESPONSES)
+    return _to_response(db_model)
 
 @router.delete("/models/{model_id}")
-async def delete_model(model_id: int, db: Session = Depends(get_db)):
+async def delete_model(model_id: int, db: AsyncSession = Depends(get_async_db)):
     """Supprimer un modèle"""
-    try:
-        # Chercher dans les modèles ML
-        model = db.query(MLModelDB).filter(MLModelDB.id == model_id).first()
-        if model:
-            db.delete(model)
-            db.commit()
-            return {"message": "Model deleted successfully"}
-        
-        # Chercher dans les modèles DL
-        model = db.query(DLModelDB).filter(DLModelDB.id == model_id).first()
-        if model:
-            db.delete(model)
-            db.commit()
-            return {"message": "Model deleted successfully"}
-        
+    db_model = await db.get(ModelRegistry, model_id)
+    if db_model is None:
         raise HTTPException(status_code=404, detail="Model not found")
+    try:
+        await db.delete(db_model)
+        await db.commit()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    artifact_store.delete(model_id, kind=KIND)
+    invalidate_model(model_id, kind=KIND)
+    response_cache.invalidate(RESPONSES)
+    return {"message": "Model deleted successfully"}
 
 @router.post("/models/{model_id}/train")
-def train_model(
+async def train_model(
     model_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Entraîne un modèle avec les données fournies."""
-    model = db.query(MLModelDB).filter(MLModelDB.id == model_id).first()
+    model = await db.get(ModelRegistry, model_id)
     if model is None:
         raise HTTPException(status_code=404, detail="Modèle non trouvé")
     
@@ -184,15 +207,53 @@ def train_model(
     return {"message": "Modèle entraîné avec succès"}
 
 @router.post("/models/{model_id}/predict")
-def predict(
+async def predict(
     model_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Fait des prédictions avec un modèle entraîné."""
-    model = db.query(MLModelDB).filter(MLModelDB.id == model_id).first()
+    """Fait des prédictions avec un modèle entraîné.
+
+    Les requêtes simultanées sur un même modèle sont regroupées en un seul
+    appel vectorisé (micro-batching). La taille de lot et l'attente maximale
+    se règlent par modèle via parameters["batching"].
+    """
+    model = await db.get(ModelRegistry, model_id)
     if model is None:
         raise HTTPException(status_code=404, detail="Modèle non trouvé")
     
-    # TODO: Implémenter les prédictions
-    return {"predictions": []} 
\ No newline at end of file
+    key = (KIND, model_id)
+    batching = (model.parameters or {}).get("batching") or {}
+    micro_batcher.configure(
+        key,
+        max_batch_size=batching.get("max_batch_size"),
+        max_wait_ms=batching.get("max_wait_ms")
+    )
+    
+    # Le modèle désérialisé est réutilisé entre les requêtes (cache LRU)
+    try:
+        await run_in_threadpool(load_model, model_id, None, KIND)
+    except ArtifactNotFoundError:
+        raise HTTPException(status_code=404, detail="Aucun artefact entraîné pour ce modèle")
+    
+    import pandas as pd
+    try:
+        data = await run_in_threadpool(pd.read_csv, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"CSV illisible : {e}")
+    try:
+        predictions = await micro_batcher.predict(
+            key, lambda rows: load_model(model_id, kind=KIND).predict(rows), data
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        # Données incompatibles avec le modèle (colonnes, types, dimensions)
+        raise HTTPException(status_code=422, detail=f"Prédiction impossible : {e}")
+    return {"predictions": predictions}
+
+@router.get("/models/{model_id}/predict/metrics")
+async def get_predict_metrics(model_id: int):
+    """Statistiques de micro-batching d'un modèle (remplissage, attente)."""
+    metrics = micro_batcher.metrics((KIND, model_id))
+    if metrics is None:
+        return BatchMetrics().snapshot()
+    return metrics
@@ -1,6 +1,13 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.services.backends import MODEL_BACKENDS
+from app.services.batch_forecasting import read_long_csv
+from app.services.datasets import dataset_store, DatasetNotFoundError, DatasetRegistry
 from app.services.time_series_training import TimeSeriesTrainer
-import pandas as pd
+from app.services.training_jobs import job_manager, QueueFullError
 from typing import Dict, Any
 import json
 
@@ -10,88 +17,137 @@ trainer = TimeSeriesTrainer()
 @router.post("/upload")
 async def upload_time_series_data(
     file: UploadFile = File(...),
-    target_column: str = None
+    target_column: str = None,
+    date_column: str = None,
+    db: Session = Depends(get_db)
 ):
-    """Upload time series data"""
+    """Upload time series data
+
+    The CSV is streamed in chunks into a columnar on-disk dataset; only the
+    header is read up front to validate the columns. Identical uploads are
+    deduplicated by content hash. Pass the returned `dataset_id` in
+    `parameters` to `/train` instead of inline data.
+    """
+    registry = DatasetRegistry(db)
     try:
-        # Read CSV file
-        df = pd.read_csv(file.file)
-        
-        # Validate target column
-        if target_column not in df.columns:
-            raise HTTPException(status_code=400, detail=f"Target column '{target_column}' not found in data")
-        
-        # Store data in session or temporary storage
-        # In a real application, you might want to store this in a database or file system
-        return {"message": "Data uploaded successfully"}
-    except Exception as e:
+        dataset, created = await run_in_threadpool(
+            registry.register_csv, file.file, target_column, date_column,
+            (), file.filename
+        )
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "message": "Data uploaded successfully" if created else "Data already uploaded",
+        "dataset_id": dataset.id,
+        "rows": dataset.rows,
+        "columns": dataset.columns,
+        "created": created
+    }
+
+@router.get("/datasets")
+def list_datasets(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+    """List registered datasets"""
+    return {"datasets": [_dataset_to_dict(d) for d in DatasetRegistry(db).list(skip, limit)]}
+
+@router.get("/datasets/{dataset_id}")
+def get_dataset(dataset_id: str, db: Session = Depends(get_db)):
+    """Get a registered dataset"""
+    dataset = DatasetRegistry(db).get(dataset_id)
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return _dataset_to_dict(dataset)
 
-@router.post("/train")
+@router.delete("/datasets/{dataset_id}")
+def delete_dataset(dataset_id: str, db: Session = Depends(get_db)):
+    """Delete a dataset and its files"""
+    if not DatasetRegistry(db).delete(dataset_id):
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return {"message": "Dataset deleted successfully"}
+
+def _dataset_to_dict(dataset):
+    return {
+        "id": dataset.id,
+        "name": dataset.name,
+        "target_column": dataset.target_column,
+        "date_column": dataset.date_column,
+        "columns": dataset.columns,
+        "rows": dataset.rows,
+        "size_bytes": dataset.size_bytes,
+        "upload_count": dataset.upload_count,
+        "created_at": dataset.created_at
+    }
+
+@router.post("/train", status_code=202)
 async def train_time_series_model(config: Dict[str, Any]):
-    """Train a time series model"""
+    """Submit a time series training job
+
+    Fitting runs in the background process pool; poll
+    `/jobs/{job_id}` for status and progress.
+    """
+    model_type = config.get("type")
+    if model_type not in MODEL_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported model type: {model_type}")
+    dataset_id = config.get("parameters", {}).get("dataset_id")
+    if dataset_id is not None:
+        try:
+            dataset_store.manifest(dataset_id)
+        except DatasetNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
     try:
-        # Get model type and parameters
-        model_type = config.get("type")
-        parameters = config.get("parameters", {})
-        forecast_horizon = config.get("forecast_horizon", 12)
-        validation_split = config.get("validation_split", 0.2)
-        
-        # Train model based on type
-        if model_type == "arima":
-            model = trainer.train_arima(
-                data=parameters.get("data"),
-                order=tuple(parameters.get("order", (1,1,1)))
-            )
-        elif model_type == "sarima":
-            model = trainer.train_sarima(
-                data=parameters.get("data"),
-                order=tuple(parameters.get("order", (1,1,1))),
-                seasonal_order=tuple(parameters.get("seasonal_order", (1,1,1,12)))
-            )
-        elif model_type == "prophet":
-            model = trainer.train_prophet(
-                data=parameters.get("data"),
-                seasonality_mode=parameters.get("seasonality_mode", "additive")
-            )
-        elif model_type == "lstm":
-            model = trainer.train_lstm(
-                data=parameters.get("data"),
-                sequence_length=parameters.get("sequence_length", 10),
-                epochs=parameters.get("epochs", 50)
-            )
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported model type: {model_type}")
-        
-        # Evaluate model
-        metrics = trainer.evaluate_model(
-            model=model,
-            test_data=parameters.get("test_data"),
-            model_type=model_type
-        )
-        
-        # Save model
-        model_data = {
-            "name": f"{model_type}_model",
-            "type": model_type,
-            "parameters": parameters,
-            "metrics": metrics,
-            "forecast_horizon": forecast_horizon,
-            "validation_split": validation_split
-        }
-        saved_model = trainer.save_model(model_data)
-        
-        return {
-            "model_id": saved_model.id,
-            "metrics": metrics,
-            "plot": {
-                "dates": parameters.get("dates").tolist(),
-                "actual": parameters.get("actual").tolist(),
-                "predicted": parameters.get("predicted").tolist()
-            }
-        }
+        job = await run_in_threadpool(job_manager.submit, config)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return job
+
+@router.post("/batch")
+async def batch_forecast(
+    file: UploadFile = File(...),
+    model_type: str = Form("arima"),
+    horizon: int = Form(12),
+    holdout: int = Form(0),
+    parameters: str = Form("{}")
+):
+    """Fit and forecast many series from one long-format CSV (series_id, ds, y)
+
+    Results are streamed as NDJSON, one line per series as soon as it is
+    done, followed by a summary line with throughput in series per second.
+    """
+    try:
+        model_parameters = json.loads(parameters)
+        frame = await run_in_threadpool(read_long_csv, file.file)
+        results = trainer.train_batch(
+            frame, model_type, model_parameters, horizon=horizon, holdout=holdout
+        )
+    except (ValueError, json.JSONDecodeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def stream():
+        try:
+            async for result in iterate_in_threadpool(results):
+                yield json.dumps(result) + "\n"
+        finally:
+            # Client déconnecté : les lots pas encore commencés sont annulés
+            results.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.get("/jobs/{job_id}")
+async def get_training_job(job_id: str):
+    """Get the status and progress of a training job"""
+    job = await run_in_threadpool(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.delete("/jobs/{job_id}")
+async def cancel_training_job(job_id: str):
+    """Cancel a queued job, or stop a running one at its next checkpoint"""
+    job = await run_in_threadpool(job_manager.cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @router.get("/models")
 async def get_time_series_models():
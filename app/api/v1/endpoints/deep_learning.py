@@ -1,12 +1,18 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.core.config import settings
 from app.schemas.deep_learning import (
     DeepLearningModelCreate,
     DeepLearningModelUpdate,
+    DeepLearningModelBulkUpdateItem,
     DeepLearningModelInDB
 )
+from app.schemas.model import BulkResponse
+from app.services.bulk import summarize
+from app.services.deep_learning_queries import MAX_PAGE_SIZE
+from app.services.model_listing import InvalidCursorError
 from app.services.deep_learning import DeepLearningService
 
 router = APIRouter()
@@ -21,6 +27,41 @@ def create_model(
     service = DeepLearningService(db)
     return service.create_model(model_in)
 
+# Routes groupées déclarées avant /{model_id}
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_create_models(
+    *,
+    db: Session = Depends(deps.get_db),
+    models_in: List[DeepLearningModelCreate] = Body(..., max_length=settings.MAX_BULK_ITEMS)
+):
+    """Crée plusieurs modèles en une transaction."""
+    service = DeepLearningService(db)
+    return summarize(service.bulk_create_models(models_in), "created")
+
+@router.put("/bulk", response_model=BulkResponse)
+def bulk_update_models(
+    *,
+    db: Session = Depends(deps.get_db),
+    models_in: List[DeepLearningModelBulkUpdateItem] = Body(..., max_length=settings.MAX_BULK_ITEMS)
+):
+    """Met à jour plusieurs modèles en une transaction."""
+    service = DeepLearningService(db)
+    updates = [
+        (item.id, DeepLearningModelUpdate(**item.dict(exclude_unset=True, exclude={"id"})))
+        for item in models_in
+    ]
+    return summarize(service.bulk_update_models(updates), "updated")
+
+@router.post("/bulk/delete", response_model=BulkResponse)
+def bulk_delete_models(
+    *,
+    db: Session = Depends(deps.get_db),
+    model_ids: List[int] = Body(..., max_length=settings.MAX_BULK_ITEMS)
+):
+    """Supprime plusieurs modèles en une transaction."""
+    service = DeepLearningService(db)
+    return summarize(service.bulk_remove(model_ids), "deleted")
+
 @router.get("/{model_id}", response_model=DeepLearningModelInDB)
 def get_model(
     model_id: int,
@@ -49,25 +90,32 @@ def update_model(
 
 @router.get("/", response_model=List[DeepLearningModelInDB])
 def list_models(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     model_type: Optional[str] = None,
     status: Optional[str] = None,
     min_accuracy: Optional[float] = None,
     max_accuracy: Optional[float] = None
 ):
-    """Liste tous les modèles avec filtres optionnels."""
-    service = DeepLearningService(db)
+    """Liste les modèles ; tous les filtres fournis sont combinés.
     
-    if model_type:
-        return service.get_by_type(model_type)
-    elif status:
-        return service.get_by_status(status)
-    elif min_accuracy is not None and max_accuracy is not None:
-        return service.get_by_accuracy_range(min_accuracy, max_accuracy)
-    else:
-        return service.get_multi(skip=skip, limit=limit)
+    Le curseur de la page suivante est renvoyé dans l'en-tête X-Next-Cursor.
+    """
+    service = DeepLearningService(db)
+    try:
+        models, next_cursor = service.query_models(
+            model_type=model_type, status=status,
+            min_accuracy=min_accuracy, max_accuracy=max_accuracy,
+            skip=skip, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return models
 
 @router.delete("/{model_id}")
 def delete_model(
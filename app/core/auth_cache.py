@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.core.config import settings
+
+# Clé de Session.info : utilisateurs modifiés, à invalider au commit
+_PENDING = "auth_cache_invalidate"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Instantané d'un utilisateur authentifié, détaché de toute session."""
+    id: str
+    email: str
+    username: str
+    is_active: bool
+    is_superuser: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        return cls(
+            id=str(user.id),
+            email=user.email,
+            username=user.username,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+class PrincipalCache:
+    """Cache LRU à courte durée de vie des utilisateurs, par sujet du jeton.
+
+    Propre au processus : une modification faite par un autre worker n'est
+    vue qu'après expiration de l'entrée (`ttl_seconds`).
+    """
+
+    def __init__(self, max_items: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_items = max_items if max_items is not None else settings.AUTH_CACHE_MAX_ITEMS
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.AUTH_CACHE_TTL_SECONDS
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or time.monotonic() - entry[1] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, subject: str, principal: Principal) -> None:
+        if not self.max_items or not self.ttl_seconds:
+            return
+        with self._lock:
+            self._entries.pop(subject, None)
+            self._entries[subject] = (principal, time.monotonic())
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"items": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache()
+
+
+@lru_cache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+def _decode_token(token: str) -> Dict[str, Any]:
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Décode et vérifie un JWT ; la vérification de signature d'un jeton
+    déjà vu est mémorisée, l'expiration est contrôlée à chaque appel."""
+    payload = _decode_token(token)
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise ExpiredSignatureError("Signature has expired.")
+    return dict(payload)
+
+
+def resolve_principal(subject: str,
+                      load_user: Callable[[str], Optional[Any]]) -> Optional[Principal]:
+    """Utilisateur du sujet `subject`, depuis le cache ou `load_user(subject)`.
+
+    Retourne None si l'utilisateur n'existe pas (rien n'est mis en cache).
+    """
+    principal = principal_cache.get(subject)
+    if principal is None:
+        user = load_user(subject)
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        principal_cache.put(subject, principal)
+    return principal
+
+
+def _on_user_change(mapper, connection, target) -> None:
+    subject = str(target.id)
+    principal_cache.invalidate(subject)
+    # Invalidé de nouveau au commit : une requête concurrente a pu remettre
+    # en cache la ligne encore non validée
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING, set()).add(subject)
+
+
+def _after_commit(session) -> None:
+    for subject in session.info.pop(_PENDING, ()):
+        principal_cache.invalidate(subject)
+
+
+def _after_rollback(session, previous_transaction) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def watch_user_model(user_cls: type) -> None:
+    """Invalide le cache à chaque mise à jour ou suppression ORM d'un
+    utilisateur (désactivation, droits, mot de passe...).
+
+    Les UPDATE/DELETE groupés hors unité de travail ne déclenchent pas ces
+    événements : appeler principal_cache.invalidate() après ceux-ci.
+    """
+    event.listen(user_cls, "after_update", _on_user_change)
+    event.listen(user_cls, "after_delete", _on_user_change)
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_rollback)
@@ -9,19 +9,53 @@ class Settings(BaseSettings):
     # CORS Configuration
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
     
+    # Requêtes groupées (création, mise à jour, suppression)
+    MAX_BULK_ITEMS: int = 1000  # Éléments maximum par requête
+    
     # Database Configuration
     DATABASE_URL: str = "sqlite:///./modelhub.db"
+    # Pool de connexions (par moteur : synchrone et asynchrone, par worker)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # secondes, Postgres uniquement
+    DB_POOL_PRE_PING: bool = True  # Postgres uniquement
+    # PRAGMA appliqués à chaque connexion SQLite (fichier)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
     
     # Security
     SECRET_KEY: str = "your-secret-key-here"  # À changer en production
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 jours
+    AUTH_CACHE_TTL_SECONDS: float = 30.0  # 0 : pas de cache des utilisateurs
+    AUTH_CACHE_MAX_ITEMS: int = 10_000
+    AUTH_TOKEN_CACHE_SIZE: int = 10_000  # Jetons dont le décodage est mémorisé
+    BCRYPT_ROUNDS: int = 12  # Facteur de coût (2^n itérations)
+    HASHING_WORKERS: int = 2  # Hachages bcrypt simultanés par worker
+    HASHING_MAX_QUEUE: int = 32  # Au-delà : 429 Too Many Requests
     
     # Model Storage
     MODEL_STORAGE_PATH: str = "models"
+    MODEL_CACHE_MAX_ITEMS: int = 32
+    MODEL_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 1 Go
+    MODEL_CACHE_TTL_SECONDS: int = 3600
+    # Cache des réponses GET /models (par worker ; 0 : désactivé)
+    RESPONSE_CACHE_MAX_ITEMS: int = 1024
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 Mo
+    RESPONSE_CACHE_TTL_SECONDS: float = 5.0  # Écritures des autres workers vues après ce délai
+    
+    # Dataset Storage
+    DATASET_STORAGE_PATH: str = "datasets"
+    INGEST_CHUNK_ROWS: int = 100_000
+    DATASET_MAX_OPEN_COLUMNS: int = 256  # Memmaps gardés ouverts par processus
     
     # Training Configuration
     MAX_WORKERS: int = 4
+    MAX_QUEUED_JOBS: int = 100
     BATCH_SIZE: int = 32
+    BATCH_MAX_WAIT_MS: float = 5.0  # Attente maximale du micro-batching en prédiction
     
     class Config:
         case_sensitive = True
@@ -0,0 +1,108 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+
+class HashingOverloadedError(Exception):
+    """Levée lorsque la file du pool de hachage est pleine (à traduire en 429)."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Trop de hachages en cours, réessayer dans {retry_after} s")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """Pool de threads dédié au hachage bcrypt, avec admission bornée.
+
+    bcrypt libère le GIL : les hachages s'exécutent hors de la boucle
+    d'événements et hors du pool de threads de Starlette, limités à
+    `max_workers` en parallèle. Au-delà de `max_workers + max_queued`
+    demandes en cours, les nouvelles sont refusées immédiatement plutôt que
+    mises en attente, avec une estimation du délai avant nouvel essai.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queued: Optional[int] = None):
+        self.max_workers = max_workers or settings.HASHING_WORKERS
+        self.max_queued = max_queued if max_queued is not None else settings.HASHING_MAX_QUEUE
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._avg_seconds = 0.0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="hashing")
+        return self._executor
+
+    def retry_after(self) -> int:
+        """Secondes estimées pour écouler les demandes en cours."""
+        waves = math.ceil(self._in_flight / self.max_workers)
+        return max(1, math.ceil(waves * self._avg_seconds))
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                raise HashingOverloadedError(self.retry_after())
+            self._in_flight += 1
+
+    def _timed(self, fn: Callable[..., Any], *args) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                # Moyenne glissante : suit un changement de BCRYPT_ROUNDS
+                self._avg_seconds = elapsed if not self.completed else \
+                    0.9 * self._avg_seconds + 0.1 * elapsed
+                self.completed += 1
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Exécute `fn(*args)` dans le pool ; HashingOverloadedError si la file est pleine."""
+        self._admit()
+        try:
+            future = self._get_executor().submit(self._timed, fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_hash_ms": self._avg_seconds * 1000,
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_pool.run(get_password_hash, password)
@@ -0,0 +1,183 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.core.config import settings
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0
+
+
+def render_json(schema: Any, data: Any) -> bytes:
+    """Valide `data` contre `schema` (comme response_model) et le sérialise en JSON."""
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _adapter(schema: Any) -> TypeAdapter:
+    adapter = _adapters.get(schema)
+    if adapter is None:
+        adapter = _adapters[schema] = TypeAdapter(schema)
+    return adapter
+
+
+def last_modified(value: Optional[datetime]) -> Dict[str, str]:
+    """En-tête Last-Modified d'un horodatage de ligne (naïf : UTC), ou aucun."""
+    if value is None:
+        return {}
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return {"Last-Modified": format_datetime(value.astimezone(timezone.utc), usegmt=True)}
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    """Validation conditionnelle (RFC 9110) : If-None-Match prime sur If-Modified-Since.
+
+    If-Modified-Since n'est honoré que si la réponse porte un Last-Modified
+    issu des données (un modèle : updated_at ou created_at). Une page de
+    liste n'en a pas : elle n'est validée que par son ETag.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or entry.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    modified = entry.headers.get("Last-Modified")
+    if not if_modified_since or modified is None:
+        return False
+    try:
+        return parsedate_to_datetime(modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+class ResponseCache:
+    """Cache des réponses JSON des routes de lecture, par espace de noms.
+
+    La clé est (espace, chemin, paramètres de requête triés). Une écriture
+    appelle invalidate(espace) : les entrées de l'espace sont retirées. Le
+    cache est propre au processus ; les écritures faites par un autre worker
+    ne sont vues qu'après `ttl_seconds`.
+    """
+
+    def __init__(self, max_items: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        self.max_items = max_items if max_items is not None else settings.RESPONSE_CACHE_MAX_ITEMS
+        self.max_bytes = max_bytes if max_bytes is not None else settings.RESPONSE_CACHE_MAX_BYTES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.RESPONSE_CACHE_TTL_SECONDS
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def key(namespace: str, request: Request) -> Tuple:
+        return (namespace, request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+    def _pop(self, key: Hashable) -> None:
+        self._bytes -= len(self._entries.pop(key).body)
+
+    def get(self, key: Tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry.stored_at > self.ttl_seconds:
+                if entry is not None:
+                    self._pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def put(self, key: Tuple, body: bytes, headers: Dict[str, str],
+            generation: int) -> CachedResponse:
+        """Enregistre une réponse calculée pour `generation` ; elle n'est pas
+        gardée si une écriture a eu lieu pendant le calcul."""
+        namespace = key[0]
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            headers=headers,
+            stored_at=time.monotonic(),
+        )
+        with self._lock:
+            if (not self.ttl_seconds or generation != self._generations.get(namespace, 0)
+                    or len(body) > self.max_bytes):
+                return entry
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_items or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+        return entry
+
+    def invalidate(self, namespace: str) -> None:
+        """À appeler après toute écriture touchant les réponses de `namespace`."""
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key in [k for k in self._entries if k[0] == namespace]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "items": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+            }
+
+    async def respond(self, request: Request, namespace: str,
+                      build: Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]]) -> Response:
+        """Réponse d'une route de lecture : 304 si le client a déjà la
+        version courante, sinon le corps en cache ou `build()` -> (corps
+        JSON, en-têtes supplémentaires)."""
+        key = self.key(namespace, request)
+        entry = self.get(key)
+        if entry is None:
+            generation = self.generation(namespace)
+            body, headers = await build()
+            entry = self.put(key, body, headers, generation)
+
+        validators = {
+            "ETag": entry.etag,
+            # Le client revalide à chaque fois (requête conditionnelle)
+            "Cache-Control": "no-cache",
+        }
+        if _not_modified(request, entry):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers={**entry.headers, **validators})
+        return Response(entry.body, media_type="application/json",
+                        headers={**entry.headers, **validators})
+
+
+response_cache = ResponseCache()
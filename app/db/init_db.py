@@ -4,11 +4,15 @@ from app.db.session import engine, SessionLocal
 from app.models.ml_model import MLModel
 from app.models.user import User
 from app.core.security import get_password_hash, generate_uuid
+from app.db.migrations import ensure_indexes, migrate_model_registry
 
 def init_db() -> None:
     """Initialize the database."""
     # Create all tables
     Base.metadata.create_all(bind=engine)
+    # Regrouper les anciennes tables ML / DL dans le registre unifié
+    migrate_model_registry(engine)
+    ensure_indexes(engine)
     
     # Create a session
     db = SessionLocal()
@@ -0,0 +1,79 @@
+from typing import Optional, Sequence, Tuple
+from sqlalchemy import MetaData, Table, func, inspect, insert, literal, select
+from sqlalchemy.engine import Engine
+from app.models.registry import ModelRegistry
+from app.services.artifact_store import ArtifactStore, artifact_store
+
+# Anciennes tables de modèles : (nom de table, framework, espace d'artefacts)
+LEGACY_MODEL_TABLES: Sequence[Tuple[str, str, str]] = (
+    ("ml_models", "sklearn", "ml"),
+    ("dl_models", "pytorch", "dl"),
+)
+
+# Colonnes copiées si elles existent dans l'ancienne table
+_COPIED_COLUMNS = ("name", "type", "description", "parameters", "accuracy", "created_at")
+
+# Espace d'artefacts des modèles du registre unifié
+REGISTRY_ARTIFACT_KIND = "model"
+
+
+def migrate_model_registry(engine: Engine,
+                           tables: Sequence[Tuple[str, str, str]] = LEGACY_MODEL_TABLES,
+                           store: Optional[ArtifactStore] = None) -> int:
+    """Copie les anciennes tables ML / DL dans model_registry.
+
+    Idempotente : une ligne déjà copiée (framework, legacy_id) n'est pas
+    recopiée, on peut donc l'appeler à chaque démarrage. Les artefacts
+    entraînés sont rattachés au nouvel identifiant. Retourne le nombre de
+    modèles copiés.
+    """
+    store = store or artifact_store
+    registry = ModelRegistry.__table__
+    registry.create(engine, checkfirst=True)
+    copied = 0
+
+    for table_name, framework, kind in tables:
+        if not inspect(engine).has_table(table_name):
+            continue
+        with engine.begin() as conn:
+            legacy = Table(table_name, MetaData(), autoload_with=conn)
+            columns = [c for c in _COPIED_COLUMNS if c in legacy.c]
+            last_id = conn.scalar(select(func.max(registry.c.id))) or 0
+            already = select(registry.c.legacy_id).where(
+                registry.c.framework == framework, registry.c.legacy_id.is_not(None)
+            )
+            rows = select(
+                literal(framework), legacy.c.id, *[legacy.c[c] for c in columns]
+            ).where(legacy.c.id.not_in(already))
+            result = conn.execute(
+                insert(registry).from_select(["framework", "legacy_id", *columns], rows)
+            )
+            copied += max(result.rowcount or 0, 0)
+
+            # Lignes copiées par cet appel uniquement
+            mapping = conn.execute(
+                select(registry.c.id, registry.c.legacy_id).where(
+                    registry.c.framework == framework, registry.c.id > last_id
+                )
+            ).all()
+        for new_id, legacy_id in mapping:
+            store.copy_versions(legacy_id, kind, new_id, REGISTRY_ARTIFACT_KIND)
+    return copied
+
+
+def ensure_indexes(engine: Engine, tables: Optional[Sequence[Table]] = None) -> int:
+    """Crée les index déclarés manquants (create_all ne modifie pas une
+    table existante). Retourne le nombre d'index créés."""
+    if tables is None:
+        from app.models.deep_learning import DeepLearningModel
+        tables = (DeepLearningModel.__table__,)
+    created = 0
+    for table in tables:
+        if not inspect(engine).has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspect(engine).get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(engine)
+                created += 1
+    return created
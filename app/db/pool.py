@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+import numpy as np
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+
+
+class PoolMetrics:
+    """Attente à l'emprunt d'une connexion du pool (checkout)."""
+
+    def __init__(self, window: int = 1000):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+        self._recent_waits = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.wait_sum_ms += wait_ms
+                self._recent_waits.append(wait_ms)
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = np.asarray(self._recent_waits) if self._recent_waits else None
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": self.wait_sum_ms / self.checkouts if self.checkouts else 0.0,
+                "p95_wait_ms": float(np.percentile(recent, 95)) if recent is not None else 0.0,
+                "max_wait_ms": self.wait_max_ms,
+            }
+
+
+def timed_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """Sous-classe de `base` qui mesure chaque emprunt de connexion.
+
+    La mesure est portée par la classe : elle survit à engine.dispose(),
+    qui recrée le pool à l'identique.
+    """
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.record((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        metrics.record((time.perf_counter() - start) * 1000)
+        return connection
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get, "metrics": metrics})
+
+
+def is_sqlite_memory(url: Any) -> bool:
+    url = make_url(url)
+    database = url.database or ""
+    return url.get_backend_name() == "sqlite" and (
+        database in ("", ":memory:") or "mode=memory" in str(url)
+    )
+
+
+def engine_options(url: str, is_async: bool = False,
+                   metrics: Optional[PoolMetrics] = None) -> Dict[str, Any]:
+    """Arguments de create_engine / create_async_engine selon le SGBD.
+
+    SQLite en mémoire garde le pool par défaut (une seule base par
+    connexion) ; les autres cas utilisent un QueuePool dimensionné par
+    Settings, mesuré par `metrics` si fourni.
+    """
+    url = make_url(url)
+    options: Dict[str, Any] = {}
+    if url.get_backend_name() == "sqlite":
+        if not is_async:
+            options["connect_args"] = {"check_same_thread": False}
+        if is_sqlite_memory(url):
+            return options
+    else:
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    poolclass = AsyncAdaptedQueuePool if is_async else QueuePool
+    options["poolclass"] = timed_pool_class(poolclass, metrics) if metrics is not None else poolclass
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def configure_engine(engine: Any) -> Any:
+    """Applique les PRAGMA SQLite (WAL, synchronous, mmap, busy_timeout) à
+    chaque nouvelle connexion ; sans effet pour les autres SGBD."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name == "sqlite" and not is_sqlite_memory(sync_engine.url):
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def pool_status(engine: Any) -> Dict[str, Any]:
+    """Occupation du pool d'un moteur et attentes mesurées (pool de timed_pool_class)."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    status: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
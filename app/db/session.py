@@ -1,12 +1,70 @@
+from typing import AsyncGenerator, Generator
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import PoolMetrics, configure_engine, engine_options, pool_status
 
-# Créer le moteur de base de données
-engine = create_engine(
+# Pilote asynchrone utilisé pour chaque SGBD
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+# Attente d'emprunt des connexions, par moteur (GET /api/v1/db/pool)
+pool_metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
+
+# Créer le moteur de base de données (pool et PRAGMA selon le SGBD)
+engine = configure_engine(create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Nécessaire pour SQLite
-)
+    **engine_options(settings.DATABASE_URL, metrics=pool_metrics["sync"])
+))
 
 # Créer la session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine) 
\ No newline at end of file
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_db() -> Generator:
+    """Database session dependency."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def async_database_url(url: str) -> str:
+    """Remplace le pilote d'une URL synchrone par son équivalent asynchrone.
+
+    sqlite:///x.db -> sqlite+aiosqlite:///x.db,
+    postgresql://... -> postgresql+asyncpg://...
+    """
+    url = make_url(url.replace("postgres://", "postgresql://", 1))
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Pas de pilote asynchrone pour {backend}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}") \
+        .render_as_string(hide_password=False)
+
+
+# Moteur asynchrone pour les routes async def : les allers-retours avec la
+# base ne bloquent pas la boucle d'événements
+async_engine = configure_engine(create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **engine_options(settings.DATABASE_URL, is_async=True, metrics=pool_metrics["async"])
+))
+
+# expire_on_commit=False : les objets restent lisibles après commit, sans
+# rechargement implicite (interdit hors de la boucle d'événements)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dépendance FastAPI : session asynchrone fermée en fin de requête."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_stats() -> dict:
+    """Occupation et attentes des pools des deux moteurs."""
+    return {"sync": pool_status(engine), "async": pool_status(async_engine)}
@@ -24,12 +24,26 @@ st.markdown("""
 # Configuration de l'API
 API_URL = "http://localhost:8000/api/v1"
 
+# Réponses GET déjà reçues, par URL : (ETag, contenu). Conservées entre
+# les réexécutions du script pour les requêtes conditionnelles.
+if "etag_cache" not in st.session_state:
+    st.session_state.etag_cache = {}
+
 # Fonction pour appeler l'API
 def call_api(endpoint: str, method: str = "GET", data: Dict[str, Any] = None) -> Dict[str, Any]:
     url = f"{API_URL}/{endpoint}"
     try:
         if method == "GET":
-            response = requests.get(url)
+            cached = st.session_state.etag_cache.get(url)
+            headers = {"If-None-Match": cached[0]} if cached else {}
+            response = requests.get(url, headers=headers)
+            if response.status_code == 304 and cached:
+                return cached[1]
+            response.raise_for_status()
+            result = response.json()
+            if "ETag" in response.headers:
+                st.session_state.etag_cache[url] = (response.headers["ETag"], result)
+            return result
         elif method == "POST":
             response = requests.post(url, json=data)
         elif method == "DELETE":
@@ -1,5 +1,9 @@
 from fastapi import FastAPI
 from app.api.endpoints import models, time_series
+from app.services.training_jobs import job_manager
+from app.services.micro_batching import micro_batcher
+from app.db.session import async_engine, pool_stats
+from app.core.hashing import hashing_pool
 
 app = FastAPI(
     title="ModelHub API",
@@ -11,6 +15,29 @@ app = FastAPI(
 app.include_router(models.router, prefix="/api/v1", tags=["models"])
 app.include_router(time_series.router, prefix="/api/v1/time-series", tags=["time-series"])
 
+@app.on_event("startup")
+def reconcile_training_jobs():
+    """Les tâches d'entraînement d'une exécution précédente ne reprendront pas"""
+    job_manager.reconcile()
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    """Arrête les pools d'entraînement et de prédiction"""
+    job_manager.shutdown()
+    time_series.trainer.shutdown()
+    micro_batcher.close()
+    hashing_pool.shutdown()
+
+@app.on_event("shutdown")
+async def close_database():
+    """Ferme les connexions du moteur asynchrone"""
+    await async_engine.dispose()
+
+@app.get("/api/v1/db/pool")
+def get_pool_stats():
+    """Occupation des pools de connexions et attente à l'emprunt (par worker)"""
+    return pool_stats()
+
 @app.get("/")
 async def root():
     """Point d'entrée de l'API"""
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, JSON
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class Dataset(Base):
+    __tablename__ = "datasets"
+
+    id = Column(String(64), primary_key=True)  # Empreinte du contenu et des colonnes retenues
+    content_hash = Column(String(64), nullable=False, index=True)  # SHA-256 du fichier brut
+    name = Column(String(255))  # Nom du fichier d'origine
+    target_column = Column(String(100), nullable=False)
+    date_column = Column(String(100))
+    columns = Column(JSON, nullable=False)
+    rows = Column(BigInteger, nullable=False)
+    size_bytes = Column(BigInteger)
+    upload_count = Column(Integer, default=1)  # Nombre d'envois dédupliqués
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
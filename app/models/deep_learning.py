@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 class DeepLearningModel(Base):
     __tablename__ = "deep_learning_models"
+    __table_args__ = (
+        # Filtres d'égalité de DeepLearningService.query_models suivis de id :
+        # la page est lue dans l'ordre de l'index, sans tri
+        Index("ix_deep_learning_models_type_status", "model_type", "status", "id"),
+        Index("ix_deep_learning_models_status", "status", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -14,7 +20,7 @@ class DeepLearningModel(Base):
     hyperparameters = Column(JSON)  # Training hyperparameters
     weights_path = Column(String(255))  # Path to model weights
     version = Column(String(20))
-    accuracy = Column(Float)
+    accuracy = Column(Float, index=True)
     status = Column(String(20), default="draft")  # draft, training, ready, archived
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
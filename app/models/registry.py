@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+# Framework -> espace d'identifiants des anciennes tables (migration)
+FRAMEWORKS = ("sklearn", "pytorch")
+
+class ModelRegistry(Base):
+    """Table unique des modèles ML et DL : un identifiant, un framework."""
+    __tablename__ = "model_registry"
+    __table_args__ = (
+        # Une ligne par modèle des anciennes tables (migration idempotente)
+        UniqueConstraint("framework", "legacy_id", name="uq_model_registry_legacy"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    framework = Column(String(20), nullable=False, index=True)  # sklearn, pytorch
+    name = Column(String(100), nullable=False)
+    type = Column(String(50), nullable=False)
+    description = Column(Text)
+    parameters = Column(JSON)
+    accuracy = Column(Float, default=0.0)
+    legacy_id = Column(Integer)  # Identifiant dans ml_models / dl_models avant migration
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+class TimeSeriesModel(Base):
+    __tablename__ = "time_series_models"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    type = Column(String(20), nullable=False)  # arima, sarima, prophet, lstm
+    parameters = Column(JSON)  # Paramètres d'entraînement (sans les données)
+    metrics = Column(JSON)  # rmse, mae, mape
+    forecast_horizon = Column(Integer)
+    validation_split = Column(Float)
+    job_id = Column(String(36), unique=True, index=True)  # Tâche d'entraînement en arrière-plan
+    status = Column(String(20), default="completed")  # queued, running, completed, failed, cancelled
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -1,9 +1,30 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+import sys
 import pandas as pd
 import numpy as np
 
+
+def estimate_nbytes(item: Any) -> int:
+    """Taille approximative d'un résultat (tableau, matrice creuse, texte, liste)."""
+    if isinstance(item, np.ndarray):
+        return item.nbytes
+    if hasattr(item, 'indptr'):
+        # Matrice creuse scipy
+        return item.data.nbytes + item.indices.nbytes + item.indptr.nbytes
+    if isinstance(item, (str, bytes, bytearray)):
+        return len(item)
+    if isinstance(item, (list, tuple)):
+        return sum(estimate_nbytes(x) for x in item)
+    return sys.getsizeof(item)
+
 class BasePreprocessor(ABC):
+    # Vrai si transform_item() traite un élément indépendamment des autres :
+    # Pipeline enchaîne alors ces étapes élément par élément, sans liste intermédiaire
+    elementwise = False
+    # Cache de résultats optionnel (voir set_cache)
+    _cache = None
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         self.is_fitted = False
@@ -20,15 +41,48 @@ class BasePreprocessor(ABC):
         if not self.is_fitted:
             raise ValueError("Le préprocesseur doit être ajusté avant la transformation.")
     
+    def transform_item(self, item: Any) -> Any:
+        """Transforme un seul élément (étapes élément par élément)."""
+        raise NotImplementedError
+    
+    def set_cache(self, cache: Optional[Any]) -> 'BasePreprocessor':
+        """Associe un TransformCache (None pour le retirer)."""
+        self._cache = cache
+        return self
+    
+    def cached_transform(self, data: Any) -> Any:
+        """Comme transform(), en réutilisant un résultat déjà calculé pour la
+        même configuration, le même état ajusté et les mêmes données."""
+        if self._cache is None:
+            return self.transform(data)
+        return self._cache.get_or_compute(self, data, self.transform)
+    
     def fit_transform(self, data: Any) -> Any:
         """Ajuste et transforme les données en une seule étape."""
         return self.fit(data).transform(data)
     
+    def get_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """Retourne l'état ajusté (hors config) : (valeurs JSON, tableaux NumPy)."""
+        return {'is_fitted': self.is_fitted}, {}
+    
+    def set_state(self, state: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        """Restaure l'état produit par get_state()."""
+        self.is_fitted = state.get('is_fitted', False)
+    
     def save(self, path: str) -> None:
-        """Sauvegarde le préprocesseur."""
-        raise NotImplementedError
+        """Sauvegarde le préprocesseur dans un dossier d'état versionné."""
+        from app.preprocessing.serialization import save_preprocessor
+        save_preprocessor(self, path)
     
     @classmethod
-    def load(cls, path: str) -> 'BasePreprocessor':
-        """Charge un préprocesseur sauvegardé."""
-        raise NotImplementedError 
\ No newline at end of file
+    def load(cls, path: str, mmap: bool = True, allow_pickle: bool = False) -> 'BasePreprocessor':
+        """Charge un préprocesseur sauvegardé.
+        
+        Les tableaux sont mappés en mémoire (lecture seule) par défaut ; les
+        anciens fichiers pickle exigent `allow_pickle=True`.
+        """
+        from app.preprocessing.serialization import load_preprocessor
+        preprocessor = load_preprocessor(path, mmap=mmap, allow_pickle=allow_pickle)
+        if not isinstance(preprocessor, cls):
+            raise TypeError(f"{path} contient un {type(preprocessor).__name__}, pas un {cls.__name__}")
+        return preprocessor 
\ No newline at end of file
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+import numpy as np
+from app.preprocessing.base import estimate_nbytes
+
+
+def _update(digest: Any, item: Any) -> None:
+    """Ajoute le contenu d'un élément d'entrée à l'empreinte."""
+    if isinstance(item, np.ndarray):
+        digest.update(f"nd:{item.dtype.str}:{item.shape}".encode())
+        digest.update(np.ascontiguousarray(item).data)
+    elif isinstance(item, str):
+        digest.update(b"s:" + item.encode("utf-8", "surrogatepass") + b"\0")
+    elif isinstance(item, (bytes, bytearray, memoryview)):
+        digest.update(b"b:%d:" % len(item))
+        digest.update(item)
+    elif isinstance(item, os.PathLike):
+        # Fichier désigné par un Path : taille et date de modification
+        stat = os.stat(item)
+        digest.update(f"p:{os.fspath(item)}:{stat.st_size}:{stat.st_mtime_ns}\0".encode())
+    elif isinstance(item, (list, tuple)):
+        digest.update(b"l:%d:" % len(item))
+        for x in item:
+            _update(digest, x)
+    elif hasattr(item, "to_numpy"):
+        _update(digest, item.to_numpy())
+    else:
+        digest.update(f"r:{item!r}\0".encode())
+
+
+def fingerprint_data(data: Any) -> str:
+    """Empreinte SHA-256 du contenu des données d'entrée.
+    
+    Les chaînes sont hachées telles quelles : un chemin d'image passé en
+    str est identifié par son nom, un pathlib.Path par sa taille et sa date.
+    """
+    digest = hashlib.sha256()
+    _update(digest, data)
+    return digest.hexdigest()
+
+
+def fingerprint_preprocessor(preprocessor: Any) -> str:
+    """Empreinte de la classe, de la config et de l'état ajusté."""
+    state, arrays = preprocessor.get_state()
+    digest = hashlib.sha256()
+    digest.update(type(preprocessor).__qualname__.encode())
+    digest.update(json.dumps([preprocessor.config, state], sort_keys=True, default=repr).encode())
+    for key in sorted(arrays):
+        digest.update(key.encode())
+        _update(digest, np.asarray(arrays[key]))
+    return digest.hexdigest()
+
+
+class TransformCache:
+    """Cache LRU des résultats de transform(), en mémoire et sur disque.
+    
+    La clé combine l'empreinte du préprocesseur (classe, config, état) et
+    celle des données. Les deux niveaux sont bornés en octets. Sur disque,
+    seuls les formats sûrs sont écrits : tableaux NumPy (.npy), matrices
+    creuses (.npz) et listes de chaînes (.json) ; les autres résultats
+    restent en mémoire.
+    """
+    
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2, path: Optional[str] = None,
+                 max_disk_bytes: int = 2 * 1024 ** 3):
+        self.max_bytes = max_bytes
+        self.path = Path(path) if path else None
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._disk: "OrderedDict[str, Tuple[Path, int]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path is not None:
+            self._scan_disk()
+    
+    def _scan_disk(self) -> None:
+        """Reconstruit l'index disque, du moins récemment utilisé au plus récent."""
+        files = [p for p in self.path.glob("*/*") if not p.name.startswith(".tmp-")]
+        for file in sorted(files, key=lambda p: p.stat().st_mtime_ns):
+            size = file.stat().st_size
+            self._disk[file.stem] = (file, size)
+            self._disk_bytes += size
+    
+    def key(self, preprocessor: Any, data: Any) -> str:
+        return hashlib.sha256(
+            f"{fingerprint_preprocessor(preprocessor)}:{fingerprint_data(data)}".encode()
+        ).hexdigest()
+    
+    @staticmethod
+    def _freeze(value: Any) -> Any:
+        # Le résultat est partagé entre appels : on interdit sa modification
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        return value
+    
+    @staticmethod
+    def _thaw(value: Any) -> Any:
+        return list(value) if isinstance(value, list) else value
+    
+    # Mémoire
+    
+    def _put_memory(self, key: str, value: Any, size: int) -> None:
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+    
+    # Disque
+    
+    def _read_disk(self, key: str) -> Optional[Any]:
+        entry = self._disk.get(key)
+        if entry is None:
+            return None
+        file, _ = entry
+        try:
+            if file.suffix == ".npy":
+                value = np.load(file, allow_pickle=False)
+            elif file.suffix == ".npz":
+                import scipy.sparse as sp
+                value = sp.load_npz(file)
+            else:
+                with open(file) as f:
+                    value = json.load(f)
+            os.utime(file)
+        except (OSError, ValueError):
+            self._drop_disk(key)
+            return None
+        self._disk.move_to_end(key)
+        return value
+    
+    def _write_disk(self, key: str, value: Any) -> None:
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            suffix = ".npy"
+        elif hasattr(value, "indptr"):
+            suffix = ".npz"
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+            suffix = ".json"
+        else:
+            return
+        folder = self.path / key[:2]
+        folder.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if suffix == ".npy":
+                    np.save(f, value, allow_pickle=False)
+                elif suffix == ".npz":
+                    import scipy.sparse as sp
+                    sp.save_npz(f, value)
+                else:
+                    f.write(json.dumps(value).encode())
+            file = folder / f"{key}{suffix}"
+            os.replace(tmp, file)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        size = file.stat().st_size
+        self._drop_disk(key, unlink=False)
+        self._disk[key] = (file, size)
+        self._disk_bytes += size
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            oldest = next(iter(self._disk))
+            self._drop_disk(oldest)
+            self.evictions += 1
+    
+    def _drop_disk(self, key: str, unlink: bool = True) -> None:
+        entry = self._disk.pop(key, None)
+        if entry is None:
+            return
+        self._disk_bytes -= entry[1]
+        if unlink:
+            try:
+                entry[0].unlink()
+            except FileNotFoundError:
+                pass
+    
+    # API
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._thaw(entry[0])
+            if self.path is not None:
+                value = self._read_disk(key)
+                if value is not None:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    value = self._freeze(value)
+                    self._put_memory(key, value, estimate_nbytes(value))
+                    return self._thaw(value)
+            self.misses += 1
+            return None
+    
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            value = self._freeze(value)
+            self._put_memory(key, value, estimate_nbytes(value))
+            if self.path is not None:
+                self._write_disk(key, value)
+    
+    def get_or_compute(self, preprocessor: Any, data: Any,
+                       compute: Callable[[Any], Any]) -> Any:
+        """Retourne le résultat en cache ou appelle `compute(data)` et le conserve.
+        
+        Un itérateur est d'abord matérialisé, l'empreinte le parcourant.
+        """
+        if isinstance(data, Iterator):
+            data = list(data)
+        key = self.key(preprocessor, data)
+        value = self.get(key)
+        if value is None:
+            value = compute(data)
+            self.put(key, value)
+            value = self._thaw(value)
+        return value
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for key in list(self._disk):
+                self._drop_disk(key)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "items": len(self._entries),
+                "bytes": self._bytes,
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,116 @@
+import os
+import queue
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Tuple, Union
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+# Dossier, archive zip/tar, ou itérable de chemins / octets / images décodées
+DatasetSource = Union[str, os.PathLike, Iterable[Any]]
+
+
+def _is_image(name: str) -> bool:
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def iter_image_sources(source: DatasetSource) -> Iterator[Tuple[str, Any]]:
+    """Énumère paresseusement les images d'une source sous forme (nom, image).
+    
+    Pour un dossier, l'image est son chemin (lu au décodage) ; pour une
+    archive, ses octets sont lus une entrée à la fois.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = Path(source)
+        if path.is_dir():
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if _is_image(name):
+                        yield os.path.join(root, name), os.path.join(root, name)
+        elif zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and _is_image(info.filename):
+                        yield info.filename, archive.read(info)
+        elif tarfile.is_tarfile(path):
+            # Mode flux : l'archive est lue séquentiellement, sans index
+            with tarfile.open(path, 'r|*') as archive:
+                for member in archive:
+                    if member.isfile() and _is_image(member.name):
+                        yield member.name, archive.extractfile(member).read()
+        else:
+            raise ValueError(f"Source d'images non reconnue : {source}")
+    else:
+        for index, item in enumerate(source):
+            name = os.fspath(item) if isinstance(item, (str, os.PathLike)) else str(index)
+            yield name, item
+
+
+class BatchPrefetcher:
+    """Produit les lots dans un thread d'arrière-plan, au plus `prefetch` d'avance.
+    
+    La file bornée limite la mémoire à quelques lots quelle que soit la
+    taille du jeu de données. Les exceptions du producteur sont relevées
+    côté consommateur.
+    """
+    
+    _DONE = object()
+    
+    def __init__(self, batches: Iterator[Any], prefetch: int = 2):
+        self._queue = queue.Queue(maxsize=max(prefetch, 1))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, args=(batches,), daemon=True)
+        self._thread.start()
+    
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _produce(self, batches: Iterator[Any]) -> None:
+        try:
+            for batch in batches:
+                if not self._put((batch, None)):
+                    return
+        except BaseException as e:
+            self._put((None, e))
+        finally:
+            self._put((self._DONE, None))
+    
+    def __iter__(self) -> 'BatchPrefetcher':
+        return self
+    
+    def __next__(self) -> Any:
+        if self._stop.is_set():
+            raise StopIteration
+        batch, error = self._queue.get()
+        if error is not None:
+            self.close()
+            raise error
+        if batch is self._DONE:
+            self._stop.set()
+            raise StopIteration
+        return batch
+    
+    def close(self) -> None:
+        """Arrête le producteur et libère les lots en attente."""
+        self._stop.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._thread.join()
+    
+    def __enter__(self) -> 'BatchPrefetcher':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
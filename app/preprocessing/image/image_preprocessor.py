@@ -1,16 +1,39 @@
-from typing import List, Optional, Dict, Any, Tuple
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Iterator, List, Optional, Dict, Any, Tuple, Union
 import cv2
 import numpy as np
 from PIL import Image
 from app.preprocessing.base import BasePreprocessor
+from app.preprocessing.image.image_loader import BatchPrefetcher, DatasetSource, iter_image_sources
+from app.utils.iteration import iter_chunks
+
+# Une image peut être fournie décodée (RGB), par son chemin ou encodée (octets)
+ImageSource = Union[np.ndarray, str, bytes]
+
+# Pools de décodage partagés entre les appels, un par nombre de threads
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _shared_executor(workers: int) -> ThreadPoolExecutor:
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = _executors[workers] = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="image-preprocessing"
+            )
+        return executor
 
 class ImagePreprocessor(BasePreprocessor):
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         super().__init__(config)
-        self.target_size = config.get('target_size', (224, 224))
-        self.normalize = config.get('normalize', True)
-        self.mean = config.get('mean', [0.485, 0.456, 0.406])
-        self.std = config.get('std', [0.229, 0.224, 0.225])
+        self.target_size = tuple(self.config.get('target_size', (224, 224)))
+        self.normalize = self.config.get('normalize', True)
+        self.mean = self.config.get('mean', [0.485, 0.456, 0.406])
+        self.std = self.config.get('std', [0.229, 0.224, 0.225])
+        self.num_workers = self.config.get('num_workers', os.cpu_count() or 1)
     
     def _resize_image(self, image: np.ndarray) -> np.ndarray:
         """Redimensionne l'image à la taille cible."""
@@ -24,15 +47,42 @@ class ImagePreprocessor(BasePreprocessor):
         # Convertir en float32
         image = image.astype(np.float32)
         
-        # Normaliser
-        image = image / 255.0
-        
-        # Appliquer la normalisation par canal
-        for i in range(3):
-            image[:, :, i] = (image[:, :, i] - self.mean[i]) / self.std[i]
+        # Normaliser par canal en une seule opération
+        scale, offset = self._normalization_coefficients()
+        image *= scale
+        image += offset
         
         return image
     
+    def _normalization_coefficients(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(x / 255 - mean) / std s'écrit x * scale + offset."""
+        std = np.asarray(self.std, dtype=np.float32)
+        scale = 1.0 / (255.0 * std)
+        offset = -np.asarray(self.mean, dtype=np.float32) / std
+        return scale, offset
+    
+    @staticmethod
+    def _to_rgb(image: np.ndarray) -> np.ndarray:
+        """Convertit une image en niveaux de gris ou RGBA en RGB."""
+        if len(image.shape) == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+        elif image.shape[2] == 4:
+            return cv2.cvtColor(image, cv2.COLOR_RGBA2RGB)
+        return image
+    
+    @staticmethod
+    def _decode(source: ImageSource) -> np.ndarray:
+        """Décode une image depuis un chemin ou des octets (en RGB)."""
+        if isinstance(source, np.ndarray):
+            return source
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            image = cv2.imdecode(np.frombuffer(source, dtype=np.uint8), cv2.IMREAD_COLOR)
+        else:
+            image = cv2.imread(os.fspath(source), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Impossible de décoder l'image : {source!r:.80}")
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    
     def _preprocess_single_image(self, image: np.ndarray) -> np.ndarray:
         """Prétraite une seule image."""
         # Redimensionner
@@ -48,34 +98,110 @@ class ImagePreprocessor(BasePreprocessor):
         # Dans ce cas, il n'y a pas besoin d'ajustement spécifique
         return super().fit(data)
     
-    def transform(self, data: List[np.ndarray]) -> np.ndarray:
+    def transform(self, data: List[ImageSource]) -> np.ndarray:
         """Transforme les données d'images."""
         if not self.is_fitted:
             raise ValueError("Le préprocesseur doit être ajusté avant la transformation.")
         
-        processed_images = []
-        for image in data:
-            # Convertir en RGB si nécessaire
-            if len(image.shape) == 2:
-                image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-            elif image.shape[2] == 4:
-                image = cv2.cvtColor(image, cv2.COLOR_RGBA2RGB)
-            
-            # Prétraiter l'image
-            processed_image = self._preprocess_single_image(image)
-            processed_images.append(processed_image)
-        
-        return np.array(processed_images)
+        return self.transform_batch(data)
     
-    def save(self, path: str) -> None:
-        """Sauvegarde le préprocesseur."""
-        import pickle
-        with open(path, 'wb') as f:
-            pickle.dump(self, f)
+    def transform_batch(self, data: List[ImageSource], layout: str = 'NHWC',
+                        dtype: Optional[np.dtype] = None,
+                        num_workers: Optional[int] = None,
+                        out: Optional[np.ndarray] = None,
+                        executor: Optional[Executor] = None) -> np.ndarray:
+        """Transforme un lot d'images dans un tenseur préalloué.
+        
+        Le décodage, la conversion RGB, le redimensionnement et la
+        normalisation de chaque image s'exécutent dans un pool de threads
+        partagé (OpenCV et NumPy libèrent le GIL) et écrivent directement
+        dans sa tranche du tenseur de sortie, sans liste intermédiaire.
+        
+        `layout` vaut 'NHWC' ou 'NCHW' ; `dtype` vaut float32 par défaut
+        (float16 possible). Sans normalisation, il reprend celui des images
+        fournies (uint8 pour les images décodées depuis un fichier).
+        """
+        if not self.is_fitted:
+            raise ValueError("Le préprocesseur doit être ajusté avant la transformation.")
+        if layout not in ('NHWC', 'NCHW'):
+            raise ValueError(f"Disposition inconnue : {layout}")
+        
+        width, height = self.target_size
+        if dtype is None:
+            dtype = np.float32 if self.normalize else np.result_type(np.uint8, *[
+                image.dtype for image in data if isinstance(image, np.ndarray)
+            ])
+        shape = (len(data), height, width, 3) if layout == 'NHWC' else (len(data), 3, height, width)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"Tenseur de sortie de forme {out.shape}, attendu {shape}")
+        
+        # Coefficients répétés sur une ligne (W*3) : la boucle interne des
+        # ufuncs porte sur une ligne entière et non sur les 3 canaux
+        scale, offset = self._normalization_coefficients()
+        row_scale, row_offset = np.tile(scale, width), np.tile(offset, width)
+        direct = layout == 'NHWC' and out.dtype == np.float32
+        
+        def process(index: int) -> None:
+            image = self._to_rgb(self._decode(data[index]))
+            resized = self._resize_image(image)
+            # Vue HWC sur la tranche de sortie, quelle que soit la disposition
+            target = out[index] if layout == 'NHWC' else out[index].transpose(1, 2, 0)
+            if not self.normalize:
+                target[...] = resized
+            elif direct:
+                rows = out[index].reshape(height, width * 3)
+                np.multiply(resized.reshape(height, -1), row_scale, out=rows)
+                rows += row_offset
+            else:
+                values = resized.reshape(height, -1) * row_scale
+                values += row_offset
+                target[...] = values.reshape(height, width, 3)
+        
+        workers = min(num_workers or self.num_workers, len(data))
+        if executor is not None:
+            list(executor.map(process, range(len(data))))
+        elif workers <= 1:
+            for index in range(len(data)):
+                process(index)
+        else:
+            # list() propage les exceptions des workers
+            list(_shared_executor(workers).map(process, range(len(data))))
+        
+        return out
     
-    @classmethod
-    def load(cls, path: str) -> 'ImagePreprocessor':
-        """Charge un préprocesseur sauvegardé."""
-        import pickle
-        with open(path, 'rb') as f:
-            return pickle.load(f) 
\ No newline at end of file
+    def iter_transform(self, source: DatasetSource, batch_size: int = 32,
+                       prefetch: int = 2, layout: str = 'NHWC',
+                       dtype: Optional[np.dtype] = None,
+                       num_workers: Optional[int] = None,
+                       return_names: bool = False) -> Iterator[Any]:
+        """Transforme un jeu d'images en flux, lot par lot.
+        
+        `source` est un dossier, une archive zip/tar ou un itérable
+        d'images ; les fichiers sont lus à la demande et les lots suivants
+        sont préparés en arrière-plan (au plus `prefetch` d'avance), si bien
+        que la mémoire reste bornée quelle que soit la taille du jeu.
+        
+        Produit des tenseurs (N, ...) ou, avec `return_names`, des couples
+        (noms, tenseur).
+        """
+        if not self.is_fitted:
+            raise ValueError("Le préprocesseur doit être ajusté avant la transformation.")
+        if batch_size < 1:
+            raise ValueError("batch_size doit être positif")
+        
+        workers = num_workers or self.num_workers
+        
+        def produce(executor: Optional[Executor]) -> Iterator[Any]:
+            for chunk in iter_chunks(iter_image_sources(source), batch_size):
+                names = [name for name, _ in chunk]
+                batch = self.transform_batch(
+                    [image for _, image in chunk], layout=layout, dtype=dtype,
+                    executor=executor
+                )
+                yield (names, batch) if return_names else batch
+        
+        executor = _shared_executor(workers) if workers > 1 else None
+        with BatchPrefetcher(produce(executor), prefetch) as batches:
+            yield from batches
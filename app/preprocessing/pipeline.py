@@ -0,0 +1,212 @@
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from app.preprocessing.base import BasePreprocessor, estimate_nbytes
+
+Step = Union[BasePreprocessor, Callable[[Any], Any], Tuple[str, Any]]
+
+
+class FunctionStep(BasePreprocessor):
+    """Fonction appliquée élément par élément (non sérialisable)."""
+    
+    elementwise = True
+    
+    def __init__(self, func: Callable[[Any], Any], config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        self.func = func
+        self.is_fitted = True
+    
+    def fit(self, data: Any) -> 'FunctionStep':
+        return super().fit(data)
+    
+    def transform_item(self, item: Any) -> Any:
+        return self.func(item)
+    
+    def transform(self, data: Iterable[Any]) -> List[Any]:
+        return [self.func(item) for item in data]
+
+
+class StageStats:
+    """Temps propre, éléments consommés / produits et octets produits par une étape."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.items_in = 0
+        self.items_out = 0
+        self.bytes_out = 0
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "seconds": self.seconds,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "bytes_out": self.bytes_out,
+        }
+
+
+class Pipeline(BasePreprocessor):
+    """Enchaîne des préprocesseurs et les exécute paresseusement sur un flux.
+    
+    Les étapes consécutives élément par élément (`elementwise`) sont
+    fusionnées : chaque élément les traverse toutes avant le suivant, sans
+    liste intermédiaire. Les autres étapes reçoivent le flux via leur
+    `iter_transform` (ou `transform` par lots de `batch_size`) et leurs
+    sorties (lots, matrices...) deviennent les éléments suivants.
+    
+    Après chaque passage, `stats()` donne pour chaque étape son temps propre
+    (hors étapes amont), ses éléments consommés et produits et les octets
+    produits.
+    """
+    
+    def __init__(self, steps: Optional[Sequence[Step]] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        self.batch_size = self.config.get('batch_size', 1000)
+        self.steps: List[Tuple[str, BasePreprocessor]] = []
+        for step in steps or []:
+            name, step = step if isinstance(step, tuple) else (None, step)
+            if not isinstance(step, BasePreprocessor):
+                step = FunctionStep(step)
+            name = name or type(step).__name__.lower()
+            if any(name == existing for existing, _ in self.steps):
+                name = f"{name}_{len(self.steps)}"
+            self.steps.append((name, step))
+        self._stats: Dict[str, StageStats] = {}
+    
+    @property
+    def named_steps(self) -> Dict[str, BasePreprocessor]:
+        return dict(self.steps)
+    
+    def _stages(self, steps: List[Tuple[str, BasePreprocessor]]) -> List[List[Tuple[str, BasePreprocessor]]]:
+        """Regroupe les étapes élément par élément consécutives."""
+        stages = []
+        for name, step in steps:
+            if step.elementwise and stages and stages[-1][-1][1].elementwise:
+                stages[-1].append((name, step))
+            else:
+                stages.append([(name, step)])
+        return stages
+    
+    def _fused(self, stream: Iterable[Any], stage: List[Tuple[str, BasePreprocessor]]) -> Iterator[Any]:
+        stats = [self._stats[name] for name, _ in stage]
+        funcs = [step.transform_item for _, step in stage]
+        clock = time.perf_counter
+        for item in stream:
+            for func, stat in zip(funcs, stats):
+                start = clock()
+                stat.items_in += 1
+                item = func(item)
+                stat.seconds += clock() - start
+                stat.items_out += 1
+                stat.bytes_out += estimate_nbytes(item)
+            yield item
+    
+    def _upstream(self, stream: Iterable[Any], stat: StageStats) -> Iterator[Any]:
+        # Le temps passé à tirer les éléments amont est décompté de l'étape
+        iterator = iter(stream)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                stat.seconds -= clock() - start
+                return
+            stat.seconds -= clock() - start
+            stat.items_in += 1
+            yield item
+    
+    def _batched(self, step: BasePreprocessor, stream: Iterator[Any]) -> Iterator[Any]:
+        batch = []
+        for item in stream:
+            batch.append(item)
+            if len(batch) == self.batch_size:
+                yield step.transform(batch)
+                batch = []
+        if batch:
+            yield step.transform(batch)
+    
+    def _batch_stage(self, stream: Iterable[Any], name: str, step: BasePreprocessor) -> Iterator[Any]:
+        stat = self._stats[name]
+        upstream = self._upstream(stream, stat)
+        if hasattr(step, 'iter_transform'):
+            outputs = iter(step.iter_transform(upstream))
+        else:
+            outputs = self._batched(step, upstream)
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                output = next(outputs)
+            except StopIteration:
+                stat.seconds += clock() - start
+                return
+            stat.seconds += clock() - start
+            stat.items_out += 1
+            stat.bytes_out += estimate_nbytes(output)
+            yield output
+    
+    def _run(self, data: Iterable[Any], steps: List[Tuple[str, BasePreprocessor]]) -> Iterator[Any]:
+        self._stats = {name: StageStats(name) for name, _ in steps}
+        stream = iter(data)
+        for stage in self._stages(steps):
+            if stage[0][1].elementwise:
+                stream = self._fused(stream, stage)
+            else:
+                stream = self._batch_stage(stream, *stage[0])
+        return stream
+    
+    def fit(self, data: Iterable[Any]) -> 'Pipeline':
+        """Ajuste chaque étape sur la sortie des étapes précédentes.
+        
+        `data` est parcouru une fois par étape : il doit être réitérable
+        (liste, dossier...) et non un générateur.
+        """
+        for i, (_, step) in enumerate(self.steps):
+            step.fit(self._run(data, self.steps[:i]))
+        return super().fit(data)
+    
+    def iter_transform(self, data: Iterable[Any]) -> Iterator[Any]:
+        """Transforme paresseusement un flux ; produit les sorties de la dernière étape."""
+        if not self.is_fitted:
+            raise ValueError("Le préprocesseur doit être ajusté avant la transformation.")
+        return self._run(data, self.steps)
+    
+    def transform(self, data: Iterable[Any]) -> List[Any]:
+        """Transforme les données et retourne la liste des sorties."""
+        return list(self.iter_transform(data))
+    
+    def stats(self) -> List[Dict[str, Any]]:
+        """Mesures du dernier passage, dans l'ordre des étapes."""
+        return [self._stats[name].snapshot() for name, _ in self.steps if name in self._stats]
+    
+    def get_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        from app.preprocessing.serialization import PREPROCESSORS
+        state, arrays = super().get_state()
+        state['steps'] = []
+        for i, (name, step) in enumerate(self.steps):
+            cls = type(step).__name__
+            if cls not in PREPROCESSORS:
+                raise ValueError(f"Étape non sérialisable : {name} ({cls})")
+            step_state, step_arrays = step.get_state()
+            state['steps'].append({
+                'name': name,
+                'class': cls,
+                'config': step.config,
+                'state': step_state,
+                'arrays': sorted(step_arrays),
+            })
+            for key, array in step_arrays.items():
+                arrays[f"step{i}__{key}"] = array
+        return state, arrays
+    
+    def set_state(self, state: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        from app.preprocessing.serialization import resolve_preprocessor
+        super().set_state(state, arrays)
+        self.steps = []
+        for i, spec in enumerate(state['steps']):
+            step = resolve_preprocessor(spec['class'])(config=spec['config'])
+            step.set_state(spec['state'], {key: arrays[f"step{i}__{key}"] for key in spec['arrays']})
+            self.steps.append((spec['name'], step))
@@ -0,0 +1,132 @@
+import importlib
+import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+from typing import Any, Dict, Tuple
+import numpy as np
+
+FORMAT_VERSION = 1
+STATE_FILE = "state.json"
+ARRAYS_DIR = "arrays"
+_ARRAY_NAME = re.compile(r"[A-Za-z0-9_]+")
+
+# Classes chargeables, au format "module:attribut" : seul un nom présent
+# ici peut être instancié au chargement (aucun code arbitraire exécuté).
+PREPROCESSORS: Dict[str, str] = {
+    "ImagePreprocessor": "app.preprocessing.image.image_preprocessor:ImagePreprocessor",
+    "TextPreprocessor": "app.preprocessing.text.text_preprocessor:TextPreprocessor",
+    "TextVectorizer": "app.preprocessing.text.vectorizer:TextVectorizer",
+    "Pipeline": "app.preprocessing.pipeline:Pipeline",
+}
+
+
+def register_preprocessor(cls: type) -> type:
+    """Autorise le chargement d'une classe de préprocesseur (utilisable en décorateur)."""
+    PREPROCESSORS[cls.__name__] = f"{cls.__module__}:{cls.__qualname__}"
+    return cls
+
+
+def resolve_preprocessor(name: str) -> type:
+    if name not in PREPROCESSORS:
+        raise ValueError(f"Classe de préprocesseur non autorisée : {name}")
+    module, attr = PREPROCESSORS[name].split(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def save_preprocessor(preprocessor: Any, path: str) -> None:
+    """Écrit config et état ajusté dans un dossier versionné.
+    
+    Disposition :
+        state.json         version du format, classe, config, état JSON
+        arrays/<nom>.npy   tableaux NumPy de l'état
+    
+    Le dossier est écrit à côté puis renommé : un artefact est complet ou absent.
+    Seul un artefact existant (dossier contenant state.json) est remplacé.
+    """
+    name = type(preprocessor).__name__
+    if name not in PREPROCESSORS:
+        raise ValueError(f"Classe de préprocesseur non enregistrée : {name}")
+    state, arrays = preprocessor.get_state()
+    for key in arrays:
+        if not _ARRAY_NAME.fullmatch(key):
+            raise ValueError(f"Nom de tableau invalide : {key}")
+
+    path = os.path.abspath(path)
+    if os.path.lexists(path) and not os.path.isfile(os.path.join(path, STATE_FILE)):
+        raise FileExistsError(f"{path} existe et n'est pas un artefact de préprocesseur")
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        os.mkdir(os.path.join(tmp, ARRAYS_DIR))
+        for key, array in arrays.items():
+            np.save(os.path.join(tmp, ARRAYS_DIR, f"{key}.npy"), np.asarray(array),
+                    allow_pickle=False)
+        with open(os.path.join(tmp, STATE_FILE), "w") as f:
+            json.dump({
+                "format_version": FORMAT_VERSION,
+                "class": name,
+                "config": preprocessor.config,
+                "state": state,
+                "arrays": sorted(arrays),
+            }, f)
+        _swap(tmp, path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def _swap(tmp: str, path: str) -> None:
+    """Remplace `path` par `tmp` : l'ancien dossier est d'abord mis de côté
+    par renommage, et restauré si la mise en place échoue."""
+    if not os.path.exists(path):
+        os.replace(tmp, path)
+        return
+    old = tempfile.mkdtemp(dir=os.path.dirname(path), prefix=".old-")
+    os.replace(path, old)
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        os.replace(old, path)
+        raise
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def read_state(path: str, mmap: bool = True) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Lit state.json et les tableaux (en mémoire mappée par défaut)."""
+    with open(os.path.join(path, STATE_FILE)) as f:
+        document = json.load(f)
+    version = document.get("format_version")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Version de format non prise en charge : {version}")
+    arrays = {}
+    for key in document["arrays"]:
+        if not _ARRAY_NAME.fullmatch(key):
+            raise ValueError(f"Nom de tableau invalide : {key}")
+        arrays[key] = np.load(os.path.join(path, ARRAYS_DIR, f"{key}.npy"),
+                              mmap_mode="r" if mmap else None, allow_pickle=False)
+    return document, arrays
+
+
+def load_preprocessor(path: str, mmap: bool = True, allow_pickle: bool = False) -> Any:
+    """Recrée un préprocesseur depuis son dossier d'état.
+    
+    Un fichier unique est un ancien artefact pickle : il n'est chargé
+    qu'avec `allow_pickle=True`, et seulement depuis une source de confiance.
+    """
+    if os.path.isfile(path):
+        if not allow_pickle:
+            raise ValueError(
+                f"{path} est un ancien artefact pickle ; passer allow_pickle=True "
+                "pour le charger (source de confiance uniquement)"
+            )
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    document, arrays = read_state(path, mmap)
+    preprocessor = resolve_preprocessor(document["class"])(config=document["config"])
+    preprocessor.set_state(document["state"], arrays)
+    return preprocessor
@@ -1,39 +1,109 @@
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
-import re
 from app.preprocessing.base import BasePreprocessor
 
+# Expressions compilées une fois pour tout le module
+_NON_ALPHA = re.compile(r'[^a-zA-Z\s]')
+_WHITESPACE = re.compile(r'\s+')
+_WORD = re.compile(r'[a-zA-Z]+')
+
+TOKENIZERS = ('nltk', 'regex')
+
+# Ressources NLTK : chemin de recherche -> paquet à télécharger
+_NLTK_RESOURCES = {
+    'tokenizers/punkt': 'punkt',
+    'tokenizers/punkt_tab': 'punkt_tab',
+    'corpora/stopwords': 'stopwords',
+    'corpora/wordnet': 'wordnet',
+}
+
+
+def _ensure_nltk_resources(paths: List[str]) -> None:
+    """Télécharge les ressources NLTK manquantes parmi `paths`."""
+    for path in paths:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(_NLTK_RESOURCES[path], quiet=True)
+
+
+# Préprocesseur propre à chaque processus de transform_batch
+_worker_preprocessor: Optional['TextPreprocessor'] = None
+
+
+def _init_worker(preprocessor: 'TextPreprocessor') -> None:
+    global _worker_preprocessor
+    _worker_preprocessor = preprocessor
+
+
+def _process_chunk(texts: List[str]) -> List[str]:
+    return [_worker_preprocessor._process(text) for text in texts]
+
+
 class TextPreprocessor(BasePreprocessor):
+    elementwise = True
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         super().__init__(config)
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+        self.tokenizer = self.config.get('tokenizer', 'nltk')
+        if self.tokenizer not in TOKENIZERS:
+            raise ValueError(f"Tokeniseur inconnu : {self.tokenizer}")
+        self.lemmatize = self.config.get('lemmatize', True)
+        self.lemma_cache_size = self.config.get('lemma_cache_size', 100_000)
         
-        # Télécharger les ressources NLTK nécessaires
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
-            nltk.data.find('corpora/wordnet')
-        except LookupError:
-            nltk.download('punkt')
-            nltk.download('stopwords')
-            nltk.download('wordnet')
+        # Télécharger les ressources NLTK nécessaires avant de les charger
+        required = []
+        if self.tokenizer == 'nltk':
+            required += ['tokenizers/punkt', 'tokenizers/punkt_tab']
+        if self.config.get('stop_words') is None:
+            required.append('corpora/stopwords')
+        if self.lemmatize:
+            required.append('corpora/wordnet')
+        _ensure_nltk_resources(required)
+        
+        self.lemmatizer = WordNetLemmatizer()
+        stop_words = self.config.get('stop_words')
+        self.stop_words = set(stop_words if stop_words is not None else stopwords.words('english'))
+        self._init_lemma_cache()
+    
+    def _init_lemma_cache(self) -> None:
+        # Les tokens se répètent beaucoup : chaque lemme n'est calculé qu'une fois
+        self._lemmatize_token = lru_cache(maxsize=self.lemma_cache_size)(
+            lambda token: self.lemmatizer.lemmatize(token)
+        )
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state['_lemmatize_token']
+        state.pop('_cache', None)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_lemma_cache()
     
     def _clean_text(self, text: str) -> str:
         """Nettoie le texte en enlevant les caractères spéciaux et la ponctuation."""
         # Convertir en minuscules
         text = text.lower()
         # Enlever les caractères spéciaux et les chiffres
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = _NON_ALPHA.sub('', text)
         # Enlever les espaces multiples
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE.sub(' ', text).strip()
         return text
     
     def _tokenize(self, text: str) -> List[str]:
         """Tokenise le texte."""
+        if self.tokenizer == 'regex':
+            return _WORD.findall(text)
         return word_tokenize(text)
     
     def _remove_stopwords(self, tokens: List[str]) -> List[str]:
@@ -42,7 +112,31 @@ class TextPreprocessor(BasePreprocessor):
     
     def _lemmatize(self, tokens: List[str]) -> List[str]:
         """Lemmatise les tokens."""
-        return [self.lemmatizer.lemmatize(token) for token in tokens]
+        if not self.lemmatize:
+            return tokens
+        return [self._lemmatize_token(token) for token in tokens]
+    
+    def tokenize_document(self, text: str) -> List[str]:
+        """Nettoie, tokenise, filtre et lemmatise un document."""
+        # Nettoyer le texte
+        cleaned_text = self._clean_text(text)
+        # Tokeniser
+        tokens = self._tokenize(cleaned_text)
+        # Enlever les mots vides
+        tokens = self._remove_stopwords(tokens)
+        # Lemmatiser
+        return self._lemmatize(tokens)
+    
+    def _process(self, text: str) -> str:
+        """Prétraite un seul document."""
+        return ' '.join(self.tokenize_document(text))
+    
+    def transform_item(self, item: str) -> str:
+        return self._process(item)
+    
+    def lemma_cache_info(self):
+        """Statistiques du cache de lemmatisation (hits, misses, taille)."""
+        return self._lemmatize_token.cache_info()
     
     def fit(self, data: List[str]) -> 'TextPreprocessor':
         """Ajuste le préprocesseur aux données."""
@@ -54,31 +148,27 @@ class TextPreprocessor(BasePreprocessor):
         if not self.is_fitted:
             raise ValueError("Le préprocesseur doit être ajusté avant la transformation.")
         
-        processed_texts = []
-        for text in data:
-            # Nettoyer le texte
-            cleaned_text = self._clean_text(text)
-            # Tokeniser
-            tokens = self._tokenize(cleaned_text)
-            # Enlever les mots vides
-            tokens = self._remove_stopwords(tokens)
-            # Lemmatiser
-            tokens = self._lemmatize(tokens)
-            # Rejoindre les tokens
-            processed_text = ' '.join(tokens)
-            processed_texts.append(processed_text)
-        
-        return processed_texts
+        return [self._process(text) for text in data]
     
-    def save(self, path: str) -> None:
-        """Sauvegarde le préprocesseur."""
-        import pickle
-        with open(path, 'wb') as f:
-            pickle.dump(self, f)
-    
-    @classmethod
-    def load(cls, path: str) -> 'TextPreprocessor':
-        """Charge un préprocesseur sauvegardé."""
-        import pickle
-        with open(path, 'rb') as f:
-            return pickle.load(f) 
\ No newline at end of file
+    def transform_batch(self, data: List[str], n_jobs: Optional[int] = None,
+                        chunksize: int = 1000) -> List[str]:
+        """Transforme un corpus en le répartissant par blocs sur plusieurs processus.
+        
+        Chaque worker reçoit une copie du préprocesseur à son démarrage et
+        garde son propre cache de lemmes ; l'ordre des documents est conservé.
+        """
+        if not self.is_fitted:
+            raise ValueError("Le préprocesseur doit être ajusté avant la transformation.")
+        
+        n_jobs = n_jobs or os.cpu_count() or 1
+        chunks = [data[i:i + chunksize] for i in range(0, len(data), chunksize)]
+        if n_jobs == 1 or len(chunks) <= 1:
+            return self.transform(data)
+        
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self,)
+        ) as executor:
+            return [text for chunk in executor.map(_process_chunk, chunks) for text in chunk]
@@ -0,0 +1,182 @@
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from app.preprocessing.base import BasePreprocessor
+
+VECTORIZER_MODES = ('hashing', 'vocabulary')
+
+
+def _identity(tokens: List[str]) -> List[str]:
+    # Analyseur du HashingVectorizer : les documents arrivent déjà tokenisés
+    return tokens
+
+
+class TextVectorizer(BasePreprocessor):
+    """Vectorisation en flux (comptes ou TF-IDF) vers des matrices CSR.
+    
+    Deux modes :
+        hashing     hachage des tokens sur `n_features` colonnes, sans vocabulaire
+        vocabulary  vocabulaire appris incrémentalement (borné par `max_features`)
+    
+    Les fréquences documentaires sont cumulées par `partial_fit`, si bien que
+    l'IDF s'ajuste hors mémoire sur un corpus lu en flux. Avec la clé de
+    configuration `preprocessor`, les documents bruts passent d'abord par un
+    TextPreprocessor ; sinon ils sont découpés sur les espaces.
+    """
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        self.mode = self.config.get('mode', 'hashing')
+        if self.mode not in VECTORIZER_MODES:
+            raise ValueError(f"Mode de vectorisation inconnu : {self.mode}")
+        self.n_features = self.config.get('n_features', 2 ** 20)
+        self.max_features = self.config.get('max_features')
+        self.use_idf = self.config.get('tfidf', True)
+        self.sublinear_tf = self.config.get('sublinear_tf', False)
+        self.norm = self.config.get('norm', 'l2')
+        self.batch_size = self.config.get('batch_size', 1000)
+        
+        self.preprocessor = None
+        if self.config.get('preprocessor') is not None:
+            from app.preprocessing.text.text_preprocessor import TextPreprocessor
+            self.preprocessor = TextPreprocessor(self.config['preprocessor']).fit([])
+        
+        self._hasher = HashingVectorizer(
+            n_features=self.n_features, analyzer=_identity,
+            alternate_sign=False, norm=None
+        )
+        self._reset()
+    
+    def _reset(self) -> None:
+        self.n_documents = 0
+        self.vocabulary: Dict[str, int] = {}
+        self.document_frequency = np.zeros(
+            self.n_features if self.mode == 'hashing' else 0, dtype=np.int64
+        )
+        self.is_fitted = False
+    
+    @property
+    def n_columns(self) -> int:
+        return self.n_features if self.mode == 'hashing' else len(self.vocabulary)
+    
+    def _tokens(self, docs: List[str]) -> List[List[str]]:
+        if self.preprocessor is not None:
+            return [self.preprocessor.tokenize_document(doc) for doc in docs]
+        return [doc.split() for doc in docs]
+    
+    def _grow_vocabulary(self, token_lists: List[List[str]]) -> None:
+        vocabulary = self.vocabulary
+        for tokens in token_lists:
+            for token in tokens:
+                if token not in vocabulary:
+                    if self.max_features is not None and len(vocabulary) >= self.max_features:
+                        continue
+                    vocabulary[token] = len(vocabulary)
+        if len(vocabulary) > len(self.document_frequency):
+            self.document_frequency = np.concatenate([
+                self.document_frequency,
+                np.zeros(len(vocabulary) - len(self.document_frequency), dtype=np.int64)
+            ])
+    
+    def _counts(self, token_lists: List[List[str]]) -> sp.csr_matrix:
+        """Matrice CSR des comptes bruts (une ligne par document)."""
+        if self.mode == 'hashing':
+            return self._hasher.transform(token_lists).astype(np.float64)
+        
+        vocabulary = self.vocabulary
+        indices, values, indptr = [], [], [0]
+        for tokens in token_lists:
+            counts = Counter(vocabulary[t] for t in tokens if t in vocabulary)
+            indices.extend(counts.keys())
+            values.extend(counts.values())
+            indptr.append(len(indices))
+        matrix = sp.csr_matrix(
+            (np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int64), indptr),
+            shape=(len(token_lists), len(vocabulary))
+        )
+        matrix.sort_indices()
+        return matrix
+    
+    @staticmethod
+    def _batches(data: Iterable[str], size: int) -> Iterator[List[str]]:
+        iterator = iter(data)
+        while True:
+            batch = list(islice(iterator, size))
+            if not batch:
+                return
+            yield batch
+    
+    def partial_fit(self, data: Iterable[str]) -> 'TextVectorizer':
+        """Met à jour vocabulaire et fréquences documentaires avec un lot de documents."""
+        if not self.document_frequency.flags.writeable:
+            self.document_frequency = np.array(self.document_frequency)
+        for batch in self._batches(data, self.batch_size):
+            token_lists = self._tokens(batch)
+            if self.mode == 'vocabulary':
+                self._grow_vocabulary(token_lists)
+            counts = self._counts(token_lists)
+            # Nombre de documents contenant chaque colonne
+            self.document_frequency[:counts.shape[1]] += np.bincount(
+                counts.indices, minlength=counts.shape[1]
+            )
+            self.n_documents += len(batch)
+        self.is_fitted = True
+        return self
+    
+    def fit(self, data: Iterable[str]) -> 'TextVectorizer':
+        """Ajuste le vectoriseur en une passe sur un flux de documents."""
+        self._reset()
+        return self.partial_fit(data)
+    
+    def idf(self) -> np.ndarray:
+        """IDF lissé : log((1 + n) / (1 + df)) + 1."""
+        return np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+    
+    def _weight(self, counts: sp.csr_matrix, idf: Optional[np.ndarray]) -> sp.csr_matrix:
+        if self.sublinear_tf:
+            np.log(counts.data, out=counts.data)
+            counts.data += 1
+        if idf is not None:
+            # Multiplication colonne par colonne sans matrice diagonale
+            counts.data *= idf[counts.indices]
+        if self.norm:
+            counts = normalize(counts, norm=self.norm, copy=False)
+        return counts
+    
+    def iter_transform(self, data: Iterable[str],
+                       batch_size: Optional[int] = None) -> Iterator[sp.csr_matrix]:
+        """Vectorise un flux de documents, une matrice CSR par lot.
+        
+        Seul le lot courant est en mémoire ; les tokens inconnus du
+        vocabulaire sont ignorés.
+        """
+        if not self.is_fitted:
+            raise ValueError("Le préprocesseur doit être ajusté avant la transformation.")
+        idf = self.idf() if self.use_idf else None
+        for batch in self._batches(data, batch_size or self.batch_size):
+            yield self._weight(self._counts(self._tokens(batch)), idf)
+    
+    def transform(self, data: Iterable[str]) -> sp.csr_matrix:
+        """Vectorise des documents en une seule matrice CSR."""
+        batches = list(self.iter_transform(data))
+        if not batches:
+            return sp.csr_matrix((0, self.n_columns), dtype=np.float64)
+        return sp.vstack(batches, format='csr')
+    
+    def get_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        state, arrays = super().get_state()
+        state['n_documents'] = self.n_documents
+        state['vocabulary'] = sorted(self.vocabulary, key=self.vocabulary.get)
+        arrays['document_frequency'] = self.document_frequency
+        return state, arrays
+    
+    def set_state(self, state: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        super().set_state(state, arrays)
+        self.n_documents = state['n_documents']
+        self.vocabulary = {token: i for i, token in enumerate(state['vocabulary'])}
+        # Éventuellement en mémoire mappée : copié au premier partial_fit
+        self.document_frequency = arrays['document_frequency']
@@ -21,6 +21,9 @@ class DeepLearningModelUpdate(DeepLearningModelBase):
     model_type: Optional[str] = None
     architecture: Optional[Dict[str, Any]] = None
 
+class DeepLearningModelBulkUpdateItem(DeepLearningModelUpdate):
+    id: int
+
 class DeepLearningModelInDB(DeepLearningModelBase):
     id: int
     created_at: datetime
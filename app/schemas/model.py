@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any
 from datetime import datetime
+from app.core.config import settings
 
 class ModelCreate(BaseModel):
     name: str
@@ -27,4 +28,27 @@ class ModelResponse(BaseModel):
     parameters: Optional[Dict[str, Any]] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class ModelBulkUpdateItem(ModelUpdate):
+    id: int
+
+class ModelBulkCreate(BaseModel):
+    models: List[ModelCreate] = Field(..., max_length=settings.MAX_BULK_ITEMS)
+
+class ModelBulkUpdate(BaseModel):
+    models: List[ModelBulkUpdateItem] = Field(..., max_length=settings.MAX_BULK_ITEMS)
+
+class ModelBulkDelete(BaseModel):
+    ids: List[int] = Field(..., max_length=settings.MAX_BULK_ITEMS)
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: str  # created, updated, deleted, not_found, duplicate
+    error: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    results: List[BulkItemResult]
+    succeeded: int
+    failed: int
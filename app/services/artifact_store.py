@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+
+
+class ArtifactNotFoundError(LookupError):
+    """Aucun artefact enregistré pour ce modèle ou cette version."""
+
+
+class ArtifactStore:
+    """Stockage sur disque des modèles entraînés, adressé par contenu et versionné.
+
+    Disposition sous `root` :
+        objects/<sha[:2]>/<sha>.pkl   contenu sérialisé, partagé entre versions identiques
+        manifests/<kind>/<id>.json    liste des versions d'un modèle
+
+    `kind` sépare les espaces d'identifiants (ml, dl, deep_learning, ts).
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.MODEL_STORAGE_PATH)
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.pkl"
+
+    def _manifest_path(self, kind: str, model_id: Any) -> Path:
+        return self.root / "manifests" / kind / f"{model_id}.json"
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def versions(self, model_id: Any, kind: str = "ml") -> List[Dict[str, Any]]:
+        """Retourne les versions enregistrées d'un modèle (plus ancienne en premier)."""
+        path = self._manifest_path(kind, model_id)
+        if not path.exists():
+            return []
+        with open(path) as f:
+            return json.load(f)["versions"]
+
+    def resolve(self, model_id: Any, version: Optional[int] = None,
+                kind: str = "ml") -> Dict[str, Any]:
+        """Retourne l'entrée de manifeste d'une version (la dernière par défaut)."""
+        versions = self.versions(model_id, kind)
+        if not versions:
+            raise ArtifactNotFoundError(f"Aucun artefact pour le modèle {kind}/{model_id}")
+        if version is None:
+            return versions[-1]
+        for entry in versions:
+            if entry["version"] == version:
+                return entry
+        raise ArtifactNotFoundError(f"Version {version} introuvable pour {kind}/{model_id}")
+
+    def save(self, model_id: Any, obj: Any, kind: str = "ml",
+             metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Sérialise un modèle et l'enregistre comme nouvelle version.
+
+        Un contenu identique à la dernière version n'en crée pas de nouvelle.
+        """
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            object_path = self._object_path(digest)
+            if not object_path.exists():
+                self._atomic_write(object_path, data)
+
+            versions = self.versions(model_id, kind)
+            if versions and versions[-1]["digest"] == digest:
+                return versions[-1]
+
+            entry = {
+                "version": versions[-1]["version"] + 1 if versions else 1,
+                "digest": digest,
+                "size": len(data),
+                "path": str(object_path.relative_to(self.root)),
+                "created_at": time.time(),
+                "metadata": metadata or {},
+            }
+            versions.append(entry)
+            self._atomic_write(
+                self._manifest_path(kind, model_id),
+                json.dumps({"versions": versions}).encode()
+            )
+            return entry
+
+    def load(self, model_id: Any, version: Optional[int] = None,
+             kind: str = "ml") -> Any:
+        """Charge et désérialise une version d'un modèle."""
+        entry = self.resolve(model_id, version, kind)
+        with open(self.root / entry["path"], "rb") as f:
+            return pickle.load(f)
+
+    def copy_versions(self, model_id: Any, kind: str, new_id: Any, new_kind: str) -> bool:
+        """Rattache les versions d'un modèle à un autre identifiant (objets
+        partagés, seul le manifeste est copié). Ne remplace pas un manifeste
+        existant ; retourne True si une copie a eu lieu."""
+        with self._lock:
+            source = self._manifest_path(kind, model_id)
+            target = self._manifest_path(new_kind, new_id)
+            if not source.exists() or target.exists():
+                return False
+            self._atomic_write(target, source.read_bytes())
+            return True
+
+    def delete(self, model_id: Any, kind: str = "ml") -> None:
+        """Supprime le manifeste d'un modèle ; les objets orphelins sont
+        récupérés par collect_garbage()."""
+        with self._lock:
+            path = self._manifest_path(kind, model_id)
+            if path.exists():
+                path.unlink()
+
+    def collect_garbage(self) -> int:
+        """Supprime les objets qui ne sont plus référencés par aucun manifeste."""
+        with self._lock:
+            referenced = set()
+            for manifest in (self.root / "manifests").glob("*/*.json"):
+                with open(manifest) as f:
+                    referenced.update(v["digest"] for v in json.load(f)["versions"])
+            removed = 0
+            for path in (self.root / "objects").glob("*/*.pkl"):
+                if path.stem not in referenced:
+                    path.unlink()
+                    removed += 1
+            return removed
+
+
+artifact_store = ArtifactStore()
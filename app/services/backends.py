@@ -0,0 +1,83 @@
+import importlib
+import threading
+from types import SimpleNamespace
+from typing import Dict
+
+# Symboles de chaque framework, au format "module:attribut".
+# Rien n'est importé avant le premier appel à get_backend().
+_BACKENDS: Dict[str, Dict[str, str]] = {
+    "statsmodels": {
+        "ARIMA": "statsmodels.tsa.arima.model:ARIMA",
+        "SARIMAX": "statsmodels.tsa.statespace.sarimax:SARIMAX",
+    },
+    "prophet": {
+        "Prophet": "prophet:Prophet",
+    },
+    "keras": {
+        "Sequential": "tensorflow.keras.models:Sequential",
+        "LSTM": "tensorflow.keras.layers:LSTM",
+        "Dense": "tensorflow.keras.layers:Dense",
+        "Dropout": "tensorflow.keras.layers:Dropout",
+        "LambdaCallback": "tensorflow.keras.callbacks:LambdaCallback",
+    },
+    "sklearn": {
+        "MinMaxScaler": "sklearn.preprocessing:MinMaxScaler",
+    },
+}
+
+# Type de modèle -> framework nécessaire
+MODEL_BACKENDS: Dict[str, str] = {
+    "arima": "statsmodels",
+    "sarima": "statsmodels",
+    "prophet": "prophet",
+    "lstm": "keras",
+}
+
+_loaded: Dict[str, SimpleNamespace] = {}
+_lock = threading.Lock()
+
+
+def register_backend(name: str, symbols: Dict[str, str]) -> None:
+    """Enregistre (ou remplace) un framework sans l'importer."""
+    with _lock:
+        _BACKENDS[name] = dict(symbols)
+        _loaded.pop(name, None)
+
+
+def get_backend(name: str) -> SimpleNamespace:
+    """Importe un framework à la première demande et retourne ses symboles."""
+    backend = _loaded.get(name)
+    if backend is not None:
+        return backend
+
+    if name not in _BACKENDS:
+        raise ValueError(f"Backend inconnu : {name}")
+
+    with _lock:
+        backend = _loaded.get(name)
+        if backend is None:
+            symbols = {}
+            for attr, target in _BACKENDS[name].items():
+                module_name, _, symbol = target.partition(":")
+                try:
+                    module = importlib.import_module(module_name)
+                except ImportError as e:
+                    raise ImportError(
+                        f"Le backend '{name}' nécessite le module '{module_name}'"
+                    ) from e
+                symbols[attr] = getattr(module, symbol)
+            backend = SimpleNamespace(**symbols)
+            _loaded[name] = backend
+    return backend
+
+
+def get_model_backend(model_type: str) -> SimpleNamespace:
+    """Retourne le framework associé à un type de modèle."""
+    if model_type not in MODEL_BACKENDS:
+        raise ValueError(f"Unsupported model type: {model_type}")
+    return get_backend(MODEL_BACKENDS[model_type])
+
+
+def is_loaded(name: str) -> bool:
+    """Indique si un framework a déjà été importé dans ce processus."""
+    return name in _loaded
@@ -0,0 +1,244 @@
+import threading
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.utils.iteration import iter_chunks
+
+BATCH_MODEL_TYPES = ("arima", "sarima", "prophet")
+REQUIRED_COLUMNS = ("series_id", "ds", "y")
+
+
+def split_series(frame) -> Iterator[Tuple[Any, np.ndarray, np.ndarray]]:
+    """Découpe une table longue (series_id, ds, y) en séries (id, ds, y).
+
+    Un seul tri puis des tranches sur les frontières d'identifiants, sans
+    groupby pandas par série.
+    """
+    import pandas as pd
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes : {', '.join(missing)}")
+
+    frame = frame.sort_values(["series_id", "ds"], kind="stable")
+    ids = frame["series_id"].to_numpy()
+    ds = pd.to_datetime(frame["ds"]).to_numpy()
+    y = frame["y"].to_numpy(dtype=np.float64)
+    if len(ids) == 0:
+        return
+
+    bounds = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(ids)]))
+    for start, end in zip(starts, ends):
+        series_id = ids[start]
+        if isinstance(series_id, np.generic):
+            series_id = series_id.item()
+        yield series_id, ds[start:end], y[start:end]
+
+
+def _future_dates(ds: np.ndarray, steps: int) -> List[str]:
+    """Dates des `steps` pas suivant la fin de la série (pas médian)."""
+    if len(ds) < 2:
+        return [None] * steps
+    step = np.median(np.diff(ds))
+    future = ds[-1] + step * np.arange(1, steps + 1)
+    return [str(np.datetime_as_string(d, unit="s")) for d in future]
+
+
+def forecast_series(model_type: str, parameters: Dict[str, Any], horizon: int,
+                    holdout: int, series_id: Any, ds: np.ndarray,
+                    y: np.ndarray) -> Dict[str, Any]:
+    """Ajuste une série et prévoit `horizon` pas après sa fin.
+
+    Avec `holdout`, le modèle est ajusté sur la série sans ses `holdout`
+    derniers points et un seul ajustement sert aux métriques et à la prévision.
+    """
+    from app.services.time_series_training import TimeSeriesTrainer
+
+    start = time.perf_counter()
+    result = {"series_id": series_id, "status": "ok", "n_obs": int(len(y)),
+              "forecast": None, "metrics": None, "error": None}
+    try:
+        if len(y) <= holdout + 2:
+            raise ValueError("Série trop courte")
+        train = y[:-holdout] if holdout else y
+        steps = holdout + horizon
+        trainer = TimeSeriesTrainer()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if model_type == "prophet":
+                import pandas as pd
+                model = trainer.train_prophet(
+                    pd.Series(train, index=pd.DatetimeIndex(ds[:len(train)])),
+                    seasonality_mode=parameters.get("seasonality_mode", "additive")
+                )
+                future = pd.DataFrame({
+                    "ds": pd.to_datetime(_future_dates(ds[:len(train)], steps))
+                })
+                predictions = model.predict(future)["yhat"].to_numpy()
+            else:
+                model = trainer.train(model_type, dict(parameters, data=train))
+                predictions = np.asarray(model.forecast(steps))
+
+        if holdout:
+            errors = y[-holdout:] - predictions[:holdout]
+            result["metrics"] = {
+                "rmse": float(np.sqrt(np.mean(errors ** 2))),
+                "mae": float(np.mean(np.abs(errors))),
+            }
+        result["forecast"] = {
+            "ds": _future_dates(ds, horizon),
+            "yhat": [float(v) for v in predictions[holdout:]],
+        }
+    except Exception as e:
+        result.update(status="failed", error=str(e))
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def forecast_chunk(model_type: str, parameters: Dict[str, Any], horizon: int,
+                   holdout: int, chunk: List[Tuple[Any, np.ndarray, np.ndarray]]) -> List[Dict[str, Any]]:
+    """Traite un lot de séries dans un worker (amortit le coût d'un aller-retour IPC)."""
+    return [
+        forecast_series(model_type, parameters, horizon, holdout, series_id, ds, y)
+        for series_id, ds, y in chunk
+    ]
+
+
+def read_long_csv(fileobj, chunksize: Optional[int] = None):
+    """Lit une table longue (series_id, ds, y) par blocs de `chunksize` lignes.
+
+    Chaque bloc est converti en colonnes typées (datetime64, float64) avant
+    la lecture du suivant : seul le texte d'un bloc est en mémoire à la fois.
+    Les lignes d'une série pouvant être dispersées dans le fichier, la table
+    typée est ensuite assemblée en entier pour split_series.
+    """
+    import pandas as pd
+
+    parts = [
+        pd.DataFrame({
+            "series_id": chunk["series_id"].to_numpy(),
+            "ds": pd.to_datetime(chunk["ds"]).to_numpy(dtype="datetime64[ns]"),
+            "y": chunk["y"].to_numpy(dtype=np.float64),
+        })
+        for chunk in pd.read_csv(fileobj, usecols=list(REQUIRED_COLUMNS),
+                                 chunksize=chunksize or settings.INGEST_CHUNK_ROWS)
+    ]
+    if not parts:
+        return pd.DataFrame(columns=list(REQUIRED_COLUMNS))
+    return pd.concat(parts, ignore_index=True)
+
+
+def run_batch(frame, model_type: str, parameters: Optional[Dict[str, Any]] = None,
+              horizon: int = 12, holdout: int = 0, executor=None,
+              chunk_size: int = 16, max_in_flight: Optional[int] = None) -> "BatchRun":
+    """Prévoit chaque série d'une table longue et produit les résultats au fil de l'eau.
+
+    Le dernier élément produit est un résumé : {"summary": {...}} avec le
+    débit en séries par seconde. Les erreurs de validation sont levées
+    immédiatement, avant la première itération. Au plus `max_in_flight`
+    lots sont soumis à `executor` à la fois.
+    """
+    if model_type not in BATCH_MODEL_TYPES:
+        raise ValueError(f"Unsupported model type for batch: {model_type}")
+    missing = [c for c in REQUIRED_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Colonnes manquantes : {', '.join(missing)}")
+    return BatchRun(frame, model_type, parameters or {}, horizon, holdout,
+                    executor, chunk_size, max_in_flight)
+
+
+class BatchRun:
+    """Itérateur des résultats d'une prévision par lots.
+
+    cancel() peut être appelé depuis un autre thread (client déconnecté
+    pendant le streaming) : les lots non commencés sont annulés et
+    l'itération s'arrête ; les lots déjà en cours se terminent sans être lus.
+    """
+
+    def __init__(self, frame, model_type, parameters, horizon, holdout, executor,
+                 chunk_size, max_in_flight=None):
+        self._args = (model_type, parameters, horizon, holdout)
+        self._chunks = iter_chunks(split_series(frame), chunk_size)
+        self._executor = executor
+        self._max_in_flight = max_in_flight or settings.MAX_WORKERS
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._results = self._iterate()
+
+    def __iter__(self) -> "BatchRun":
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        return next(self._results)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        self._cancel_pending()
+
+    def _cancel_pending(self) -> None:
+        with self._lock:
+            for future in self._pending:
+                future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _completed(self) -> Iterator[List[Dict[str, Any]]]:
+        if self._executor is None:
+            for chunk in self._chunks:
+                if self.cancelled:
+                    return
+                yield forecast_chunk(*self._args, chunk)
+            return
+
+        chunks = iter(self._chunks)
+        try:
+            while not self.cancelled:
+                # Soumission au fil de l'eau : au plus `max_in_flight` lots en attente
+                with self._lock:
+                    while len(self._pending) < self._max_in_flight:
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            break
+                        self._pending.add(
+                            self._executor.submit(forecast_chunk, *self._args, chunk)
+                        )
+                    pending = set(self._pending)
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                with self._lock:
+                    self._pending -= done
+                for future in done:
+                    if not future.cancelled():
+                        yield future.result()
+        finally:
+            # Itération abandonnée (close()) : rien ne doit rester en file
+            self._cancel_pending()
+
+    def _iterate(self) -> Iterator[Dict[str, Any]]:
+        start = time.perf_counter()
+        counts = {"ok": 0, "failed": 0}
+        for results in self._completed():
+            for result in results:
+                counts[result["status"]] += 1
+                yield result
+        if self.cancelled:
+            return
+
+        elapsed = time.perf_counter() - start
+        total = counts["ok"] + counts["failed"]
+        yield {"summary": {
+            "series": total,
+            "succeeded": counts["ok"],
+            "failed": counts["failed"],
+            "seconds": round(elapsed, 4),
+            "series_per_second": round(total / elapsed, 2) if elapsed > 0 else None,
+        }}
@@ -0,0 +1,91 @@
+from typing import Any, Dict, List, Sequence, Tuple
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+
+def _result(index: int, status: str, model_id: Any = None, error: str = None) -> Dict[str, Any]:
+    return {"index": index, "id": model_id, "status": status, "error": error}
+
+
+def _existing_ids(db: Session, model_cls: Any, ids: Sequence[int]) -> set:
+    if not ids:
+        return set()
+    return set(db.scalars(select(model_cls.id).where(model_cls.id.in_(ids))))
+
+
+def bulk_insert(db: Session, model_cls: Any, rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insère toutes les lignes en un seul INSERT multi-valeurs, dans une transaction.
+
+    Retourne un résultat par ligne, dans l'ordre : {index, id, status, error}.
+    """
+    if not rows:
+        return []
+    try:
+        ids = db.scalars(
+            insert(model_cls).returning(model_cls.id, sort_by_parameter_order=True),
+            list(rows)
+        ).all()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return [_result(i, "created", model_id) for i, model_id in enumerate(ids)]
+
+
+def bulk_update(db: Session, model_cls: Any,
+                rows: Sequence[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Met à jour des lignes par clé primaire (executemany), dans une transaction.
+
+    `rows` : couples (id, champs à modifier). Les identifiants absents sont
+    signalés `not_found` ; les doublons `duplicate`.
+    """
+    existing = _existing_ids(db, model_cls, [model_id for model_id, _ in rows])
+    results, params, seen = [], [], set()
+    for i, (model_id, values) in enumerate(rows):
+        if model_id in seen:
+            results.append(_result(i, "duplicate", model_id, "Identifiant répété dans la requête"))
+        elif model_id not in existing:
+            results.append(_result(i, "not_found", model_id, "Model not found"))
+        else:
+            seen.add(model_id)
+            if values:
+                params.append(dict(values, id=model_id))
+            results.append(_result(i, "updated", model_id))
+    try:
+        if params:
+            # UPDATE groupé par clé primaire : une instruction par jeu de colonnes
+            db.execute(update(model_cls), params)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return results
+
+
+def bulk_delete(db: Session, model_cls: Any, ids: Sequence[int]) -> List[Dict[str, Any]]:
+    """Supprime des lignes en un seul DELETE ... WHERE id IN (...)."""
+    existing = _existing_ids(db, model_cls, ids)
+    results, found, seen = [], [], set()
+    for i, model_id in enumerate(ids):
+        if model_id in seen:
+            results.append(_result(i, "duplicate", model_id, "Identifiant répété dans la requête"))
+        elif model_id not in existing:
+            results.append(_result(i, "not_found", model_id, "Model not found"))
+        else:
+            seen.add(model_id)
+            found.append(model_id)
+            results.append(_result(i, "deleted", model_id))
+    try:
+        if found:
+            db.execute(delete(model_cls).where(model_cls.id.in_(found)))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return results
+
+
+def summarize(results: List[Dict[str, Any]], succeeded_status: str) -> Dict[str, Any]:
+    """Réponse d'une opération groupée : résultats par élément et totaux."""
+    succeeded = sum(1 for r in results if r["status"] == succeeded_status)
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
@@ -0,0 +1,289 @@
+import codecs
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.dataset import Dataset
+
+MANIFEST = "manifest.json"
+_DATASET_ID = re.compile(r"[0-9a-f]{16,64}")
+
+
+class DatasetNotFoundError(LookupError):
+    """Aucun jeu de données avec cet identifiant."""
+
+
+def read_header(fileobj: BinaryIO) -> List[str]:
+    """Lit uniquement la ligne d'en-tête d'un CSV binaire."""
+    line = fileobj.readline()
+    if not line:
+        raise ValueError("Fichier CSV vide")
+    if line.startswith(codecs.BOM_UTF8):
+        line = line[len(codecs.BOM_UTF8):]
+    return next(csv.reader([line.decode("utf-8")]))
+
+
+def check_columns(fileobj: BinaryIO, target_column: str, date_column: Optional[str] = None,
+                  columns: Sequence[str] = ()) -> Tuple[List[str], List[str]]:
+    """Lit l'en-tête et vérifie les colonnes demandées.
+
+    Retourne (colonnes du fichier, colonnes retenues) ; le fichier est
+    positionné après l'en-tête.
+    """
+    if not target_column:
+        raise ValueError("target_column is required")
+    names = read_header(fileobj)
+    wanted = [c for c in [date_column, target_column, *columns] if c]
+    missing = [c for c in wanted if c not in names]
+    if missing:
+        raise ValueError(f"Column '{missing[0]}' not found in data")
+    return names, wanted
+
+
+class DatasetStore:
+    """Jeux de données ingérés, stockés en colonnes binaires sur disque.
+
+    Chaque colonne est un fichier brut `colN.bin` (dtype fixe) décrit par
+    `manifest.json` ; le chargement se fait par np.memmap, sans copie.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_open: Optional[int] = None):
+        self.root = Path(root or settings.DATASET_STORAGE_PATH)
+        # Les jeux de données sont immuables : les memmaps ouverts sont
+        # réutilisés d'un entraînement à l'autre dans le processus, dans la
+        # limite de `max_open` colonnes (les moins récemment lues sont
+        # oubliées et fermées dès qu'elles ne sont plus référencées).
+        self.max_open = max_open or settings.DATASET_MAX_OPEN_COLUMNS
+        self._open: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, dataset_id: str) -> Path:
+        if not isinstance(dataset_id, str) or not _DATASET_ID.fullmatch(dataset_id):
+            raise DatasetNotFoundError(f"Jeu de données introuvable : {dataset_id}")
+        return self.root / dataset_id
+
+    def exists(self, dataset_id: str) -> bool:
+        return (self.path(dataset_id) / MANIFEST).exists()
+
+    def ingest_csv(self, fileobj: BinaryIO, target_column: str,
+                   date_column: Optional[str] = None,
+                   columns: Sequence[str] = (),
+                   chunksize: Optional[int] = None,
+                   dataset_id: Optional[str] = None) -> Dict[str, Any]:
+        """Écrit un CSV sur disque par blocs, sans le matérialiser entièrement.
+
+        Seules la colonne cible, la colonne de dates et `columns` sont
+        analysées, avec un type fixé (float64 / datetime64[ns]).
+        """
+        import pandas as pd
+
+        names, wanted = check_columns(fileobj, target_column, date_column, columns)
+
+        dtypes = {c: np.dtype("float64") for c in wanted if c != date_column}
+        if date_column:
+            dtypes[date_column] = np.dtype("datetime64[ns]")
+        files = {c: f"col{i}.bin" for i, c in enumerate(wanted)}
+
+        dataset_id = dataset_id or uuid.uuid4().hex
+        self.path(dataset_id)
+        tmp_dir = self.root / f".tmp-{uuid.uuid4().hex}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir.mkdir()
+        handles = {c: open(tmp_dir / files[c], "wb") for c in wanted}
+        rows = 0
+        try:
+            reader = pd.read_csv(
+                fileobj,
+                header=None,
+                names=names,
+                usecols=wanted,
+                dtype={c: "float64" for c in wanted if c != date_column},
+                chunksize=chunksize or settings.INGEST_CHUNK_ROWS,
+            )
+            for chunk in reader:
+                for column in wanted:
+                    if column == date_column:
+                        values = pd.to_datetime(chunk[column]).to_numpy(dtype="datetime64[ns]")
+                    else:
+                        values = chunk[column].to_numpy(dtype=np.float64)
+                    handles[column].write(np.ascontiguousarray(values).tobytes())
+                rows += len(chunk)
+        except BaseException:
+            for handle in handles.values():
+                handle.close()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        for handle in handles.values():
+            handle.close()
+
+        manifest = {
+            "id": dataset_id,
+            "rows": rows,
+            "target_column": target_column,
+            "date_column": date_column,
+            "columns": {
+                c: {"file": files[c], "dtype": dtypes[c].str} for c in wanted
+            },
+        }
+        with open(tmp_dir / MANIFEST, "w") as f:
+            json.dump(manifest, f)
+        try:
+            os.replace(tmp_dir, self.path(dataset_id))
+        except OSError:
+            # Ingestion concurrente du même contenu : la première copie est gardée
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not self.exists(dataset_id):
+                raise
+        return manifest
+
+    def manifest(self, dataset_id: str) -> Dict[str, Any]:
+        path = self.path(dataset_id) / MANIFEST
+        if not path.exists():
+            raise DatasetNotFoundError(f"Jeu de données introuvable : {dataset_id}")
+        with open(path) as f:
+            return json.load(f)
+
+    def load(self, dataset_id: str,
+             columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Retourne les colonnes demandées en mémoire mappée (lecture seule)."""
+        manifest = self.manifest(dataset_id)
+        columns = columns or list(manifest["columns"])
+        arrays = {}
+        for column in columns:
+            if column not in manifest["columns"]:
+                raise KeyError(f"Colonne inconnue : {column}")
+            spec = manifest["columns"][column]
+            if manifest["rows"] == 0:
+                arrays[column] = np.empty(0, dtype=spec["dtype"])
+                continue
+            key = (dataset_id, column)
+            with self._lock:
+                if key in self._open:
+                    self._open.move_to_end(key)
+                else:
+                    self._open[key] = np.memmap(
+                        self.path(dataset_id) / spec["file"],
+                        dtype=np.dtype(spec["dtype"]),
+                        mode="r",
+                        shape=(manifest["rows"],)
+                    )
+                    while len(self._open) > self.max_open:
+                        self._open.popitem(last=False)
+                arrays[column] = self._open[key]
+        return arrays
+
+    def delete(self, dataset_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._open if k[0] == dataset_id]:
+                del self._open[key]
+        shutil.rmtree(self.path(dataset_id), ignore_errors=True)
+
+
+dataset_store = DatasetStore()
+
+
+def hash_stream(fileobj: BinaryIO, block_size: int = 1024 * 1024) -> Tuple[str, int]:
+    """SHA-256 et taille d'un fichier binaire, puis retour au début."""
+    digest = hashlib.sha256()
+    size = 0
+    for block in iter(lambda: fileobj.read(block_size), b""):
+        digest.update(block)
+        size += len(block)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+def dataset_key(content_hash: str, target_column: str, date_column: Optional[str],
+                columns: Sequence[str] = ()) -> str:
+    """Identifiant d'un jeu de données : contenu + colonnes retenues."""
+    selection = json.dumps([target_column, date_column, list(columns)])
+    return hashlib.sha256(f"{content_hash}:{selection}".encode()).hexdigest()[:32]
+
+
+class DatasetRegistry:
+    """Registre des jeux de données : une ligne par contenu, fichiers partagés."""
+
+    def __init__(self, db: Session, store: Optional[DatasetStore] = None):
+        self.db = db
+        self.store = store or dataset_store
+
+    def register_csv(self, fileobj: BinaryIO, target_column: str,
+                     date_column: Optional[str] = None, columns: Sequence[str] = (),
+                     name: Optional[str] = None) -> Tuple[Dataset, bool]:
+        """Ingère un CSV, ou retourne le jeu existant si le contenu est déjà connu.
+
+        Retourne (jeu de données, créé).
+        """
+        # Un en-tête invalide est rejeté avant de lire tout le fichier
+        check_columns(fileobj, target_column, date_column, columns)
+        fileobj.seek(0)
+        content_hash, size = hash_stream(fileobj)
+        dataset_id = dataset_key(content_hash, target_column, date_column, columns)
+
+        dataset = self.db.get(Dataset, dataset_id)
+        if dataset is not None and self.store.exists(dataset_id):
+            return self._count_upload(dataset), False
+
+        manifest = self.store.ingest_csv(
+            fileobj, target_column, date_column, columns, dataset_id=dataset_id
+        )
+        if dataset is None:
+            dataset = Dataset(id=dataset_id)
+            self.db.add(dataset)
+        dataset.content_hash = content_hash
+        dataset.name = name
+        dataset.target_column = target_column
+        dataset.date_column = date_column
+        dataset.columns = list(manifest["columns"])
+        dataset.rows = manifest["rows"]
+        dataset.size_bytes = size
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Envoi concurrent du même contenu : l'autre requête a créé la ligne
+            self.db.rollback()
+            existing = self.db.get(Dataset, dataset_id)
+            if existing is None:
+                raise
+            return self._count_upload(existing), False
+        self.db.refresh(dataset)
+        return dataset, True
+
+    def _count_upload(self, dataset: Dataset) -> Dataset:
+        dataset.upload_count = (dataset.upload_count or 0) + 1
+        self.db.commit()
+        return dataset
+
+    def get(self, dataset_id: str) -> Optional[Dataset]:
+        return self.db.get(Dataset, dataset_id)
+
+    def list(self, skip: int = 0, limit: int = 100) -> List[Dataset]:
+        return self.db.query(Dataset).order_by(Dataset.created_at.desc()) \
+            .offset(skip).limit(limit).all()
+
+    def load(self, dataset_id: str,
+             columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Colonnes d'un jeu enregistré, en mémoire mappée."""
+        if self.get(dataset_id) is None:
+            raise DatasetNotFoundError(f"Jeu de données introuvable : {dataset_id}")
+        return self.store.load(dataset_id, columns)
+
+    def delete(self, dataset_id: str) -> bool:
+        dataset = self.get(dataset_id)
+        if dataset is None:
+            return False
+        self.db.delete(dataset)
+        self.db.commit()
+        self.store.delete(dataset_id)
+        return True
@@ -1,8 +1,17 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from app.models.deep_learning import DeepLearningModel
 from app.schemas.deep_learning import DeepLearningModelCreate, DeepLearningModelUpdate
 from app.services.base import BaseService
+from app.services.artifact_store import artifact_store
+from app.services.bulk import bulk_insert, bulk_update, bulk_delete
+from app.services.deep_learning_queries import (
+    MAX_PAGE_SIZE, build_model_query, cursor_after_id, next_cursor
+)
+from app.services.model_cache import invalidate_model
+
+# Espace d'artefacts propre à deep_learning_models ; "dl" reste celui de l'ancienne table dl_models
+ARTIFACT_KIND = "deep_learning"
 
 class DeepLearningService(BaseService[DeepLearningModel]):
     def __init__(self, db: Session):
@@ -28,27 +37,72 @@ class DeepLearningService(BaseService[DeepLearningModel]):
         
         self.db.commit()
         self.db.refresh(db_model)
+        invalidate_model(model_id, kind=ARTIFACT_KIND)
         return db_model
 
-    def get_by_type(self, model_type: str) -> List[DeepLearningModel]:
-        """Récupère tous les modèles d'un type donné."""
-        return self.db.query(DeepLearningModel).filter(
-            DeepLearningModel.model_type == model_type
-        ).all()
-
-    def get_by_status(self, status: str) -> List[DeepLearningModel]:
-        """Récupère tous les modèles avec un statut donné."""
-        return self.db.query(DeepLearningModel).filter(
-            DeepLearningModel.status == status
-        ).all()
-
-    def get_by_accuracy_range(self, min_accuracy: float, 
-                            max_accuracy: float) -> List[DeepLearningModel]:
-        """Récupère tous les modèles dans une plage de précision donnée."""
-        return self.db.query(DeepLearningModel).filter(
-            DeepLearningModel.accuracy >= min_accuracy,
-            DeepLearningModel.accuracy <= max_accuracy
-        ).all()
+    def bulk_create_models(self, models: List[DeepLearningModelCreate]) -> List[Dict[str, Any]]:
+        """Crée plusieurs modèles en une seule transaction.
+        
+        Retourne un résultat par modèle : {index, id, status, error}.
+        """
+        return bulk_insert(self.db, DeepLearningModel, [model.dict() for model in models])
+
+    def bulk_update_models(self, updates: List[Tuple[int, DeepLearningModelUpdate]]) -> List[Dict[str, Any]]:
+        """Met à jour plusieurs modèles (couples id, modifications) en une transaction."""
+        results = bulk_update(
+            self.db, DeepLearningModel,
+            [(model_id, model.dict(exclude_unset=True)) for model_id, model in updates]
+        )
+        for result in results:
+            if result["status"] == "updated":
+                invalidate_model(result["id"], kind=ARTIFACT_KIND)
+        return results
+
+    def bulk_remove(self, model_ids: List[int]) -> List[Dict[str, Any]]:
+        """Supprime plusieurs modèles et leurs artefacts en une transaction."""
+        results = bulk_delete(self.db, DeepLearningModel, model_ids)
+        for result in results:
+            if result["status"] == "deleted":
+                artifact_store.delete(result["id"], kind=ARTIFACT_KIND)
+                invalidate_model(result["id"], kind=ARTIFACT_KIND)
+        return results
+
+    def query_models(self, model_type: Optional[str] = None, status: Optional[str] = None,
+                     min_accuracy: Optional[float] = None,
+                     max_accuracy: Optional[float] = None, skip: int = 0,
+                     limit: int = 100,
+                     cursor: Optional[str] = None) -> Tuple[List[DeepLearningModel], Optional[str]]:
+        """Liste les modèles en combinant tous les filtres fournis.
+        
+        Retourne (page, curseur de la page suivante ou None). Avec `cursor`,
+        la page reprend après le dernier id vu (sans OFFSET).
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        query = build_model_query(
+            model_type=model_type, status=status,
+            min_accuracy=min_accuracy, max_accuracy=max_accuracy,
+            after_id=cursor_after_id(cursor), skip=skip, limit=limit + 1
+        )
+        models = self.db.scalars(query).all()
+        if len(models) > limit:
+            return models[:limit], next_cursor(models[limit - 1].id)
+        return models, None
+
+    def get_by_type(self, model_type: str, skip: int = 0,
+                    limit: int = 100) -> List[DeepLearningModel]:
+        """Récupère les modèles d'un type donné."""
+        return self.query_models(model_type=model_type, skip=skip, limit=limit)[0]
+
+    def get_by_status(self, status: str, skip: int = 0,
+                      limit: int = 100) -> List[DeepLearningModel]:
+        """Récupère les modèles avec un statut donné."""
+        return self.query_models(status=status, skip=skip, limit=limit)[0]
+
+    def get_by_accuracy_range(self, min_accuracy: float, max_accuracy: float,
+                              skip: int = 0, limit: int = 100) -> List[DeepLearningModel]:
+        """Récupère les modèles dans une plage de précision donnée."""
+        return self.query_models(min_accuracy=min_accuracy, max_accuracy=max_accuracy,
+                                 skip=skip, limit=limit)[0]
 
     def update_weights(self, model_id: int, weights_path: str) -> Optional[DeepLearningModel]:
         """Met à jour le chemin des poids du modèle."""
@@ -59,4 +113,27 @@ class DeepLearningService(BaseService[DeepLearningModel]):
         db_model.weights_path = weights_path
         self.db.commit()
         self.db.refresh(db_model)
+        invalidate_model(model_id, kind=ARTIFACT_KIND)
+        return db_model
+
+    def save_weights(self, model_id: int, model: Any) -> Optional[DeepLearningModel]:
+        """Enregistre le modèle entraîné dans le stockage d'artefacts et
+        pointe weights_path vers la nouvelle version."""
+        db_model = self.get(model_id)
+        if not db_model:
+            return None
+        
+        entry = artifact_store.save(model_id, model, kind=ARTIFACT_KIND)
+        db_model.weights_path = entry["path"]
+        db_model.version = str(entry["version"])
+        self.db.commit()
+        self.db.refresh(db_model)
+        invalidate_model(model_id, kind=ARTIFACT_KIND)
+        return db_model
+
+    def remove(self, model_id: int):
+        """Supprime un modèle et ses artefacts."""
+        db_model = super().remove(model_id)
+        artifact_store.delete(model_id, kind=ARTIFACT_KIND)
+        invalidate_model(model_id, kind=ARTIFACT_KIND)
         return db_model 
\ No newline at end of file
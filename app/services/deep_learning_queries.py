@@ -0,0 +1,53 @@
+from typing import Any, Optional
+from sqlalchemy import Select, select
+from app.models.deep_learning import DeepLearningModel
+from app.services.model_listing import InvalidCursorError, decode_cursor, encode_cursor
+
+MAX_PAGE_SIZE = 500
+
+
+def build_model_query(model_type: Optional[str] = None, status: Optional[str] = None,
+                      min_accuracy: Optional[float] = None,
+                      max_accuracy: Optional[float] = None,
+                      after_id: Optional[int] = None, skip: int = 0,
+                      limit: Optional[int] = 100, entity: Any = None) -> Select:
+    """Requête des modèles DL combinant tous les filtres fournis.
+
+    Tri par id croissant ; pagination par `skip`/`limit` ou, plus efficace
+    en profondeur, par `after_id` (dernier id de la page précédente).
+    `entity` vaut la classe ORM par défaut, ou la table pour une requête Core.
+    `limit` est borné à MAX_PAGE_SIZE + 1 : l'appelant peut lire une ligne
+    de plus que la page pour savoir s'il en existe une suivante.
+    """
+    columns = DeepLearningModel.__table__.c
+    query = select(entity if entity is not None else DeepLearningModel)
+    if model_type is not None:
+        query = query.where(columns.model_type == model_type)
+    if status is not None:
+        query = query.where(columns.status == status)
+    if min_accuracy is not None:
+        query = query.where(columns.accuracy >= min_accuracy)
+    if max_accuracy is not None:
+        query = query.where(columns.accuracy <= max_accuracy)
+    if after_id is not None:
+        query = query.where(columns.id > after_id)
+    query = query.order_by(columns.id)
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(min(limit, MAX_PAGE_SIZE + 1))
+    return query
+
+
+def cursor_after_id(cursor: Optional[str]) -> Optional[int]:
+    """Dernier id vu, lu depuis un curseur opaque."""
+    if cursor is None:
+        return None
+    after_id = decode_cursor(cursor).get("id")
+    if not isinstance(after_id, int):
+        raise InvalidCursorError("Curseur invalide")
+    return after_id
+
+
+def next_cursor(last_id: int) -> str:
+    return encode_cursor({"id": last_id})
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import numpy as np
+from app.core.config import settings
+
+
+def _concat(parts: List[Any]) -> Any:
+    """Concatène des DataFrames ou des tableaux ligne à ligne."""
+    if hasattr(parts[0], "iloc"):
+        import pandas as pd
+        return pd.concat(parts, ignore_index=True)
+    return np.concatenate([np.asarray(p) for p in parts])
+
+
+class BatchMetrics:
+    """Taux de remplissage des lots et délai d'attente dans la file."""
+
+    def __init__(self, window: int = 1000):
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.fill_sum = 0.0
+        self.delay_sum_ms = 0.0
+        self.delay_max_ms = 0.0
+        self._recent_delays = deque(maxlen=window)
+
+    def record(self, batch_rows: int, batch_requests: int, max_batch_size: int,
+               delays_ms: List[float]) -> None:
+        self.batches += 1
+        self.requests += batch_requests
+        self.rows += batch_rows
+        self.fill_sum += min(batch_rows / max_batch_size, 1.0)
+        self.delay_sum_ms += sum(delays_ms)
+        self.delay_max_ms = max(self.delay_max_ms, max(delays_ms))
+        self._recent_delays.extend(delays_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = np.asarray(self._recent_delays) if self._recent_delays else None
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "avg_batch_rows": self.rows / self.batches if self.batches else 0.0,
+            "avg_fill_rate": self.fill_sum / self.batches if self.batches else 0.0,
+            "avg_queue_delay_ms": self.delay_sum_ms / self.requests if self.requests else 0.0,
+            "p95_queue_delay_ms": float(np.percentile(recent, 95)) if recent is not None else 0.0,
+            "max_queue_delay_ms": self.delay_max_ms,
+        }
+
+
+class ModelBatcher:
+    """Regroupe les requêtes de prédiction d'un modèle en un seul appel vectorisé.
+
+    Un lot part dès qu'il atteint `max_batch_size` lignes ou que la plus
+    ancienne requête a attendu `max_wait_ms`. La prédiction s'exécute dans
+    le pool de threads pour ne pas bloquer la boucle d'événements.
+    """
+
+    def __init__(self, predict_fn: Callable[[Any], Any], max_batch_size: int,
+                 max_wait_ms: float):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.metrics = BatchMetrics()
+        self._loop = None
+        self._queue = None
+        self._task = None
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, rows: Any) -> List[Any]:
+        """Ajoute des lignes au prochain lot et attend leurs prédictions."""
+        self._ensure_running()
+        future = self._loop.create_future()
+        await self._queue.put((rows, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[tuple]:
+        first = await self._queue.get()
+        batch, n_rows = [first], len(first[0])
+        deadline = first[2] + self.max_wait_ms / 1000
+        while n_rows < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            n_rows += len(item[0])
+        return batch
+
+    async def _predict(self, rows: Any) -> np.ndarray:
+        return np.asarray(await self._loop.run_in_executor(None, self.predict_fn, rows))
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            sizes = [len(rows) for rows, _, _ in batch]
+            try:
+                outputs = await self._predict(_concat([rows for rows, _, _ in batch]))
+                offsets = np.cumsum([0] + sizes)
+                for (_, future, _), start, stop in zip(batch, offsets[:-1], offsets[1:]):
+                    if not future.done():
+                        future.set_result(outputs[start:stop].tolist())
+            except Exception as e:
+                if len(batch) == 1:
+                    if not batch[0][1].done():
+                        batch[0][1].set_exception(e)
+                else:
+                    # Une requête invalide ne doit pas faire échouer les autres :
+                    # chacune est rejouée seule
+                    await self._predict_each(batch)
+            self.metrics.record(
+                sum(sizes), len(batch), self.max_batch_size,
+                [(started - enqueued) * 1000 for _, _, enqueued in batch]
+            )
+
+    async def _predict_each(self, batch: List[tuple]) -> None:
+        for rows, future, _ in batch:
+            if future.done():
+                continue
+            try:
+                outputs = await self._predict(rows)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(outputs.tolist())
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class MicroBatcher:
+    """Un ModelBatcher par modèle, avec une configuration propre à chacun."""
+
+    def __init__(self, max_batch_size: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None):
+        self.default_batch_size = max_batch_size or settings.BATCH_SIZE
+        self.default_wait_ms = max_wait_ms if max_wait_ms is not None else settings.BATCH_MAX_WAIT_MS
+        self._batchers: Dict[Hashable, ModelBatcher] = {}
+        self._config: Dict[Hashable, Dict[str, Any]] = {}
+
+    def configure(self, key: Hashable, max_batch_size: Optional[int] = None,
+                  max_wait_ms: Optional[float] = None) -> None:
+        """Fixe la taille de lot et l'attente maximale d'un modèle."""
+        config = self._config.setdefault(key, {})
+        if max_batch_size is not None:
+            config["max_batch_size"] = max_batch_size
+        if max_wait_ms is not None:
+            config["max_wait_ms"] = max_wait_ms
+        batcher = self._batchers.get(key)
+        if batcher is not None:
+            batcher.max_batch_size = config.get("max_batch_size", batcher.max_batch_size)
+            batcher.max_wait_ms = config.get("max_wait_ms", batcher.max_wait_ms)
+
+    async def predict(self, key: Hashable, predict_fn: Callable[[Any], Any], rows: Any) -> List[Any]:
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            config = self._config.get(key, {})
+            batcher = ModelBatcher(
+                predict_fn,
+                config.get("max_batch_size", self.default_batch_size),
+                config.get("max_wait_ms", self.default_wait_ms)
+            )
+            self._batchers[key] = batcher
+        return await batcher.submit(rows)
+
+    def metrics(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            return None
+        return dict(batcher.metrics.snapshot(),
+                    max_batch_size=batcher.max_batch_size,
+                    max_wait_ms=batcher.max_wait_ms)
+
+    def close(self) -> None:
+        for batcher in self._batchers.values():
+            batcher.close()
+        self._batchers.clear()
+
+
+micro_batcher = MicroBatcher()
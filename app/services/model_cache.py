@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from app.core.config import settings
+from app.services.artifact_store import artifact_store
+
+
+class ModelCache:
+    """Cache LRU des modèles désérialisés, propre au processus.
+
+    Bornes : nombre d'entrées, taille cumulée (en octets sérialisés) et durée
+    de vie. Un seul chargement a lieu par clé même si plusieurs requêtes la
+    demandent en même temps.
+    """
+
+    def __init__(self, max_items: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        self.max_items = max_items if max_items is not None else settings.MODEL_CACHE_MAX_ITEMS
+        self.max_bytes = max_bytes if max_bytes is not None else settings.MODEL_CACHE_MAX_BYTES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.MODEL_CACHE_TTL_SECONDS
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, loaded_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.monotonic() - loaded_at > self.ttl_seconds
+
+    def _pop(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[2]):
+                if entry is not None:
+                    self._pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while self._entries and (
+                (self.max_items and len(self._entries) > self.max_items)
+                or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Tuple[Any, int]]) -> Any:
+        """Retourne l'entrée en cache ou appelle `loader()` -> (valeur, taille)."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                # Un autre thread a pu charger la clé pendant l'attente
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None and not self._expired(entry[2]):
+                        return entry[0]
+                value, size = loader()
+                self.put(key, value, size)
+            return value
+        finally:
+            # Y compris si loader() lève : pas de verrou orphelin par clé
+            with self._lock:
+                if self._loading.get(key) is key_lock:
+                    del self._loading[key]
+
+    def invalidate(self, kind: str, model_id: Any) -> None:
+        """Retire toutes les versions en cache d'un modèle."""
+        with self._lock:
+            for key in [k for k in self._entries if k[:2] == (kind, model_id)]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "items": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+model_cache = ModelCache()
+
+
+def load_model(model_id: Any, version: Optional[int] = None, kind: str = "ml") -> Any:
+    """Charge un modèle depuis le stockage d'artefacts en passant par le cache."""
+    def loader():
+        entry = artifact_store.resolve(model_id, version, kind)
+        return artifact_store.load(model_id, entry["version"], kind), entry["size"]
+
+    return model_cache.get_or_load((kind, model_id, version), loader)
+
+
+def invalidate_model(model_id: Any, kind: str = "ml") -> None:
+    """À appeler après toute mise à jour ou suppression d'un modèle."""
+    model_cache.invalidate(kind, model_id)
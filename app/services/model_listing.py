@@ -0,0 +1,158 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import String, and_, literal, or_, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+
+SORT_FIELDS = ("created_at", "name", "accuracy", "id")
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    """Curseur de pagination illisible ou incompatible avec le tri demandé."""
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Curseur opaque : JSON encodé en base64 (URL-safe)."""
+    def default(value):
+        if isinstance(value, datetime):
+            return {"$dt": value.isoformat()}
+        raise TypeError(f"Valeur de curseur non sérialisable : {value!r}")
+
+    raw = json.dumps(values, default=default, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    def hook(obj):
+        if set(obj) == {"$dt"}:
+            return datetime.fromisoformat(obj["$dt"])
+        return obj
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw, object_hook=hook)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError("Curseur invalide") from e
+    if not isinstance(values, dict):
+        raise InvalidCursorError("Curseur invalide")
+    return values
+
+
+def _sort_expression(column, dialect: str):
+    # SQLite stocke les dates en texte sous des formats variables
+    # (CURRENT_TIMESTAMP sans microsecondes, Python avec) : on trie et on
+    # compare la valeur brute pour que le curseur retrouve exactement la ligne.
+    if dialect == "sqlite" and column.name == "created_at":
+        return type_coerce(column, String)
+    return column
+
+
+def models_union(sources: Sequence[Tuple[Any, str]]):
+    """Sous-requête UNION ALL des colonnes listées de chaque table de modèles.
+
+    `sources` : couples (classe ORM, framework) ; framework None pour une
+    table qui porte sa propre colonne `framework`.
+    """
+    selects = [
+        select(
+            model.id.label("id"),
+            model.name.label("name"),
+            model.type.label("type"),
+            (model.framework if framework is None else literal(framework)).label("framework"),
+            model.accuracy.label("accuracy"),
+            model.created_at.label("created_at"),
+        )
+        for model, framework in sources
+    ]
+    if len(selects) == 1:
+        return selects[0].subquery("models")
+    return union_all(*selects).subquery("models")
+
+
+def list_models(db: Session, sources: Sequence[Tuple[Any, str]],
+                framework: Optional[str] = None, model_type: Optional[str] = None,
+                name: Optional[str] = None, min_accuracy: Optional[float] = None,
+                max_accuracy: Optional[float] = None, sort: str = "created_at",
+                order: str = "desc", limit: int = 100,
+                cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Une page de modèles, toutes tables confondues, en une seule requête.
+
+    Pagination par curseur (keyset) : la page suivante reprend après le
+    dernier tuple (tri, framework, id) vu, sans OFFSET, donc en temps
+    constant quelle que soit la profondeur. Seules les colonnes listées
+    sont lues, sans instancier d'objets ORM.
+
+    Retourne (lignes, curseur de la page suivante ou None).
+    """
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Tri inconnu : {sort}")
+    if order not in ("asc", "desc"):
+        raise ValueError(f"Ordre inconnu : {order}")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    models = models_union(sources)
+    dialect = db.get_bind().dialect.name
+    key = _sort_expression(models.c[sort], dialect)
+    columns = [key, models.c.framework, models.c.id]
+
+    query = select(*[c for c in models.c], key.label("sort_key"))
+    if framework is not None:
+        query = query.where(models.c.framework == framework)
+    if model_type is not None:
+        query = query.where(models.c.type == model_type)
+    if name:
+        query = query.where(models.c.name.contains(name, autoescape=True))
+    if min_accuracy is not None:
+        query = query.where(models.c.accuracy >= min_accuracy)
+    if max_accuracy is not None:
+        query = query.where(models.c.accuracy <= max_accuracy)
+
+    if cursor is not None:
+        values = decode_cursor(cursor)
+        if values.get("sort") != sort or values.get("order") != order:
+            raise InvalidCursorError("Le curseur ne correspond pas au tri demandé")
+        after = [values.get("key"), values.get("framework"), values.get("id")]
+        query = query.where(_after(columns, after, order))
+
+    direction = (lambda c: c.desc()) if order == "desc" else (lambda c: c.asc())
+    query = query.order_by(
+        direction(columns[0]).nulls_last(), *[direction(c) for c in columns[1:]]
+    ).limit(limit + 1)
+
+    rows = [dict(row) for row in db.execute(query).mappings()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor({
+            "sort": sort, "order": order,
+            "key": last["sort_key"], "framework": last["framework"], "id": last["id"],
+        })
+    for row in rows:
+        del row["sort_key"]
+    return rows, next_cursor
+
+
+def _after(columns: List[Any], values: List[Any], order: str):
+    """Condition « strictement après `values` » dans l'ordre (colonnes, order),
+    les NULL de la colonne de tri étant placés en dernier (NULLS LAST)."""
+    key, rest = columns[0], columns[1:]
+    key_value, rest_values = values[0], values[1:]
+
+    def beyond(column, value):
+        return column < value if order == "desc" else column > value
+
+    # Départage sur (framework, id), strictement après
+    tie = or_(*[
+        and_(*[c == v for c, v in zip(rest[:i], rest_values[:i])], beyond(rest[i], rest_values[i]))
+        for i in range(len(rest))
+    ])
+    if key_value is None:
+        return and_(key.is_(None), tie)
+    return or_(
+        beyond(key, key_value),
+        and_(key == key_value, tie),
+        key.is_(None),
+    )
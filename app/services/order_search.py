@@ -0,0 +1,231 @@
+import hashlib
+import itertools
+import math
+import multiprocessing
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.backends import get_backend
+
+CRITERIA = ("aic", "bic", "holdout")
+NO_SEASON = (0, 0, 0, 0)
+
+Order = Tuple[int, int, int]
+SeasonalOrder = Tuple[int, int, int, int]
+
+
+def data_fingerprint(data) -> str:
+    """Empreinte SHA-1 du contenu d'une série."""
+    values = np.ascontiguousarray(np.asarray(data, dtype=np.float64))
+    return hashlib.sha1(values.tobytes()).hexdigest()
+
+
+def candidate_orders(p: Iterable[int], d: Iterable[int], q: Iterable[int],
+                     P: Iterable[int] = (0,), D: Iterable[int] = (0,),
+                     Q: Iterable[int] = (0,), s: int = 0) -> List[Tuple[Order, SeasonalOrder]]:
+    """Produit cartésien des ordres (p,d,q)(P,D,Q,s), du plus simple au plus complexe."""
+    seasonal = [NO_SEASON] if not s else [
+        (sp, sd, sq, s) for sp, sd, sq in itertools.product(P, D, Q)
+    ]
+    candidates = [
+        ((op, od, oq), so)
+        for (op, od, oq), so in itertools.product(itertools.product(p, d, q), seasonal)
+    ]
+    return sorted(candidates, key=lambda c: (sum(c[0]) + sum(c[1][:3]), c))
+
+
+def _fit_candidate(data: np.ndarray, order: Order, seasonal_order: SeasonalOrder,
+                   criterion: str, holdout: int, maxiter: Optional[int],
+                   start_params: Optional[List[float]] = None) -> Dict[str, Any]:
+    """Ajuste un candidat et calcule son score (exécuté dans un worker)."""
+    statsmodels = get_backend("statsmodels")
+    train = data[:-holdout] if holdout else data
+    result = {
+        "order": order,
+        "seasonal_order": seasonal_order,
+        "aic": None,
+        "bic": None,
+        "holdout_rmse": None,
+        "converged": False,
+        "error": None,
+        "score": math.inf,
+        "params": None,
+    }
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if seasonal_order == NO_SEASON:
+                method_kwargs = None if maxiter is None else {"maxiter": maxiter}
+                fitted = statsmodels.ARIMA(train, order=order).fit(
+                    start_params=start_params, method_kwargs=method_kwargs
+                )
+            else:
+                fit_kwargs = {} if maxiter is None else {"maxiter": maxiter}
+                fitted = statsmodels.SARIMAX(
+                    train, order=order, seasonal_order=seasonal_order
+                ).fit(start_params=start_params, disp=False, **fit_kwargs)
+        retvals = getattr(fitted, "mle_retvals", None) or {}
+        result["converged"] = bool(retvals.get("converged", True))
+        result["aic"] = float(fitted.aic)
+        result["bic"] = float(fitted.bic)
+        result["params"] = [float(v) for v in np.asarray(fitted.params)]
+        if holdout:
+            forecast = np.asarray(fitted.forecast(holdout))
+            result["holdout_rmse"] = float(np.sqrt(np.mean((data[-holdout:] - forecast) ** 2)))
+        score = result["holdout_rmse"] if criterion == "holdout" else result[criterion]
+        result["score"] = score if np.isfinite(score) else math.inf
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+class OrderSearchCache:
+    """Cache LRU des résultats d'ajustement, par empreinte de données et ordre."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(self._entries[key])
+            self.misses += 1
+            return None
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = dict(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+search_cache = OrderSearchCache()
+
+
+def _fit_many(data: np.ndarray, candidates, criterion: str, holdout: int,
+              maxiter: Optional[int], fingerprint: str, cache: Optional[OrderSearchCache],
+              n_jobs: int) -> List[Dict[str, Any]]:
+    """Ajuste les candidats (ordre, ordre saisonnier, paramètres initiaux) en
+    parallèle en réutilisant le cache."""
+    results, pending = [], []
+    for order, seasonal_order, start_params in candidates:
+        key = (fingerprint, order, seasonal_order, criterion, holdout, maxiter)
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            results.append(cached)
+        else:
+            pending.append((key, order, seasonal_order, start_params))
+
+    if not pending:
+        return results
+
+    if n_jobs <= 1 or len(pending) == 1:
+        fitted = [(key, _fit_candidate(data, order, so, criterion, holdout, maxiter, sp))
+                  for key, order, so, sp in pending]
+    else:
+        fitted = []
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(pending)),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {
+                executor.submit(_fit_candidate, data, order, so, criterion,
+                                holdout, maxiter, sp): key
+                for key, order, so, sp in pending
+            }
+            for future in as_completed(futures):
+                fitted.append((futures[future], future.result()))
+
+    for key, result in fitted:
+        if cache is not None:
+            cache.set(key, result)
+        results.append(result)
+    return results
+
+
+def search_orders(data, candidates: List[Tuple[Order, SeasonalOrder]],
+                  criterion: str = "aic", holdout: int = 0,
+                  n_jobs: Optional[int] = None, screening_maxiter: Optional[int] = 25,
+                  prune_delta: float = 10.0, prune_ratio: float = 0.5,
+                  cache: Optional[OrderSearchCache] = search_cache) -> List[Dict[str, Any]]:
+    """Recherche les meilleurs ordres ARIMA/SARIMA sur une grille.
+
+    Deux passes : un criblage rapide (`screening_maxiter` itérations) élimine
+    les candidats en échec et ceux nettement moins bons que le meilleur
+    (écart d'AIC/BIC > `prune_delta`, ou erreur de validation au-delà de
+    `(1 + prune_ratio)` fois la meilleure). Seuls les survivants qui n'ont pas
+    encore convergé sont ré-ajustés sans limite d'itérations, à partir des
+    paramètres du criblage. Les candidats qui ne convergent pas sont écartés.
+    Retourne
+    tous les candidats triés, avec un champ `status` (ok, pruned, failed,
+    not_converged).
+
+    Appelée depuis un worker d'un pool (tâches d'entraînement, prévision par
+    lots), la recherche reste séquentielle : le pool appelant occupe déjà
+    les cœurs, et un pool imbriqué multiplierait les processus.
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Critère inconnu : {criterion}")
+    if criterion == "holdout" and holdout < 1:
+        raise ValueError("Le critère 'holdout' nécessite holdout >= 1")
+
+    data = np.asarray(data, dtype=np.float64)
+    candidates = [(tuple(order), tuple(so)) for order, so in candidates]
+    fingerprint = data_fingerprint(data)
+    n_jobs = n_jobs or settings.MAX_WORKERS
+    if multiprocessing.parent_process() is not None:
+        n_jobs = 1
+
+    survivors = [(order, so, None) for order, so in candidates]
+    ranking: Dict[Tuple[Order, SeasonalOrder], Dict[str, Any]] = {}
+
+    if screening_maxiter is not None and len(candidates) > 1:
+        screened = _fit_many(data, survivors, criterion, holdout, screening_maxiter,
+                             fingerprint, cache, n_jobs)
+        finite = [r["score"] for r in screened if r["error"] is None and np.isfinite(r["score"])]
+        best = min(finite) if finite else math.inf
+        if criterion == "holdout":
+            threshold = best * (1 + prune_ratio)
+        else:
+            threshold = best + prune_delta
+
+        survivors = []
+        for result in screened:
+            key = (result["order"], result["seasonal_order"])
+            if result["error"] is not None:
+                ranking[key] = dict(result, status="failed")
+            elif result["score"] > threshold:
+                ranking[key] = dict(result, status="pruned")
+            elif result["converged"]:
+                ranking[key] = dict(result, status="ok")
+            else:
+                survivors.append(key + (result["params"],))
+
+    for result in _fit_many(data, survivors, criterion, holdout, None,
+                            fingerprint, cache, n_jobs):
+        key = (result["order"], result["seasonal_order"])
+        if result["error"] is not None:
+            status = "failed"
+        elif not result["converged"]:
+            status = "not_converged"
+        else:
+            status = "ok"
+        ranking[key] = dict(result, status=status)
+
+    status_rank = {"ok": 0, "not_converged": 1, "pruned": 2, "failed": 3}
+    return sorted(ranking.values(), key=lambda r: (status_rank[r["status"]], r["score"]))
@@ -1,41 +1,70 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import pandas as pd
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from prophet import Prophet
-from sklearn.preprocessing import MinMaxScaler
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
+from app.core.config import settings
 from app.models.time_series_models import TimeSeriesModel
 from app.db.session import SessionLocal
+from app.services.backends import get_backend, get_model_backend
+from app.services.batch_forecasting import run_batch
+from app.services.datasets import dataset_store
+from app.services.order_search import candidate_orders, search_orders
+from app.services.time_series_windows import make_windows, iter_window_batches
 
 class TimeSeriesTrainer:
+    # Les frameworks (statsmodels, Prophet, TensorFlow, scikit-learn) sont
+    # importés via app.services.backends au premier entraînement.
     def __init__(self):
-        self.scaler = MinMaxScaler()
+        self._scaler = None
+        self.last_search = None
+        self._batch_executor = None
+
+    @property
+    def scaler(self):
+        if self._scaler is None:
+            self._scaler = get_backend("sklearn").MinMaxScaler()
+        return self._scaler
+
+    @scaler.setter
+    def scaler(self, value):
+        self._scaler = value
         
-    def prepare_data(self, data, sequence_length):
-        """Prépare les données pour l'entraînement LSTM"""
-        scaled_data = self.scaler.fit_transform(data.reshape(-1, 1))
-        X, y = [], []
-        for i in range(len(scaled_data) - sequence_length):
-            X.append(scaled_data[i:(i + sequence_length)])
-            y.append(scaled_data[i + sequence_length])
-        return np.array(X), np.array(y)
+    def prepare_data(self, data, sequence_length, horizon=1, stride=1,
+                     target_columns=None, copy=False):
+        """Prépare les données pour l'entraînement LSTM
+
+        Les fenêtres sont des vues sur les données normalisées (aucune copie)
+        sauf si `copy=True`. Les données multivariées sont de forme
+        (n_pas, n_variables).
+        """
+        data = np.asarray(data)
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        scaled_data = self.scaler.fit_transform(data)
+        return make_windows(
+            scaled_data,
+            sequence_length,
+            horizon=horizon,
+            stride=stride,
+            target_columns=target_columns,
+            copy=copy
+        )
     
     def train_arima(self, data, order=(1,1,1)):
         """Entraîne un modèle ARIMA"""
-        model = ARIMA(data, order=order)
+        model = get_model_backend('arima').ARIMA(data, order=order)
         results = model.fit()
         return results
     
     def train_sarima(self, data, order=(1,1,1), seasonal_order=(1,1,1,12)):
         """Entraîne un modèle SARIMA"""
-        model = SARIMAX(data, order=order, seasonal_order=seasonal_order)
+        model = get_model_backend('sarima').SARIMAX(data, order=order, seasonal_order=seasonal_order)
         results = model.fit()
         return results
     
     def train_prophet(self, data, seasonality_mode='additive'):
         """Entraîne un modèle Prophet"""
+        import pandas as pd
+        Prophet = get_model_backend('prophet').Prophet
         df = pd.DataFrame({
             'ds': data.index,
             'y': data.values
@@ -44,22 +73,168 @@ class TimeSeriesTrainer:
         model.fit(df)
         return model
     
-    def train_lstm(self, data, sequence_length=10, epochs=50):
-        """Entraîne un modèle LSTM"""
-        X, y = self.prepare_data(data, sequence_length)
+    def train_lstm(self, data, sequence_length=10, epochs=50, horizon=1, stride=1,
+                   target_columns=None, batch_size=32, progress=None):
+        """Entraîne un modèle LSTM
+
+        `progress(fraction)` est appelé à la fin de chaque époque.
+        """
+        X, y = self.prepare_data(
+            data, sequence_length, horizon=horizon, stride=stride,
+            target_columns=target_columns
+        )
         
-        model = Sequential([
-            LSTM(50, activation='relu', input_shape=(sequence_length, 1), return_sequences=True),
-            Dropout(0.2),
-            LSTM(50, activation='relu'),
-            Dropout(0.2),
-            Dense(1)
+        keras = get_model_backend('lstm')
+        model = keras.Sequential([
+            keras.LSTM(50, activation='relu', input_shape=(sequence_length, X.shape[2]), return_sequences=True),
+            keras.Dropout(0.2),
+            keras.LSTM(50, activation='relu'),
+            keras.Dropout(0.2),
+            keras.Dense(y.shape[1])
         ])
         
+        callbacks = []
+        if progress is not None:
+            callbacks.append(keras.LambdaCallback(
+                on_epoch_end=lambda epoch, logs: progress((epoch + 1) / epochs)
+            ))
+        
         model.compile(optimizer='adam', loss='mse')
-        model.fit(X, y, epochs=epochs, batch_size=32, verbose=0)
+        # Les lots sont matérialisés un par un depuis la vue des fenêtres
+        model.fit(
+            iter_window_batches(X, y, batch_size),
+            steps_per_epoch=int(np.ceil(len(X) / batch_size)),
+            epochs=epochs,
+            callbacks=callbacks,
+            verbose=0
+        )
         return model
     
+    def resolve_data(self, parameters, model_type=None):
+        """Retourne la série d'entraînement : `data` en ligne, ou `dataset_id`
+        (colonne cible d'un jeu de données ingéré, en mémoire mappée)"""
+        dataset_id = parameters.get("dataset_id")
+        if dataset_id is None:
+            return parameters.get("data")
+        
+        manifest = dataset_store.manifest(dataset_id)
+        column = parameters.get("target_column") or manifest["target_column"]
+        date_column = manifest["date_column"]
+        columns = [column] + ([date_column] if date_column else [])
+        arrays = dataset_store.load(dataset_id, columns)
+        if model_type == "prophet":
+            import pandas as pd
+            if not date_column:
+                raise ValueError("Prophet nécessite une colonne de dates")
+            return pd.Series(arrays[column], index=pd.DatetimeIndex(arrays[date_column]))
+        return arrays[column]
+    
+    def search_orders(self, data, grid, criterion='aic', holdout=0, n_jobs=None):
+        """Recherche les meilleurs ordres ARIMA/SARIMA sur une grille de candidats
+
+        `grid` contient les listes de valeurs p, d, q et, pour SARIMA, P, D, Q
+        et la période s. Les ajustements sont répartis sur `n_jobs` processus
+        et mis en cache par empreinte des données et ordre.
+        """
+        candidates = candidate_orders(
+            grid.get("p", (0, 1, 2)), grid.get("d", (0, 1)), grid.get("q", (0, 1, 2)),
+            grid.get("P", (0,)), grid.get("D", (0,)), grid.get("Q", (0,)),
+            grid.get("s", 0)
+        )
+        ranking = search_orders(
+            data, candidates, criterion=criterion, holdout=holdout, n_jobs=n_jobs
+        )
+        self.last_search = [
+            dict(r, score=r["score"] if np.isfinite(r["score"]) else None)
+            for r in ranking
+        ]
+        best = next((r for r in ranking if r["status"] == "ok"), None)
+        if best is None:
+            raise ValueError("Aucun candidat n'a convergé")
+        return best["order"], best["seasonal_order"]
+    
+    def train(self, model_type, parameters, progress=None):
+        """Entraîne un modèle selon son type à partir des paramètres de la requête
+
+        Pour ARIMA/SARIMA, `parameters["search"]` déclenche une recherche des
+        ordres sur une grille avant l'ajustement final.
+        """
+        data = self.resolve_data(parameters, model_type)
+        search = parameters.get("search")
+        if search and model_type in ("arima", "sarima"):
+            if model_type == "arima":
+                search = {k: v for k, v in search.items() if k not in ("P", "D", "Q", "s")}
+            order, seasonal_order = self.search_orders(
+                data,
+                search,
+                criterion=search.get("criterion", "aic"),
+                holdout=search.get("holdout", 0),
+                n_jobs=search.get("n_jobs")
+            )
+            parameters = dict(parameters, order=order, seasonal_order=seasonal_order)
+            if progress is not None:
+                progress(0.5)
+
+        if model_type == "arima":
+            return self.train_arima(
+                data=data,
+                order=tuple(parameters.get("order", (1,1,1)))
+            )
+        elif model_type == "sarima":
+            return self.train_sarima(
+                data=data,
+                order=tuple(parameters.get("order", (1,1,1))),
+                seasonal_order=tuple(parameters.get("seasonal_order", (1,1,1,12)))
+            )
+        elif model_type == "prophet":
+            return self.train_prophet(
+                data=data,
+                seasonality_mode=parameters.get("seasonality_mode", "additive")
+            )
+        elif model_type == "lstm":
+            return self.train_lstm(
+                data=data,
+                sequence_length=parameters.get("sequence_length", 10),
+                epochs=parameters.get("epochs", 50),
+                progress=progress
+            )
+        raise ValueError(f"Unsupported model type: {model_type}")
+    
+    def train_batch(self, frame, model_type='arima', parameters=None, horizon=12,
+                    holdout=0, max_workers=None, chunk_size=16):
+        """Entraîne et prévoit chaque série d'une table longue (series_id, ds, y)
+
+        Les séries sont réparties par lots sur un pool de processus réutilisé
+        entre les appels (MAX_WORKERS processus) ; `max_workers` borne le
+        nombre de lots traités en parallèle pour cet appel. Les résultats sont
+        produits dès qu'un lot se termine, suivis d'un résumé {"summary": {...}}
+        (séries par seconde). Avec `max_workers=1`, tout s'exécute dans le
+        processus courant.
+        """
+        max_workers = max_workers or settings.MAX_WORKERS
+        if max_workers > settings.MAX_WORKERS:
+            raise ValueError(
+                f"max_workers ({max_workers}) dépasse MAX_WORKERS ({settings.MAX_WORKERS})"
+            )
+        executor = None
+        if max_workers > 1:
+            if self._batch_executor is None:
+                self._batch_executor = ProcessPoolExecutor(
+                    max_workers=settings.MAX_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            executor = self._batch_executor
+        return run_batch(
+            frame, model_type, parameters, horizon=horizon, holdout=holdout,
+            executor=executor, chunk_size=chunk_size, max_in_flight=max_workers
+        )
+    
+    def shutdown(self):
+        """Arrête le pool de prévision par lots"""
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=False, cancel_futures=True)
+            self._batch_executor = None
+    
     def evaluate_model(self, model, test_data, model_type):
         """Évalue les performances du modèle"""
         if model_type == 'arima' or model_type == 'sarima':
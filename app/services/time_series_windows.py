@@ -0,0 +1,68 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def make_windows(
+    data: np.ndarray,
+    sequence_length: int,
+    horizon: int = 1,
+    stride: int = 1,
+    target_columns: Optional[Sequence[int]] = None,
+    copy: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Découpe une série en fenêtres glissantes (X, y).
+
+    `data` est de forme (n_pas,) ou (n_pas, n_variables). Retourne X de forme
+    (n_fenetres, sequence_length, n_variables) et y de forme
+    (n_fenetres, horizon * n_cibles). Par défaut X est une vue à pas
+    (aucune copie) en lecture seule ; `copy=True` matérialise un tableau
+    contigu.
+    """
+    if sequence_length < 1 or horizon < 1 or stride < 1:
+        raise ValueError("sequence_length, horizon et stride doivent être >= 1")
+
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+    elif data.ndim != 2:
+        raise ValueError("Les données doivent être de dimension 1 ou 2")
+
+    n_steps = data.shape[0]
+    if n_steps < sequence_length + horizon:
+        raise ValueError(
+            f"Série trop courte ({n_steps} pas) pour sequence_length={sequence_length} "
+            f"et horizon={horizon}"
+        )
+
+    targets = data if target_columns is None else data[:, list(target_columns)]
+
+    # (n, n_variables, sequence_length) -> (n, sequence_length, n_variables)
+    X = sliding_window_view(data[:n_steps - horizon], sequence_length, axis=0)
+    X = X.transpose(0, 2, 1)[::stride]
+
+    # (n, n_cibles, horizon) -> (n, horizon, n_cibles)
+    y = sliding_window_view(targets[sequence_length:], horizon, axis=0)
+    y = y.transpose(0, 2, 1)[::stride]
+    y = y.reshape(y.shape[0], -1)
+
+    if copy:
+        return np.ascontiguousarray(X), np.ascontiguousarray(y)
+    return X, y
+
+
+def iter_window_batches(X: np.ndarray, y: np.ndarray, batch_size: int,
+                        shuffle: bool = True, seed: Optional[int] = None):
+    """Génère indéfiniment des lots (X, y) contigus à partir de vues de fenêtres.
+
+    Seul le lot courant est matérialisé, ce qui garde la mémoire constante
+    quelle que soit la longueur de la série.
+    """
+    rng = np.random.default_rng(seed)
+    starts = np.arange(0, len(X), batch_size)
+    while True:
+        if shuffle:
+            rng.shuffle(starts)
+        for start in starts:
+            stop = start + batch_size
+            yield np.ascontiguousarray(X[start:stop]), np.ascontiguousarray(y[start:stop])
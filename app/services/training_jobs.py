@@ -0,0 +1,286 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+from sqlalchemy import inspect
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.time_series_models import TimeSeriesModel
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Levée dans le worker lorsqu'une annulation a été demandée."""
+
+
+class QueueFullError(Exception):
+    """Levée lorsque trop de tâches sont déjà en attente."""
+
+
+def _persist(model_id: int, **fields) -> None:
+    """Met à jour la ligne TimeSeriesModel associée à la tâche."""
+    db = SessionLocal()
+    try:
+        db.query(TimeSeriesModel).filter(TimeSeriesModel.id == model_id).update(fields)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _run_job(job_id: str, model_id: int, config: Dict[str, Any], state, cancel_flags) -> Dict[str, Any]:
+    """Point d'entrée exécuté dans un processus du pool."""
+    # Import local : les workers sont lancés en "spawn"
+    from app.services.time_series_training import TimeSeriesTrainer
+
+    def report(progress: float, stage: str) -> None:
+        if cancel_flags.get(job_id):
+            raise JobCancelled()
+        job = state[job_id]
+        job.update(progress=round(progress, 4), stage=stage)
+        state[job_id] = job
+
+    job = state[job_id]
+    if cancel_flags.get(job_id):
+        # Annulée dans la file d'appel du pool, où future.cancel() échoue
+        job.update(status=CANCELLED, finished_at=time.time())
+        state[job_id] = job
+        _persist(model_id, status=CANCELLED)
+        return job
+    job.update(status=RUNNING, started_at=time.time())
+    state[job_id] = job
+    _persist(model_id, status=RUNNING)
+
+    model_type = config["type"]
+    parameters = config.get("parameters", {})
+    try:
+        trainer = TimeSeriesTrainer()
+        report(0.05, "training")
+        model = trainer.train(
+            model_type,
+            parameters,
+            progress=lambda fraction: report(0.05 + 0.8 * fraction, "training")
+        )
+
+        metrics = {}
+        if parameters.get("test_data") is not None:
+            report(0.85, "evaluating")
+            metrics = trainer.evaluate_model(
+                model=model,
+                test_data=parameters.get("test_data"),
+                model_type=model_type
+            )
+            metrics = {name: float(value) for name, value in metrics.items()}
+
+        report(0.95, "saving")
+        fields = {"status": COMPLETED, "metrics": metrics}
+        if trainer.last_search:
+            best = trainer.last_search[0]
+            fields["parameters"] = dict(
+                {k: v for k, v in parameters.items() if k not in ("data", "test_data")},
+                order=list(best["order"]),
+                seasonal_order=list(best["seasonal_order"])
+            )
+        _persist(model_id, **fields)
+        job = state[job_id]
+        job.update(status=COMPLETED, progress=1.0, stage="done", metrics=metrics,
+                   search=trainer.last_search[:10] if trainer.last_search else None,
+                   finished_at=time.time())
+    except JobCancelled:
+        _persist(model_id, status=CANCELLED)
+        job = state[job_id]
+        job.update(status=CANCELLED, finished_at=time.time())
+    except Exception as e:
+        _persist(model_id, status=FAILED, error=str(e))
+        job = state[job_id]
+        job.update(status=FAILED, error=str(e), finished_at=time.time())
+    state[job_id] = job
+    return job
+
+
+class TrainingJobManager:
+    """Exécute les entraînements dans un pool de processus borné.
+
+    Le pool et le gestionnaire d'état partagé ne sont créés qu'à la première
+    soumission, pour ne pas alourdir le démarrage des workers de l'API.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 max_queued: Optional[int] = None):
+        self.max_workers = max_workers or settings.MAX_WORKERS
+        self.max_queued = max_queued or settings.MAX_QUEUED_JOBS
+        self._executor = None
+        self._manager = None
+        self._state = None
+        self._cancel_flags = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._manager = context.Manager()
+            self._state = self._manager.dict()
+            self._cancel_flags = self._manager.dict()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context
+            )
+
+    def _pending_count(self) -> int:
+        return sum(1 for future in self._futures.values() if not future.done())
+
+    def submit(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Enregistre la tâche en base et la place dans la file du pool."""
+        with self._lock:
+            self._ensure_started()
+            if self._pending_count() >= self.max_queued:
+                raise QueueFullError(
+                    f"Trop de tâches en attente ({self.max_queued})"
+                )
+
+            job_id = str(uuid.uuid4())
+            model_type = config.get("type")
+            parameters = config.get("parameters", {})
+            db = SessionLocal()
+            try:
+                db_model = TimeSeriesModel(
+                    name=f"{model_type}_model",
+                    type=model_type,
+                    parameters={k: v for k, v in parameters.items()
+                                if k not in ("data", "test_data")},
+                    forecast_horizon=config.get("forecast_horizon", 12),
+                    validation_split=config.get("validation_split", 0.2),
+                    job_id=job_id,
+                    status=QUEUED
+                )
+                db.add(db_model)
+                db.commit()
+                db.refresh(db_model)
+                model_id = db_model.id
+            finally:
+                db.close()
+
+            self._state[job_id] = {
+                "job_id": job_id,
+                "model_id": model_id,
+                "type": model_type,
+                "status": QUEUED,
+                "stage": "queued",
+                "progress": 0.0,
+                "metrics": None,
+                "error": None,
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+            }
+            future = self._executor.submit(
+                _run_job, job_id, model_id, config, self._state, self._cancel_flags
+            )
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+            self._futures[job_id] = future
+            return dict(self._state[job_id])
+
+    def _on_done(self, job_id: str, future) -> None:
+        """Enregistre l'échec d'un worker mort (BrokenProcessPool, etc.)."""
+        if future.cancelled() or self._state is None:
+            # Pool arrêté par shutdown() : l'état partagé n'existe plus
+            return
+        error = future.exception()
+        if error is not None:
+            job = self._state[job_id]
+            job.update(status=FAILED, error=str(error), finished_at=time.time())
+            self._state[job_id] = job
+            _persist(job["model_id"], status=FAILED, error=str(error))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne l'état d'une tâche, depuis la mémoire ou la base."""
+        if self._state is not None and job_id in self._state:
+            return dict(self._state[job_id])
+
+        db = SessionLocal()
+        try:
+            db_model = db.query(TimeSeriesModel).filter(
+                TimeSeriesModel.job_id == job_id
+            ).first()
+            if db_model is None:
+                return None
+            return {
+                "job_id": job_id,
+                "model_id": db_model.id,
+                "type": db_model.type,
+                "status": db_model.status,
+                "progress": 1.0 if db_model.status == COMPLETED else None,
+                "metrics": db_model.metrics,
+                "error": db_model.error,
+            }
+        finally:
+            db.close()
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Annule une tâche en attente, ou demande l'arrêt d'une tâche en cours."""
+        with self._lock:
+            job = self.get(job_id)
+            if job is None or job["status"] in FINISHED_STATUSES:
+                return job
+            if self._state is None or job_id not in self._state:
+                # Connue seulement en base (soumise avant un redémarrage) :
+                # aucun worker de ce processus ne l'exécute
+                _persist(job["model_id"], status=CANCELLED)
+                return dict(job, status=CANCELLED)
+
+            self._cancel_flags[job_id] = True
+            future = self._futures.get(job_id)
+            if future is not None and future.cancel():
+                job = self._state[job_id]
+                job.update(status=CANCELLED, finished_at=time.time())
+                self._state[job_id] = job
+                _persist(job["model_id"], status=CANCELLED)
+            return dict(self._state[job_id])
+
+    def reconcile(self) -> int:
+        """Marque en échec les tâches restées en attente ou en cours en base.
+
+        Le pool est propre au processus : une tâche non terminée lors d'un
+        arrêt ne reprendra jamais. À appeler au démarrage ; les tâches
+        soumises par ce processus sont épargnées. Retourne le nombre de
+        lignes corrigées.
+        """
+        db = SessionLocal()
+        try:
+            if not inspect(db.get_bind()).has_table(TimeSeriesModel.__tablename__):
+                return 0
+            query = db.query(TimeSeriesModel).filter(
+                TimeSeriesModel.status.in_((QUEUED, RUNNING))
+            )
+            with self._lock:
+                if self._state is not None and len(self._state):
+                    query = query.filter(TimeSeriesModel.job_id.notin_(list(self._state.keys())))
+                count = query.update(
+                    {"status": FAILED, "error": "Tâche interrompue par un arrêt du serveur"},
+                    synchronize_session=False
+                )
+                db.commit()
+            return count
+        finally:
+            db.close()
+
+    def shutdown(self) -> None:
+        """Arrête le pool sans attendre les tâches en cours."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._manager.shutdown()
+                self._executor = None
+                self._manager = None
+                self._state = None
+                self._cancel_flags = None
+
+
+job_manager = TrainingJobManager()
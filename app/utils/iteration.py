@@ -0,0 +1,13 @@
+from typing import Any, Iterable, Iterator, List
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Regroupe les éléments par lots de `size` (le dernier peut être plus court)."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,136 @@
+"""Latence d'une route authentifiée : décodage JWT + requête utilisateur à
+chaque appel, ou jeton et utilisateur en cache (app.core.auth_cache).
+
+La route ne fait rien d'autre que retourner l'utilisateur : l'écart mesuré
+est le coût de l'authentification. Base SQLite fichier (WAL), comme en local ;
+l'aller-retour réseau vers Postgres s'y ajouterait sans cache.
+Usage : python -m benchmarks.bench_auth --requests 2000 --users 100
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import OAuth2PasswordBearer
+from fastapi.testclient import TestClient
+from jose import JWTError, jwt
+from sqlalchemy import Boolean, Column, DateTime, String, create_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.sql import func
+from app.core import auth_cache
+from app.core.auth_cache import decode_token, principal_cache, resolve_principal
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.pool import configure_engine, engine_options
+
+# Le modèle User n'est pas importable seul : table équivalente
+Base = declarative_base()
+
+
+class BenchUser(Base):
+    __tablename__ = "users"
+    id = Column(String, primary_key=True)
+    email = Column(String)
+    username = Column(String)
+    hashed_password = Column(String)
+    is_active = Column(Boolean, default=True)
+    is_superuser = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+def build_app(SessionLocal) -> FastAPI:
+    oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def user_uncached(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        except JWTError:
+            raise HTTPException(status_code=401)
+        user = db.query(BenchUser).filter(BenchUser.id == payload["sub"]).first()
+        if not user or not user.is_active:
+            raise HTTPException(status_code=401)
+        return user
+
+    def user_cached(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+        try:
+            payload = decode_token(token)
+        except JWTError:
+            raise HTTPException(status_code=401)
+        user = resolve_principal(
+            payload["sub"], lambda sub: db.query(BenchUser).filter(BenchUser.id == sub).first()
+        )
+        if not user or not user.is_active:
+            raise HTTPException(status_code=401)
+        return user
+
+    app = FastAPI()
+
+    @app.get("/sans-cache")
+    def me_uncached(user=Depends(user_uncached)):
+        return {"id": user.id}
+
+    @app.get("/cache")
+    def me_cached(user=Depends(user_cached)):
+        return {"id": user.id}
+
+    return app
+
+
+def measure(client: TestClient, path: str, tokens, n: int):
+    latencies = []
+    for _ in range(n):
+        headers = {"Authorization": f"Bearer {random.choice(tokens)}"}
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(0.95 * len(latencies))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'auth.db')}"
+        engine = configure_engine(create_engine(url, **engine_options(url)))
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(bind=engine)
+        with SessionLocal() as db:
+            db.add_all([BenchUser(id=f"user-{i}", email=f"u{i}@example.com",
+                                  username=f"user{i}", hashed_password="x")
+                        for i in range(args.users)])
+            db.commit()
+        tokens = [create_access_token(f"user-{i}") for i in range(args.users)]
+
+        client = TestClient(build_app(SessionLocal))
+        principal_cache.clear()
+        auth_cache._decode_token.cache_clear()
+        # Échauffement : remplit les caches et le pool de connexions
+        measure(client, "/sans-cache", tokens, 200)
+        measure(client, "/cache", tokens, 200)
+
+        print(f"{args.requests} requêtes, {args.users} utilisateurs")
+        print(f"{'authentification':<20}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+        for label, path in (("sans cache", "/sans-cache"), ("cache", "/cache")):
+            p50, p95 = measure(client, path, tokens, args.requests)
+            print(f"{label:<20}{p50:>10.3f}{p95:>10.3f}")
+        print(f"cache utilisateurs : {principal_cache.stats()}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Requêtes de DeepLearningService sur une table volumineuse, avec et sans index.
+
+Usage : python -m benchmarks.bench_dl_queries --rows 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from sqlalchemy import create_engine, select, text
+from app.db.migrations import ensure_indexes
+from app.models.deep_learning import DeepLearningModel
+from app.services.deep_learning_queries import build_model_query
+
+TYPES = ["cnn", "rnn", "transformer", "mlp", "gan"]
+STATUSES = ["draft", "training", "ready", "archived"]
+
+
+def seed(engine, rows, batch=50_000):
+    table = DeepLearningModel.__table__
+    table.create(engine)
+    for index in table.indexes:
+        index.drop(engine)
+    rng = np.random.default_rng(0)
+    with engine.begin() as conn:
+        for start in range(0, rows, batch):
+            n = min(batch, rows - start)
+            types = rng.choice(TYPES, n)
+            statuses = rng.choice(STATUSES, n, p=[0.4, 0.1, 0.45, 0.05])
+            accuracy = rng.random(n)
+            conn.execute(table.insert(), [
+                {"name": f"model-{start + i}", "model_type": str(types[i]),
+                 "status": str(statuses[i]), "accuracy": float(accuracy[i]), "architecture": {}}
+                for i in range(n)
+            ])
+
+
+def timed(engine, query, repeat):
+    best = float("inf")
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            count = len(conn.execute(query).all())
+            best = min(best, time.perf_counter() - start)
+    return best * 1000, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table = DeepLearningModel.__table__
+    with tempfile.TemporaryDirectory() as folder:
+        engine = create_engine(f"sqlite:///{os.path.join(folder, 'bench.db')}")
+        seed(engine, args.rows)
+        with engine.connect() as conn:
+            deep_id = conn.execute(text(
+                "SELECT id FROM deep_learning_models WHERE model_type = 'cnn' AND status = 'ready' "
+                "AND accuracy >= 0.9 ORDER BY id LIMIT 1 OFFSET 500"
+            )).scalar()
+
+        filters = {"model_type": "cnn", "status": "ready", "min_accuracy": 0.9}
+        cases = [
+            ("get_by_type (historique, .all())",
+             select(table).where(table.c.model_type == "cnn")),
+            ("get_by_status (historique, .all())",
+             select(table).where(table.c.status == "ready")),
+            ("3 filtres, page 1 (limit 100)",
+             build_model_query(**filters, limit=100, entity=table)),
+            ("3 filtres, skip=500",
+             build_model_query(**filters, skip=500, limit=100, entity=table)),
+            ("3 filtres, curseur après 500",
+             build_model_query(**filters, after_id=deep_id, limit=100, entity=table)),
+            ("statut + précision, page 1",
+             build_model_query(status="archived", min_accuracy=0.99, limit=100, entity=table)),
+        ]
+
+        print(f"{args.rows} modèles")
+        print(f"{'requête':<38}{'lignes':>8}{'sans index (ms)':>18}{'avec index (ms)':>18}")
+        results = [timed(engine, query, args.repeat) for _, query in cases]
+        ensure_indexes(engine, [table])
+        indexed = [timed(engine, query, args.repeat) for _, query in cases]
+        for (name, _), (before, count), (after, _) in zip(cases, results, indexed):
+            print(f"{name:<38}{count:>8}{before:>18.2f}{after:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
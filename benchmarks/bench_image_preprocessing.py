@@ -0,0 +1,111 @@
+"""Compare le prétraitement d'images : boucle image par image vs lot préalloué.
+
+Usage : python -m benchmarks.bench_image_preprocessing --images 256 --size 640x480
+        python -m benchmarks.bench_image_preprocessing --images 2000 --stream
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+import cv2
+import numpy as np
+from app.preprocessing.image.image_preprocessor import ImagePreprocessor
+
+
+def legacy_transform(preprocessor, data):
+    """Implémentation historique d'ImagePreprocessor.transform."""
+    processed_images = []
+    for image in data:
+        if len(image.shape) == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+        elif image.shape[2] == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_RGBA2RGB)
+        image = cv2.resize(image, preprocessor.target_size).astype(np.float32) / 255.0
+        for i in range(3):
+            image[:, :, i] = (image[:, :, i] - preprocessor.mean[i]) / preprocessor.std[i]
+        processed_images.append(image)
+    return np.array(processed_images)
+
+
+def bench_stream(preprocessor, images, batch_size):
+    """Pic mémoire : tout charger puis transformer vs flux depuis le disque."""
+    with tempfile.TemporaryDirectory() as folder:
+        for i, image in enumerate(images):
+            cv2.imwrite(f"{folder}/{i:06d}.png", image)
+        print(f"{len(images)} images PNG sur disque, lots de {batch_size}")
+        print(f"{'méthode':<34}{'images/s':>12}{'pic (Mo)':>12}")
+
+        def load_all():
+            paths = sorted(Path(folder).glob("*.png"))
+            return preprocessor.transform([cv2.cvtColor(cv2.imread(str(p)), cv2.COLOR_BGR2RGB)
+                                           for p in paths])
+
+        def stream():
+            for batch in preprocessor.iter_transform(folder, batch_size=batch_size):
+                pass
+
+        for name, func in [("liste complète", load_all), ("flux + prefetch", stream)]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            count = len(list(Path(folder).glob("*.png")))
+            print(f"{name:<34}{count / elapsed:>12.1f}{peak / 1024 ** 2:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=256)
+    parser.add_argument("--size", default="640x480", help="largeur x hauteur des images sources")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--encoded", action="store_true",
+                        help="fournir des octets PNG (inclut le décodage)")
+    parser.add_argument("--stream", action="store_true",
+                        help="comparer le pic mémoire avec le flux depuis un dossier")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    width, height = map(int, args.size.split("x"))
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(args.images)]
+    preprocessor = ImagePreprocessor().fit(images)
+    workers = args.workers or preprocessor.num_workers
+    if args.stream:
+        bench_stream(preprocessor, images, args.batch_size)
+        return
+
+    if args.encoded:
+        sources = [cv2.imencode(".png", image)[1].tobytes() for image in images]
+        cases = [
+            ("boucle (historique)",
+             lambda: legacy_transform(preprocessor, [
+                 cv2.cvtColor(cv2.imdecode(np.frombuffer(s, np.uint8), cv2.IMREAD_COLOR),
+                              cv2.COLOR_BGR2RGB) for s in sources])),
+        ]
+    else:
+        sources = images
+        cases = [("boucle (historique)", lambda: legacy_transform(preprocessor, sources))]
+    cases.append(("lot, 1 thread", lambda: preprocessor.transform_batch(sources, num_workers=1)))
+    if workers > 1:
+        cases.append((f"lot, {workers} threads",
+                      lambda: preprocessor.transform_batch(sources, num_workers=workers)))
+    cases += [
+        (f"lot float16 NCHW, {workers} threads",
+         lambda: preprocessor.transform_batch(sources, layout="NCHW", dtype=np.float16,
+                                              num_workers=workers)),
+    ]
+
+    print(f"{args.images} images {args.size} -> {preprocessor.target_size}")
+    print(f"{'méthode':<34}{'temps (s)':>12}{'images/s':>12}")
+    for name, func in cases:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<34}{elapsed:>12.4f}{args.images / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Latence d'une route de prédiction pendant une rafale de connexions.
+
+Un uvicorn (processus séparé) sert :
+  /predict        route synchrone légère (pool de threads de Starlette)
+  /login-direct   bcrypt appelé dans la route synchrone (ancienne forme)
+  /login-pool     bcrypt dans app.core.hashing (pool borné, 429 au-delà)
+
+Pour chaque forme de login, `--storm` clients enchaînent les connexions
+pendant qu'un client sonde /predict ; on compare la latence de /predict
+à celle mesurée sans rafale.
+Usage : python -m benchmarks.bench_login_storm --storm 100 --duration 10 --rounds 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import time
+import numpy as np
+
+PASSWORD = "correct horse battery"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(port: int, rounds: int) -> None:
+    os.environ["BCRYPT_ROUNDS"] = str(rounds)
+    import uvicorn
+    from fastapi import FastAPI, HTTPException
+    from app.core.hashing import HashingOverloadedError, hashing_pool, verify_password_async
+    from app.core.security import get_password_hash, verify_password
+
+    hashed = get_password_hash(PASSWORD)
+    weights = np.random.default_rng(0).normal(size=(64, 8))
+    app = FastAPI()
+
+    @app.get("/predict")
+    def predict():
+        rows = np.random.default_rng().normal(size=(32, 64))
+        return {"predictions": (rows @ weights).argmax(axis=1).tolist()}
+
+    @app.post("/login-direct")
+    def login_direct():
+        if not verify_password(PASSWORD, hashed):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.post("/login-pool")
+    async def login_pool():
+        try:
+            valid = await verify_password_async(PASSWORD, hashed)
+        except HashingOverloadedError as e:
+            raise HTTPException(status_code=429, headers={"Retry-After": str(e.retry_after)})
+        if not valid:
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/hashing")
+    def hashing_stats():
+        return hashing_pool.stats()
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def _wait_ready(client, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get("/predict")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Le serveur n'a pas démarré")
+
+
+async def run(base_url: str, login_path, storm: int, duration: float) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=storm + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        await _wait_ready(client)
+        stop = time.perf_counter() + duration
+        counts = {"ok": 0, "429": 0}
+        probe = []
+
+        async def login_client():
+            while time.perf_counter() < stop:
+                response = await client.post(login_path)
+                if response.status_code == 429:
+                    counts["429"] += 1
+                    # Le client respecte Retry-After (borné à la durée du test)
+                    await asyncio.sleep(min(float(response.headers["Retry-After"]), 1.0))
+                else:
+                    counts["ok"] += 1
+
+        async def probe_client():
+            while time.perf_counter() < stop:
+                start = time.perf_counter()
+                await client.get("/predict")
+                probe.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        storm_clients = [login_client() for _ in range(storm)] if login_path else []
+        await asyncio.gather(probe_client(), *storm_clients)
+
+    ms = np.asarray(probe)
+    return {
+        "p50": float(np.percentile(ms, 50)),
+        "p95": float(np.percentile(ms, 95)),
+        "p99": float(np.percentile(ms, 99)),
+        "logins_per_s": counts["ok"] / duration,
+        "rejected": counts["429"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--storm", type=int, default=100, help="clients de connexion simultanés")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rounds", type=int, default=10, help="BCRYPT_ROUNDS du serveur")
+    args = parser.parse_args()
+
+    print(f"rafale de {args.storm} clients, bcrypt {args.rounds} tours, {args.duration:.0f} s")
+    print(f"{'login':<16}{'predict p50':>12}{'p95':>9}{'p99':>9}{'logins/s':>10}{'429':>7}")
+    for label, login_path in (("sans rafale", None), ("direct", "/login-direct"),
+                              ("pool borné", "/login-pool")):
+        port = _free_port()
+        server = multiprocessing.get_context("spawn").Process(
+            target=serve, args=(port, args.rounds), daemon=True
+        )
+        server.start()
+        try:
+            r = asyncio.run(run(f"http://127.0.0.1:{port}", login_path, args.storm, args.duration))
+        finally:
+            server.kill()
+            server.join()
+        print(f"{label:<16}{r['p50']:>12.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}"
+              f"{r['logins_per_s']:>10.1f}{r['rejected']:>7}")
+
+
+if __name__ == "__main__":
+    main()
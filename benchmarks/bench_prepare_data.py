@@ -0,0 +1,53 @@
+"""Compare la construction des fenêtres LSTM : boucle Python vs vue à pas.
+
+Usage : python -m benchmarks.bench_prepare_data --points 1000000 --sequence-length 50
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from app.services.time_series_windows import make_windows
+
+
+def legacy_windows(scaled_data, sequence_length):
+    """Implémentation historique de TimeSeriesTrainer.prepare_data."""
+    X, y = [], []
+    for i in range(len(scaled_data) - sequence_length):
+        X.append(scaled_data[i:(i + sequence_length)])
+        y.append(scaled_data[i + sequence_length])
+    return np.array(X), np.array(y)
+
+
+def measure(func, *args, **kwargs):
+    """Retourne (durée en secondes, pic mémoire en Mo)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--sequence-length", type=int, default=50)
+    args = parser.parse_args()
+
+    scaled = np.random.default_rng(0).random((args.points, 1))
+    cases = [
+        ("boucle (historique)", legacy_windows, {}),
+        ("vue à pas", make_windows, {}),
+        ("vue à pas + copie", make_windows, {"copy": True}),
+    ]
+
+    print(f"{args.points} points, sequence_length={args.sequence_length}")
+    print(f"{'méthode':<24}{'temps (s)':>12}{'pic (Mo)':>12}")
+    for name, func, kwargs in cases:
+        elapsed, peak = measure(func, scaled, args.sequence_length, **kwargs)
+        print(f"{name:<24}{elapsed:>12.4f}{peak:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare le chargement des préprocesseurs : pickle complet vs dossier d'état.
+
+Usage : python -m benchmarks.bench_preprocessor_load --vocabulary 500000 --repeat 5
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+import numpy as np
+from app.preprocessing.image.image_preprocessor import ImagePreprocessor
+from app.preprocessing.text.vectorizer import TextVectorizer
+
+
+def size_of(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f))
+               for root, _, files in os.walk(path) for f in files)
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vocabulary", type=int, default=500_000)
+    parser.add_argument("--n-features", type=int, default=2 ** 22)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vocabulary = TextVectorizer({"mode": "vocabulary"})
+    vocabulary.vocabulary = {f"token{i}": i for i in range(args.vocabulary)}
+    vocabulary.document_frequency = rng.integers(1, 1000, args.vocabulary)
+    vocabulary.n_documents, vocabulary.is_fitted = 1000, True
+    hashing = TextVectorizer({"mode": "hashing", "n_features": args.n_features})
+    hashing.document_frequency = rng.integers(0, 1000, args.n_features)
+    hashing.n_documents, hashing.is_fitted = 1000, True
+    cases = [
+        ("ImagePreprocessor", ImagePreprocessor().fit([])),
+        (f"TextVectorizer vocab={args.vocabulary}", vocabulary),
+        (f"TextVectorizer hashing={args.n_features}", hashing),
+    ]
+
+    print(f"{'préprocesseur':<36}{'format':<10}{'taille (Mo)':>12}{'chargement (ms)':>18}")
+    with tempfile.TemporaryDirectory() as folder:
+        for name, preprocessor in cases:
+            cls = type(preprocessor)
+            pickle_path = os.path.join(folder, f"{cls.__name__}-{id(preprocessor)}.pkl")
+            with open(pickle_path, "wb") as f:
+                pickle.dump(preprocessor, f)
+            state_path = os.path.join(folder, f"{cls.__name__}-{id(preprocessor)}")
+            preprocessor.save(state_path)
+
+            for fmt, path, load in [
+                ("pickle", pickle_path, lambda p=pickle_path: cls.load(p, allow_pickle=True)),
+                ("état", state_path, lambda p=state_path: cls.load(p)),
+                ("état RAM", state_path, lambda p=state_path: cls.load(p, mmap=False)),
+            ]:
+                elapsed = best_of(load, args.repeat)
+                print(f"{name:<36}{fmt:<10}{size_of(path) / 1024 ** 2:>12.2f}{elapsed * 1000:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Latence de GET /models et GET /models/{id} : sans cache, réponse en cache
+(200) et revalidation conditionnelle (If-None-Match -> 304).
+
+Usage : python -m benchmarks.bench_response_cache --rows 5000 --requests 500 --limit 100
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.api.endpoints import models
+from app.core.response_cache import response_cache
+from app.db.session import async_database_url, get_async_db
+from app.models.registry import ModelRegistry
+
+
+def timed(client: TestClient, path: str, params: dict, n: int, etag: bool = False):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = client.get(path, params=params).headers["ETag"]
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = client.get(path, params=params, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == (304 if etag else 200), response.status_code
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(0.95 * len(latencies))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        ModelRegistry.__table__.create(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(ModelRegistry), [
+                {"framework": "sklearn", "name": f"model-{i}", "type": "classification",
+                 "parameters": {"n_estimators": 100, "max_depth": 10},
+                 "description": "Random forest " * 4, "accuracy": random.random()}
+                for i in range(args.rows)
+            ])
+        Session = async_sessionmaker(create_async_engine(async_database_url(url)),
+                                     expire_on_commit=False)
+
+        async def override_get_db():
+            async with Session() as db:
+                yield db
+
+        app = FastAPI()
+        app.include_router(models.router, prefix="/api/v1")
+        app.dependency_overrides[get_async_db] = override_get_db
+
+        cases = [
+            (f"GET /models (limit={args.limit})", "/api/v1/models", {"limit": args.limit}),
+            ("GET /models/{id}", "/api/v1/models/42", {}),
+        ]
+        print(f"{args.rows} modèles, {args.requests} requêtes par mesure")
+        print(f"{'route':<28}{'mode':<16}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+        with TestClient(app) as client:
+            for label, path, params in cases:
+                # ttl 0 : cache désactivé ; puis sans expiration pendant la mesure
+                response_cache.ttl_seconds = 0
+                results = [("sans cache", timed(client, path, params, args.requests))]
+                response_cache.ttl_seconds = 3600
+                response_cache.clear()
+                results.append(("cache (200)", timed(client, path, params, args.requests)))
+                results.append(("304", timed(client, path, params, args.requests, etag=True)))
+                for mode, (p50, p95) in results:
+                    print(f"{label:<28}{mode:<16}{p50:>10.3f}{p95:>10.3f}")
+        print(f"cache : {response_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Mesure le démarrage à froid de app.main:app (temps d'import et RSS).
+
+Chaque mesure est faite dans un processus Python neuf, comme un worker uvicorn.
+Usage : python -m benchmarks.bench_startup --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["tensorflow", "prophet", "statsmodels", "sklearn", "pandas", "torch"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "seconds": elapsed,
+    "rss_mb": rss_kb / 1024,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_once():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    seconds = [s["seconds"] for s in samples]
+    rss = [s["rss_mb"] for s in samples]
+
+    print(f"import app.main sur {args.runs} processus")
+    print(f"  temps médian : {statistics.median(seconds):.3f} s (max {max(seconds):.3f} s)")
+    print(f"  RSS médian   : {statistics.median(rss):.1f} Mo")
+    print(f"  frameworks chargés : {', '.join(samples[-1]['loaded']) or 'aucun'}")
+
+
+if __name__ == "__main__":
+    main()
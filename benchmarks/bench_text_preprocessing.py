@@ -0,0 +1,76 @@
+"""Compare le prétraitement de texte : boucle historique vs cache, regex et processus.
+
+Usage : python -m benchmarks.bench_text_preprocessing --docs 20000 --jobs 4
+        python -m benchmarks.bench_text_preprocessing --offline   (sans données NLTK)
+"""
+import argparse
+import re
+import time
+import numpy as np
+from app.preprocessing.text.text_preprocessor import TextPreprocessor
+
+
+def legacy_transform(preprocessor, data):
+    """Implémentation historique de TextPreprocessor.transform."""
+    processed_texts = []
+    for text in data:
+        text = text.lower()
+        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = re.sub(r'\s+', ' ', text).strip()
+        tokens = preprocessor._tokenize(text)
+        tokens = [token for token in tokens if token not in preprocessor.stop_words]
+        if preprocessor.lemmatize:
+            tokens = [preprocessor.lemmatizer.lemmatize(token) for token in tokens]
+        processed_texts.append(' '.join(tokens))
+    return processed_texts
+
+
+def make_corpus(n_docs, words_per_doc, vocabulary, seed=0):
+    """Corpus synthétique à distribution de Zipf (tokens très répétés)."""
+    rng = np.random.default_rng(seed)
+    vocab = [f"word{i}s" for i in range(vocabulary)] + ["the", "and", "is", "of"]
+    ranks = np.minimum(rng.zipf(1.3, size=(n_docs, words_per_doc)), len(vocab)) - 1
+    return [' '.join(vocab[r] for r in row) + '. 42!' for row in ranks]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--words", type=int, default=80)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--chunksize", type=int, default=1000)
+    parser.add_argument("--offline", action="store_true",
+                        help="mots vides de scikit-learn, sans lemmatisation ni punkt")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docs, args.words, args.vocabulary)
+    if args.offline:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        base = {"stop_words": list(ENGLISH_STOP_WORDS), "lemmatize": False}
+        nltk_config = dict(base, tokenizer="regex")
+    else:
+        base = {}
+        nltk_config = dict(base, tokenizer="nltk")
+    nltk_pre = TextPreprocessor(nltk_config).fit([])
+    regex_pre = TextPreprocessor(dict(base, tokenizer="regex")).fit([])
+
+    cases = [
+        ("boucle (historique)", lambda: legacy_transform(nltk_pre, corpus)),
+        ("transform (cache)", lambda: nltk_pre.transform(corpus)),
+        ("transform regex", lambda: regex_pre.transform(corpus)),
+        (f"transform_batch regex, {args.jobs} proc.",
+         lambda: regex_pre.transform_batch(corpus, n_jobs=args.jobs, chunksize=args.chunksize)),
+    ]
+
+    print(f"{args.docs} documents de {args.words} mots")
+    print(f"{'méthode':<36}{'temps (s)':>12}{'docs/s':>12}")
+    for name, func in cases:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<36}{elapsed:>12.4f}{args.docs / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
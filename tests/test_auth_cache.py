@@ -0,0 +1,95 @@
+import time
+from datetime import timedelta
+import pytest
+from jose import JWTError
+from sqlalchemy import Boolean, Column, DateTime, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.sql import func
+from app.core import auth_cache
+from app.core.auth_cache import (
+    PrincipalCache, decode_token, principal_cache, resolve_principal, watch_user_model
+)
+from app.core.security import create_access_token
+
+Base = declarative_base()
+
+
+class UserRow(Base):
+    __tablename__ = "users"
+    id = Column(String, primary_key=True)
+    email = Column(String)
+    username = Column(String)
+    hashed_password = Column(String)
+    is_active = Column(Boolean, default=True)
+    is_superuser = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+watch_user_model(UserRow)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(UserRow(id="u1", email="a@b.io", username="alice", hashed_password="x"))
+    session.commit()
+    principal_cache.clear()
+    yield session
+    session.close()
+
+
+def test_decode_is_memoized_but_expiry_is_checked():
+    """Test la mémorisation du décodage et le contrôle de l'expiration"""
+    token = create_access_token("u1", expires_delta=timedelta(seconds=1))
+    before = auth_cache._decode_token.cache_info().hits
+    assert decode_token(token)["sub"] == "u1"
+    assert decode_token(token)["sub"] == "u1"
+    assert auth_cache._decode_token.cache_info().hits == before + 1
+
+    time.sleep(1.1)
+    with pytest.raises(JWTError):
+        decode_token(token)
+    with pytest.raises(JWTError):
+        decode_token(token[:-2] + "xx")
+
+
+def test_principal_cached_until_user_changes(db):
+    """Test qu'une désactivation ou un changement de droits invalide le cache"""
+    calls = []
+
+    def load(sub):
+        calls.append(sub)
+        return db.get(UserRow, sub)
+
+    assert resolve_principal("u1", load).is_active
+    assert resolve_principal("u1", load).username == "alice"
+    assert calls == ["u1"]
+
+    db.get(UserRow, "u1").is_active = False
+    db.commit()
+    assert not resolve_principal("u1", load).is_active
+
+    db.get(UserRow, "u1").is_superuser = True
+    db.commit()
+    assert resolve_principal("u1", load).is_superuser
+    assert len(calls) == 3
+
+    db.delete(db.get(UserRow, "u1"))
+    db.commit()
+    assert resolve_principal("u1", load) is None
+    assert resolve_principal("u1", load) is None
+    assert len(calls) == 5
+
+
+def test_principal_cache_bounds():
+    """Test la taille maximale et la durée de vie des entrées"""
+    cache = PrincipalCache(max_items=2, ttl_seconds=0.05)
+    for subject in ("a", "b", "c"):
+        cache.put(subject, subject)
+    assert cache.get("a") is None and cache.get("c") == "c"
+    time.sleep(0.06)
+    assert cache.get("c") is None
+    assert cache.stats()["items"] == 1
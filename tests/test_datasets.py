@@ -0,0 +1,162 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+from app.services.datasets import DatasetStore, DatasetNotFoundError
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DatasetStore(root=str(tmp_path))
+
+
+@pytest.fixture
+def csv_bytes():
+    """CSV avec une colonne de dates, une cible et une colonne ignorée"""
+    frame = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=25, freq="h"),
+        "value": np.arange(25, dtype=float) * 1.5,
+        "comment": ["x"] * 25,
+    })
+    return frame.to_csv(index=False).encode()
+
+
+def test_ingest_csv_streams_to_memory_mapped_columns(store, csv_bytes):
+    """Test l'ingestion par blocs et le chargement en mémoire mappée"""
+    manifest = store.ingest_csv(io.BytesIO(csv_bytes), "value", "date", chunksize=7)
+    assert manifest["rows"] == 25
+    assert set(manifest["columns"]) == {"date", "value"}
+
+    arrays = store.load(manifest["id"])
+    assert isinstance(arrays["value"], np.memmap)
+    assert not arrays["value"].flags.writeable
+    np.testing.assert_array_equal(arrays["value"], np.arange(25) * 1.5)
+    assert arrays["date"][1] - arrays["date"][0] == np.timedelta64(1, "h")
+
+
+def test_ingest_csv_validates_header_only(store, csv_bytes):
+    """Test le rejet d'une colonne absente sans laisser de fichiers"""
+    with pytest.raises(ValueError):
+        store.ingest_csv(io.BytesIO(csv_bytes), "missing")
+    assert list(store.root.iterdir()) == []
+
+
+def test_load_unknown_dataset(store):
+    """Test un identifiant inconnu ou invalide"""
+    with pytest.raises(DatasetNotFoundError):
+        store.load("0" * 32)
+    with pytest.raises(DatasetNotFoundError):
+        store.load("../etc")
+
+
+@pytest.fixture
+def db_session():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models.dataset import Dataset
+
+    engine = create_engine("sqlite://")
+    Dataset.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_registry_deduplicates_identical_uploads(db_session, store, csv_bytes):
+    """Test qu'un contenu identique n'est ingéré qu'une fois"""
+    from app.services.datasets import DatasetRegistry
+
+    registry = DatasetRegistry(db_session, store)
+    first, created = registry.register_csv(io.BytesIO(csv_bytes), "value", "date", name="a.csv")
+    again, created_again = registry.register_csv(io.BytesIO(csv_bytes), "value", "date", name="b.csv")
+    other, created_other = registry.register_csv(io.BytesIO(csv_bytes), "value")
+
+    assert created and not created_again and created_other
+    assert again.id == first.id
+    assert again.upload_count == 2
+    assert other.id != first.id
+    assert other.content_hash == first.content_hash
+    assert len([p for p in store.root.iterdir()]) == 2
+
+
+def test_registry_rejects_bad_header_before_hashing(db_session, store, csv_bytes):
+    """Test qu'une colonne absente est rejetée après la seule lecture de l'en-tête"""
+    from app.models.dataset import Dataset
+    from app.services.datasets import DatasetRegistry
+
+    class CountingUpload(io.BytesIO):
+        consumed = 0
+
+        def read(self, *args):
+            data = super().read(*args)
+            self.consumed += len(data)
+            return data
+
+        def readline(self, *args):
+            data = super().readline(*args)
+            self.consumed += len(data)
+            return data
+
+    upload = CountingUpload(csv_bytes * 200)
+    with pytest.raises(ValueError, match="missing"):
+        DatasetRegistry(db_session, store).register_csv(upload, "missing")
+    assert upload.consumed == len(csv_bytes.splitlines(keepends=True)[0])
+    assert db_session.query(Dataset).count() == 0
+
+
+def test_registry_reuses_memory_maps(db_session, store, csv_bytes):
+    """Test que les chargements successifs réutilisent le même memmap"""
+    from app.services.datasets import DatasetRegistry
+
+    registry = DatasetRegistry(db_session, store)
+    dataset, _ = registry.register_csv(io.BytesIO(csv_bytes), "value", "date")
+    first = registry.load(dataset.id, ["value"])["value"]
+    second = registry.load(dataset.id, ["value"])["value"]
+    assert first is second
+
+    assert registry.delete(dataset.id)
+    with pytest.raises(DatasetNotFoundError):
+        registry.load(dataset.id)
+
+
+def test_registry_concurrent_identical_uploads(tmp_path, store, csv_bytes, monkeypatch):
+    """Test qu'un envoi concurrent du même contenu retourne la ligne déjà créée"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models.dataset import Dataset
+    from app.services.datasets import DatasetRegistry
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'registry.db'}")
+    Dataset.__table__.create(bind=engine)
+    Session = sessionmaker(bind=engine)
+    ingest_csv = store.ingest_csv
+
+    def ingest_while_other_request_commits(*args, **kwargs):
+        manifest = ingest_csv(*args, **kwargs)
+        with Session() as other:
+            DatasetRegistry(other, DatasetStore(root=str(store.root))).register_csv(
+                io.BytesIO(csv_bytes), "value", "date"
+            )
+        return manifest
+
+    monkeypatch.setattr(store, "ingest_csv", ingest_while_other_request_commits)
+    with Session() as db:
+        dataset, created = DatasetRegistry(db, store).register_csv(
+            io.BytesIO(csv_bytes), "value", "date"
+        )
+        assert not created
+        assert dataset.upload_count == 2
+        assert db.query(Dataset).count() == 1
+
+
+def test_store_bounds_open_memory_maps(store, csv_bytes):
+    """Test que le nombre de memmaps gardés ouverts est borné"""
+    store.max_open = 1
+    dataset_id = store.ingest_csv(io.BytesIO(csv_bytes), "value", "date")["id"]
+    value = store.load(dataset_id, ["value"])["value"]
+    assert store.load(dataset_id, ["value"])["value"] is value
+    store.load(dataset_id, ["date"])
+    assert list(store._open) == [(dataset_id, "date")]
+    np.testing.assert_array_equal(store.load(dataset_id, ["value"])["value"], value)
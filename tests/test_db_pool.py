@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.db.pool import PoolMetrics, configure_engine, engine_options, pool_status
+from app.db.session import async_database_url
+
+
+def test_engine_options_depend_on_backend():
+    """Test les options de pool et de connexion selon le SGBD"""
+    postgres = engine_options("postgresql://u:p@db:5432/hub")
+    assert "connect_args" not in postgres
+    assert postgres["pool_pre_ping"] is True and postgres["pool_recycle"] > 0
+
+    sqlite = engine_options("sqlite:///./hub.db")
+    assert sqlite["connect_args"] == {"check_same_thread": False}
+    assert "pool_pre_ping" not in sqlite and sqlite["pool_size"] > 0
+
+    assert engine_options("sqlite://") == {"connect_args": {"check_same_thread": False}}
+    assert "connect_args" not in engine_options("sqlite:///./hub.db", is_async=True)
+
+
+def test_sqlite_pragmas_applied_to_each_connection(tmp_path):
+    """Test WAL, synchronous et busy_timeout sur les moteurs sync et async"""
+    url = f"sqlite:///{tmp_path / 'hub.db'}"
+    engine = configure_engine(create_engine(url, **engine_options(url)))
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+    async def check():
+        async_engine = configure_engine(create_async_engine(
+            async_database_url(url), **engine_options(url, is_async=True)
+        ))
+        async with async_engine.connect() as conn:
+            result = await conn.execute(text("PRAGMA busy_timeout"))
+            assert result.scalar() == 5000
+        await async_engine.dispose()
+
+    asyncio.run(check())
+
+
+def test_pool_metrics_record_waits_and_timeouts(tmp_path):
+    """Test la mesure de l'attente à l'emprunt quand le pool est saturé"""
+    url = f"sqlite:///{tmp_path / 'hub.db'}"
+    metrics = PoolMetrics()
+    options = dict(engine_options(url, metrics=metrics), pool_size=1, max_overflow=0,
+                   pool_timeout=0.2)
+    engine = create_engine(url, **options)
+
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    released = threading.Timer(0.1, held.close)
+    released.start()
+    with engine.connect():
+        status = pool_status(engine)
+    released.join()
+
+    assert status["checked_out"] == 1 and status["size"] == 1
+    assert status["checkouts"] == 2 and status["timeouts"] == 1
+    assert status["max_wait_ms"] >= 150
+    engine.dispose()
+    assert pool_status(engine)["checkouts"] == 2
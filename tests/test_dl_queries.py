@@ -0,0 +1,377 @@
+"""Filtres et pagination des modèles de deep learning.
+
+DeepLearningModel déclare des relations vers des modèles chargés par le
+reste de l'application : l'importer ici rendrait le registre ORM partagé
+inutilisable pour les autres tests. Chaque vérification s'exécute donc
+dans un interpréteur neuf (`python tests/test_dl_queries.py <check>`).
+"""
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROWS = 1200
+TYPES = ["cnn", "rnn", "transformer"]
+STATUSES = ["draft", "ready", "archived"]
+
+def in_fresh_interpreter(check: str) -> None:
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), check],
+        cwd=ROOT, env={**os.environ, "PYTHONPATH": ROOT},
+        capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_builder_combines_filters_and_pages():
+    in_fresh_interpreter("check_builder")
+
+
+def test_query_models_pages_up_to_max_page_size():
+    in_fresh_interpreter("check_service")
+
+
+def test_list_route_sets_next_cursor_and_rejects_bad_cursor():
+    in_fresh_interpreter("check_route")
+
+
+def test_bulk_service_reports_each_item():
+    in_fresh_interpreter("check_bulk_service")
+
+
+def test_bulk_routes_summarize_and_cap_batch_size():
+    in_fresh_interpreter("check_bulk_route")
+
+
+def test_artifacts_do_not_collide_with_legacy_dl_models():
+    in_fresh_interpreter("check_artifact_namespaces")
+
+
+# Vérifications exécutées dans le sous-processus
+
+_RELATED_MODELS = ()
+
+
+def _provide_missing_modules():
+    """Versions minimales des modules dont dépendent le service et les routes
+    mais absents de l'arbre : app.services.base, app.api.deps et les modèles
+    liés à DeepLearningModel (Prediction, TrainingRun)."""
+    import types
+    from typing import Generic, TypeVar
+    from sqlalchemy import Column, ForeignKey, Integer
+    from sqlalchemy.orm import relationship
+    from app.db.base_class import Base
+
+    class Prediction(Base):
+        __tablename__ = "predictions"
+        id = Column(Integer, primary_key=True)
+        model_id = Column(Integer, ForeignKey("deep_learning_models.id"))
+        model = relationship("DeepLearningModel", back_populates="predictions")
+
+    class TrainingRun(Base):
+        __tablename__ = "training_runs"
+        id = Column(Integer, primary_key=True)
+        model_id = Column(Integer, ForeignKey("deep_learning_models.id"))
+        model = relationship("DeepLearningModel", back_populates="training_runs")
+
+    ModelType = TypeVar("ModelType")
+
+    class BaseService(Generic[ModelType]):
+        def __init__(self, model, db):
+            self.model = model
+            self.db = db
+
+        def get(self, id):
+            return self.db.get(self.model, id)
+
+        def remove(self, id):
+            obj = self.db.get(self.model, id)
+            if obj is not None:
+                self.db.delete(obj)
+                self.db.commit()
+            return obj
+
+    def get_db():
+        raise RuntimeError("Remplacé par dependency_overrides")
+
+    base = types.ModuleType("app.services.base")
+    base.BaseService = BaseService
+    deps = types.ModuleType("app.api.deps")
+    deps.get_db = get_db
+    sys.modules.update({"app.services.base": base, "app.api.deps": deps})
+    # Le registre ORM ne garde que des références faibles vers les classes
+    global _RELATED_MODELS
+    _RELATED_MODELS = (Prediction, TrainingRun)
+    return _RELATED_MODELS
+
+
+def _isolate_artifacts():
+    """Redirige le magasin d'artefacts vers un répertoire temporaire."""
+    import tempfile
+    from pathlib import Path
+    from app.services.artifact_store import artifact_store
+
+    artifact_store.root = Path(tempfile.mkdtemp())
+    return artifact_store
+
+
+def _engine(**kwargs):
+    from sqlalchemy import create_engine
+    from app.models.deep_learning import DeepLearningModel
+
+    engine = create_engine("sqlite://", **kwargs)
+    DeepLearningModel.__table__.metadata.create_all(engine, tables=[
+        DeepLearningModel.__table__,
+        *[t for t in DeepLearningModel.__table__.metadata.sorted_tables
+          if t.name in ("predictions", "training_runs")]
+    ])
+    return engine
+
+
+def _populate():
+    from sqlalchemy import insert
+    from app.models.deep_learning import DeepLearningModel
+
+    engine = _engine()
+    rows = [
+        {"id": i, "name": f"model-{i}", "model_type": TYPES[i % 3],
+         "status": STATUSES[(i // 3) % 3], "architecture": {}, "accuracy": (i % 100) / 100}
+        for i in range(1, ROWS + 1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(DeepLearningModel.__table__), rows)
+    return engine, rows
+
+
+def check_builder():
+    from app.models.deep_learning import DeepLearningModel
+    from app.services.deep_learning_queries import (
+        MAX_PAGE_SIZE, InvalidCursorError, build_model_query, cursor_after_id, next_cursor
+    )
+
+    engine, rows = _populate()
+    table = DeepLearningModel.__table__
+
+    def ids(**kwargs):
+        with engine.connect() as conn:
+            return [row.id for row in conn.execute(build_model_query(entity=table, **kwargs))]
+
+    expected = [r["id"] for r in rows if r["model_type"] == "cnn" and r["status"] == "ready"
+                and 0.2 <= r["accuracy"] <= 0.8]
+    assert ids(model_type="cnn", status="ready", min_accuracy=0.2, max_accuracy=0.8,
+               limit=None) == expected
+
+    assert ids(skip=10, limit=5) == [11, 12, 13, 14, 15]
+    assert ids(after_id=cursor_after_id(next_cursor(10)), limit=5) == [11, 12, 13, 14, 15]
+    assert ids(after_id=ROWS) == []
+
+    # Une ligne de plus que la page maximale reste lisible (page suivante)
+    assert len(ids(limit=MAX_PAGE_SIZE + 1)) == MAX_PAGE_SIZE + 1
+    assert len(ids(limit=10 * MAX_PAGE_SIZE)) == MAX_PAGE_SIZE + 1
+
+    for cursor in ("pas-un-curseur", next_cursor("12")):
+        try:
+            cursor_after_id(cursor)
+        except InvalidCursorError:
+            continue
+        raise AssertionError(f"curseur accepté : {cursor}")
+
+
+def check_service():
+    _provide_missing_modules()
+    from sqlalchemy.orm import Session
+    from app.services.deep_learning import DeepLearningService
+    from app.services.deep_learning_queries import MAX_PAGE_SIZE
+    from app.services.model_listing import InvalidCursorError
+
+    engine, rows = _populate()
+    with Session(engine) as db:
+        service = DeepLearningService(db)
+
+        models, cursor = service.query_models(model_type="rnn", status="archived",
+                                              min_accuracy=0.5, limit=MAX_PAGE_SIZE)
+        assert [m.id for m in models] == [
+            r["id"] for r in rows
+            if r["model_type"] == "rnn" and r["status"] == "archived" and r["accuracy"] >= 0.5
+        ]
+        assert cursor is None
+
+        seen, cursor = [], None
+        while True:
+            models, cursor = service.query_models(limit=MAX_PAGE_SIZE, cursor=cursor)
+            assert len(models) <= MAX_PAGE_SIZE
+            seen += [m.id for m in models]
+            if cursor is None:
+                break
+        assert seen == list(range(1, ROWS + 1))
+
+        models, cursor = service.query_models(skip=ROWS - 3, limit=2)
+        assert [m.id for m in models] == [ROWS - 2, ROWS - 1] and cursor is not None
+        models, cursor = service.query_models(skip=ROWS - 2, limit=2)
+        assert len(models) == 2 and cursor is None
+
+        try:
+            service.query_models(cursor="pas-un-curseur")
+        except InvalidCursorError:
+            pass
+        else:
+            raise AssertionError("curseur invalide accepté")
+
+
+def check_route():
+    _provide_missing_modules()
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from sqlalchemy import insert
+    from app.api import deps
+    from app.api.v1.endpoints import deep_learning
+    from app.models.deep_learning import DeepLearningModel
+    from app.services.deep_learning_queries import MAX_PAGE_SIZE
+
+    engine = _engine(poolclass=StaticPool, connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(insert(DeepLearningModel.__table__), [
+            {"name": f"model-{i}", "model_type": TYPES[i % 3], "status": "ready",
+             "architecture": {}, "accuracy": 0.5}
+            for i in range(ROWS)
+        ])
+    Session = sessionmaker(bind=engine)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(deep_learning.router, prefix="/deep-learning")
+    app.dependency_overrides[deps.get_db] = override_get_db
+    client = TestClient(app)
+
+    response = client.get("/deep-learning/", params={"limit": MAX_PAGE_SIZE})
+    assert response.status_code == 200
+    assert len(response.json()) == MAX_PAGE_SIZE
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/deep-learning/", params={"limit": MAX_PAGE_SIZE, "cursor": cursor})
+    assert [m["id"] for m in response.json()][0] == MAX_PAGE_SIZE + 1
+
+    response = client.get("/deep-learning/", params={"model_type": "cnn", "limit": 10})
+    assert {m["model_type"] for m in response.json()} == {"cnn"}
+
+    assert client.get("/deep-learning/", params={"limit": MAX_PAGE_SIZE + 1}).status_code == 422
+    assert client.get("/deep-learning/", params={"cursor": "pas-un-curseur"}).status_code == 400
+
+
+def check_bulk_service():
+    _provide_missing_modules()
+    store = _isolate_artifacts()
+    from sqlalchemy.orm import Session
+    from app.schemas.deep_learning import DeepLearningModelCreate, DeepLearningModelUpdate
+    from app.services.deep_learning import ARTIFACT_KIND, DeepLearningService
+
+    with Session(_engine()) as db:
+        service = DeepLearningService(db)
+        created = service.bulk_create_models([
+            DeepLearningModelCreate(name=f"model-{i}", model_type="cnn", architecture={"layers": i})
+            for i in range(3)
+        ])
+        assert [(r["index"], r["id"], r["status"]) for r in created] == [
+            (0, 1, "created"), (1, 2, "created"), (2, 3, "created")
+        ]
+
+        updated = service.bulk_update_models([
+            (1, DeepLearningModelUpdate(status="ready")),
+            (1, DeepLearningModelUpdate(status="archived")),
+            (99, DeepLearningModelUpdate(status="ready"))
+        ])
+        assert [r["status"] for r in updated] == ["updated", "duplicate", "not_found"]
+        db.expire_all()
+        assert service.get(1).status == "ready"
+
+        service.save_weights(2, {"w": [1, 2]})
+        removed = service.bulk_remove([2, 99])
+        assert [r["status"] for r in removed] == ["deleted", "not_found"]
+        assert service.get(2) is None
+        assert service.get(3) is not None
+        assert store.versions(2, kind=ARTIFACT_KIND) == []
+
+
+def check_bulk_route():
+    _provide_missing_modules()
+    _isolate_artifacts()
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from app.api import deps
+    from app.api.v1.endpoints import deep_learning
+    from app.core.config import settings
+
+    engine = _engine(poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Session = sessionmaker(bind=engine)
+
+    def override_get_db():
+        with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(deep_learning.router, prefix="/deep-learning")
+    app.dependency_overrides[deps.get_db] = override_get_db
+    client = TestClient(app)
+
+    payload = [{"name": f"model-{i}", "model_type": "rnn", "architecture": {}} for i in range(4)]
+    response = client.post("/deep-learning/bulk", json=payload)
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 4 and response.json()["failed"] == 0
+
+    response = client.put("/deep-learning/bulk", json=[
+        {"id": 1, "accuracy": 0.9}, {"id": 42, "accuracy": 0.1}
+    ])
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+    assert body["results"][1]["status"] == "not_found"
+    assert client.get("/deep-learning/1").json()["accuracy"] == 0.9
+
+    response = client.post("/deep-learning/bulk/delete", json=[3, 4])
+    assert response.json()["succeeded"] == 2
+    assert client.get("/deep-learning/3").status_code == 404
+
+    too_many = [{"name": "x", "model_type": "rnn", "architecture": {}}] * (settings.MAX_BULK_ITEMS + 1)
+    assert client.post("/deep-learning/bulk", json=too_many).status_code == 422
+
+
+def check_artifact_namespaces():
+    _provide_missing_modules()
+    store = _isolate_artifacts()
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+    from app.db.migrations import REGISTRY_ARTIFACT_KIND, migrate_model_registry
+    from app.schemas.deep_learning import DeepLearningModelCreate
+    from app.services.deep_learning import ARTIFACT_KIND, DeepLearningService
+    from app.services.model_cache import load_model
+
+    engine = _engine()
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE dl_models (id INTEGER PRIMARY KEY, name VARCHAR, type VARCHAR)"))
+        conn.execute(text("INSERT INTO dl_models (id, name, type) VALUES (1, 'legacy', 'cnn')"))
+    store.save(1, {"weights": "legacy"}, kind="dl")
+
+    with Session(engine) as db:
+        service = DeepLearningService(db)
+        service.create_model(DeepLearningModelCreate(name="new", model_type="cnn", architecture={}))
+        service.save_weights(1, {"weights": "new"})
+        assert load_model(1, kind="dl") == {"weights": "legacy"}
+        assert load_model(1, kind=ARTIFACT_KIND) == {"weights": "new"}
+
+        assert migrate_model_registry(engine, tables=(("dl_models", "pytorch", "dl"),), store=store) == 1
+        assert store.load(1, kind=REGISTRY_ARTIFACT_KIND) == {"weights": "legacy"}
+
+        service.remove(1)
+        assert store.versions(1, kind=ARTIFACT_KIND) == []
+        assert load_model(1, kind="dl") == {"weights": "legacy"}
+
+
+if __name__ == "__main__":
+    globals()[sys.argv[1]]()
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import pytest
+from app.core.config import settings
+from app.core.hashing import HashingOverloadedError, HashingPool
+from app.core.security import pwd_context
+
+
+def test_pool_bounds_parallelism_and_sheds_excess():
+    """Test la limite de hachages simultanés et le refus au-delà de la file"""
+    pool = HashingPool(max_workers=2, max_queued=1)
+    release = threading.Event()
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_hash(value):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+        return value * 2
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(pool.run(slow_hash, i)) for i in range(3)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HashingOverloadedError) as excinfo:
+            await pool.run(slow_hash, 99)
+        assert excinfo.value.retry_after >= 1
+        release.set()
+        results = await asyncio.gather(*tasks)
+        # La file s'est vidée : une nouvelle demande est admise
+        results.append(await pool.run(slow_hash, 3))
+        return results
+
+    assert asyncio.run(scenario()) == [0, 2, 4, 6]
+    assert peak[0] == 2
+    stats = pool.stats()
+    assert (stats["in_flight"], stats["completed"], stats["rejected"]) == (0, 4, 1)
+    pool.shutdown()
+
+
+def test_errors_release_the_slot():
+    """Test qu'une erreur dans le hachage libère la place réservée"""
+    pool = HashingPool(max_workers=1, max_queued=0)
+
+    def fail(_):
+        raise ValueError("boom")
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await pool.run(fail, None)
+
+    asyncio.run(scenario())
+    assert pool.stats()["in_flight"] == 0
+    pool.shutdown()
+
+
+def test_bcrypt_rounds_from_settings():
+    """Test le facteur de coût configuré pour les nouveaux hachages"""
+    hashed = pwd_context.hash("password1")
+    assert hashed.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+    assert pwd_context.verify("password1", hashed)
@@ -0,0 +1,188 @@
+import threading
+import time
+import pytest
+from app.services.artifact_store import ArtifactStore, ArtifactNotFoundError
+from app.services.model_cache import ModelCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(root=str(tmp_path))
+
+
+def test_artifact_store_versions_and_dedup(store):
+    """Test le versioning et la déduplication par contenu"""
+    v1 = store.save(1, {"weights": [1, 2, 3]})
+    same = store.save(1, {"weights": [1, 2, 3]})
+    v2 = store.save(1, {"weights": [4, 5, 6]})
+    store.save(2, {"weights": [1, 2, 3]}, kind="dl")
+
+    assert same == v1
+    assert (v1["version"], v2["version"]) == (1, 2)
+    assert store.load(1) == {"weights": [4, 5, 6]}
+    assert store.load(1, version=1) == {"weights": [1, 2, 3]}
+    # Même contenu pour un autre modèle : un seul objet sur disque
+    assert store.resolve(2, kind="dl")["digest"] == v1["digest"]
+
+
+def test_artifact_store_delete_and_gc(store):
+    """Test la suppression d'un modèle et la récupération des objets orphelins"""
+    store.save(1, "a")
+    store.save(2, "b")
+    store.delete(1)
+
+    with pytest.raises(ArtifactNotFoundError):
+        store.load(1)
+    assert store.collect_garbage() == 1
+    assert store.load(2) == "b"
+
+
+def test_model_cache_lru_and_byte_limits():
+    """Test l'éviction LRU par nombre d'entrées et par taille"""
+    cache = ModelCache(max_items=2, max_bytes=100, ttl_seconds=0)
+    cache.put(("ml", 1, None), "a", size=10)
+    cache.put(("ml", 2, None), "b", size=10)
+    assert cache.get(("ml", 1, None)) == "a"
+    cache.put(("ml", 3, None), "c", size=10)
+
+    assert cache.get(("ml", 2, None)) is None
+    assert cache.get(("ml", 1, None)) == "a"
+
+    cache.put(("ml", 4, None), "d", size=95)
+    assert cache.stats()["bytes"] <= 100
+    assert cache.get(("ml", 4, None)) == "d"
+
+
+def test_model_cache_ttl_and_invalidation():
+    """Test l'expiration et l'invalidation de toutes les versions d'un modèle"""
+    cache = ModelCache(max_items=10, max_bytes=0, ttl_seconds=0.05)
+    cache.put(("ml", 1, None), "latest")
+    cache.put(("ml", 1, 2), "v2")
+    cache.put(("dl", 1, None), "other")
+
+    cache.invalidate("ml", 1)
+    assert cache.get(("ml", 1, None)) is None
+    assert cache.get(("ml", 1, 2)) is None
+    assert cache.get(("dl", 1, None)) == "other"
+
+    time.sleep(0.06)
+    assert cache.get(("dl", 1, None)) is None
+
+
+def test_model_cache_loads_once_under_concurrency():
+    """Test qu'un seul chargement a lieu pour des requêtes simultanées"""
+    cache = ModelCache(max_items=10, max_bytes=0, ttl_seconds=0)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "model", 1
+
+    threads = [threading.Thread(target=cache.get_or_load, args=(("ml", 1, None), loader))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert cache.get(("ml", 1, None)) == "model"
+
+
+def test_model_cache_releases_key_lock_when_loader_fails():
+    """Test qu'un chargement en échec ne laisse pas de verrou et peut être retenté"""
+    cache = ModelCache(max_items=10, max_bytes=0, ttl_seconds=0)
+
+    def failing():
+        raise FileNotFoundError("artefact absent")
+
+    with pytest.raises(FileNotFoundError):
+        cache.get_or_load(("ml", 1, None), failing)
+    assert cache._loading == {}
+    assert cache.get_or_load(("ml", 1, None), lambda: ("model", 1)) == "model"
+    assert cache._loading == {}
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    """Test le regroupement de requêtes simultanées en un seul appel"""
+    import asyncio
+    import numpy as np
+    from app.services.micro_batching import MicroBatcher
+
+    calls = []
+
+    def predict_fn(rows):
+        calls.append(len(rows))
+        return np.asarray(rows).sum(axis=1)
+
+    async def scenario():
+        batcher = MicroBatcher(max_batch_size=8, max_wait_ms=50)
+        requests = [batcher.predict("m", predict_fn, [[i, i]]) for i in range(5)]
+        results = await asyncio.gather(*requests)
+        metrics = batcher.metrics("m")
+        batcher.close()
+        return results, metrics
+
+    results, metrics = asyncio.run(scenario())
+    assert results == [[2 * i] for i in range(5)]
+    assert calls == [5]
+    assert metrics["batches"] == 1
+    assert metrics["avg_fill_rate"] == pytest.approx(5 / 8)
+
+
+def test_micro_batcher_respects_max_batch_size_and_errors():
+    """Test le découpage par taille de lot et la propagation des erreurs"""
+    import asyncio
+    from app.services.micro_batching import MicroBatcher
+
+    calls = []
+
+    def predict_fn(rows):
+        calls.append(len(rows))
+        if len(calls) > 2:
+            raise RuntimeError("boom")
+        return [0] * len(rows)
+
+    async def scenario():
+        batcher = MicroBatcher(max_batch_size=2, max_wait_ms=50)
+        results = await asyncio.gather(
+            *[batcher.predict("m", predict_fn, [[i]]) for i in range(4)]
+        )
+        with pytest.raises(RuntimeError):
+            await batcher.predict("m", predict_fn, [[0]])
+        batcher.close()
+        return results
+
+    assert asyncio.run(scenario()) == [[0]] * 4
+    assert calls[:2] == [2, 2]
+
+
+def test_micro_batcher_isolates_failing_request():
+    """Test qu'une requête invalide n'échoue que pour elle-même"""
+    import asyncio
+    import numpy as np
+    from app.services.micro_batching import MicroBatcher
+
+    calls = []
+
+    def predict_fn(rows):
+        rows = np.asarray(rows, dtype=float)
+        calls.append(len(rows))
+        if np.isnan(rows).any():
+            raise ValueError("valeur manquante")
+        return rows.sum(axis=1)
+
+    async def scenario():
+        batcher = MicroBatcher(max_batch_size=8, max_wait_ms=50)
+        rows = [[[1, 1]], [[2, float("nan")]], [[3, 3]]]
+        results = await asyncio.gather(
+            *[batcher.predict("m", predict_fn, r) for r in rows], return_exceptions=True
+        )
+        batcher.close()
+        return results
+
+    ok, failed, other = asyncio.run(scenario())
+    assert ok == [2.0] and other == [6.0]
+    assert isinstance(failed, ValueError)
+    assert calls == [3, 1, 1, 1]
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import Column, DateTime, Float, Integer, JSON, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.sql import func
+from app.services.model_listing import (
+    InvalidCursorError, decode_cursor, encode_cursor, list_models
+)
+
+Base = declarative_base()
+
+
+class MLRow(Base):
+    __tablename__ = "ml_rows"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    type = Column(String(50))
+    parameters = Column(JSON)
+    accuracy = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class DLRow(Base):
+    __tablename__ = "dl_rows"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    type = Column(String(50))
+    parameters = Column(JSON)
+    accuracy = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+SOURCES = [(MLRow, "sklearn"), (DLRow, "pytorch")]
+
+
+@pytest.fixture
+def db():
+    """Deux tables aux identifiants qui se chevauchent, dates et précisions ex aequo"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    start = datetime(2024, 1, 1)
+    for i in range(12):
+        session.add(MLRow(name=f"ml-{i}", type="classification" if i % 2 else "regression",
+                          accuracy=None if i % 5 == 0 else round(0.5 + (i % 4) / 10, 2),
+                          created_at=start + timedelta(hours=i // 3)))
+        session.add(DLRow(name=f"dl-{i}", type="cnn",
+                          accuracy=round(0.6 + (i % 3) / 10, 2),
+                          created_at=start + timedelta(hours=i // 2)))
+    # Date par défaut du SGBD (format texte différent sous SQLite)
+    session.add(MLRow(name="ml-default", type="regression", accuracy=0.9))
+    session.commit()
+    yield session
+    session.close()
+
+
+def all_pages(db, limit, **kwargs):
+    rows, cursor, pages = [], None, 0
+    while True:
+        page, cursor = list_models(db, SOURCES, limit=limit, cursor=cursor, **kwargs)
+        rows.extend(page)
+        pages += 1
+        if cursor is None:
+            return rows, pages
+
+
+@pytest.mark.parametrize("sort", ["created_at", "name", "accuracy", "id"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_keyset_pages_cover_every_row_once(db, sort, order):
+    """Test que la pagination par curseur reproduit exactement la liste complète"""
+    full, _ = list_models(db, SOURCES, sort=sort, order=order, limit=500)
+    assert len(full) == 25
+    paged, pages = all_pages(db, limit=4, sort=sort, order=order)
+    assert paged == full
+    assert pages == 7
+
+    keys = [(r["framework"], r["id"]) for r in paged]
+    assert len(set(keys)) == 25
+    values = [r[sort] for r in full if r[sort] is not None]
+    assert values == sorted(values, reverse=order == "desc")
+    # Les NULL arrivent en dernier
+    nulls = [r[sort] is None for r in full]
+    assert nulls == sorted(nulls)
+
+
+def test_filters_and_columns(db):
+    """Test les filtres et les colonnes renvoyées"""
+    rows, cursor = list_models(db, SOURCES, framework="sklearn", model_type="classification",
+                               min_accuracy=0.6, name="ml-")
+    assert cursor is None
+    assert rows and all(r["framework"] == "sklearn" and r["type"] == "classification"
+                        and r["accuracy"] >= 0.6 for r in rows)
+    assert set(rows[0]) == {"id", "name", "type", "framework", "accuracy", "created_at"}
+    assert isinstance(rows[0]["created_at"], datetime)
+
+    rows, _ = list_models(db, SOURCES, name="%")
+    assert rows == []
+
+
+def test_cursor_must_match_sort(db):
+    """Test le rejet d'un curseur illisible ou d'un autre tri"""
+    _, cursor = list_models(db, SOURCES, sort="name", limit=2)
+    assert decode_cursor(cursor)["sort"] == "name"
+    with pytest.raises(InvalidCursorError):
+        list_models(db, SOURCES, sort="id", cursor=cursor)
+    with pytest.raises(InvalidCursorError):
+        list_models(db, SOURCES, cursor="not-base64!")
+    assert decode_cursor(encode_cursor({"key": datetime(2024, 1, 1)}))["key"] == datetime(2024, 1, 1)
@@ -0,0 +1,221 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from app.api.endpoints import models
+from app.core.response_cache import response_cache
+from app.db.migrations import migrate_model_registry
+from app.db.session import async_database_url, get_async_db
+from app.models.registry import ModelRegistry
+from app.services.artifact_store import ArtifactStore
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'registry.db'}")
+    with engine.begin() as conn:
+        # Anciennes tables aux identifiants qui se chevauchent
+        conn.execute(text("CREATE TABLE ml_models (id INTEGER PRIMARY KEY, name VARCHAR, "
+                          "type VARCHAR, parameters JSON, accuracy FLOAT, created_at DATETIME)"))
+        conn.execute(text("CREATE TABLE dl_models (id INTEGER PRIMARY KEY, name VARCHAR, "
+                          "type VARCHAR, architecture VARCHAR, parameters JSON, accuracy FLOAT, "
+                          "created_at DATETIME)"))
+        conn.execute(text("INSERT INTO ml_models VALUES (1, 'rf', 'classification', '{}', 0.9, "
+                          "'2024-01-01 00:00:00'), (2, 'lr', 'regression', NULL, 0.7, "
+                          "'2024-01-02 00:00:00')"))
+        conn.execute(text("INSERT INTO dl_models VALUES (1, 'cnn', 'cnn', 'resnet', '{\"lr\": 0.1}', "
+                          "0.8, '2024-01-03 00:00:00')"))
+    return engine
+
+
+def test_migration_copies_once_and_moves_artifacts(engine, tmp_path):
+    """Test la copie idempotente des anciennes tables et des artefacts"""
+    store = ArtifactStore(root=str(tmp_path))
+    store.save(1, {"weights": "dl"}, kind="dl")
+
+    assert migrate_model_registry(engine, store=store) == 3
+    assert migrate_model_registry(engine, store=store) == 0
+
+    with sessionmaker(bind=engine)() as db:
+        rows = db.query(ModelRegistry).order_by(ModelRegistry.id).all()
+        assert [(r.id, r.framework, r.legacy_id, r.name) for r in rows] == [
+            (1, "sklearn", 1, "rf"), (2, "sklearn", 2, "lr"), (3, "pytorch", 1, "cnn")
+        ]
+        assert rows[2].parameters == {"lr": 0.1}
+    assert store.load(3, kind="model") == {"weights": "dl"}
+
+
+@pytest.fixture
+def client(engine, tmp_path):
+    migrate_model_registry(engine, store=ArtifactStore(root=str(tmp_path)))
+    # Même fichier, pilote asynchrone ; NullPool car chaque requête du
+    # TestClient tourne dans sa propre boucle d'événements
+    async_engine = create_async_engine(async_database_url(str(engine.url)), poolclass=NullPool)
+    Session = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with Session() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(models.router, prefix="/api/v1")
+    app.dependency_overrides[get_async_db] = override_get_db
+    response_cache.clear()
+    return TestClient(app)
+
+
+def test_endpoints_use_single_table(client):
+    """Test les opérations par identifiant sur le registre unifié"""
+    assert client.get("/api/v1/models/3").json()["framework"] == "pytorch"
+    created = client.post("/api/v1/models", json={
+        "name": "gbm", "type": "classification", "framework": "sklearn"
+    }).json()
+    assert created["id"] == 4
+
+    updated = client.put("/api/v1/models/4", json={"accuracy": 0.95})
+    assert updated.json()["accuracy"] == 0.95
+    listing = client.get("/api/v1/models", params={"sort": "id", "order": "asc", "limit": 2})
+    assert [m["id"] for m in listing.json()] == [1, 2]
+    assert "X-Next-Cursor" in listing.headers
+
+    assert client.delete("/api/v1/models/4").status_code == 200
+    assert client.get("/api/v1/models/4").status_code == 404
+    assert client.put("/api/v1/models/99", json={"name": "x"}).status_code == 404
+
+
+def test_bulk_endpoints_report_per_item_results(client, engine):
+    """Test la création, la mise à jour et la suppression groupées"""
+    created = client.post("/api/v1/models/bulk", json={"models": [
+        {"name": f"v{i}", "type": "classification", "framework": "sklearn"} for i in range(50)
+    ]}).json()
+    assert created["succeeded"] == 50 and created["failed"] == 0
+    ids = [r["id"] for r in created["results"]]
+    assert ids == list(range(4, 54))
+
+    updated = client.put("/api/v1/models/bulk", json={"models": [
+        {"id": ids[0], "accuracy": 0.5},
+        {"id": ids[1], "name": "renamed", "accuracy": 0.6},
+        {"id": 999, "accuracy": 0.1},
+        {"id": ids[0], "accuracy": 0.7},
+    ]}).json()
+    assert [r["status"] for r in updated["results"]] == ["updated", "updated", "not_found", "duplicate"]
+    assert (updated["succeeded"], updated["failed"]) == (2, 2)
+    assert client.get(f"/api/v1/models/{ids[1]}").json()["name"] == "renamed"
+    assert client.get(f"/api/v1/models/{ids[0]}").json()["accuracy"] == 0.5
+
+    deleted = client.post("/api/v1/models/bulk/delete", json={"ids": ids + [999]}).json()
+    assert deleted["succeeded"] == 50
+    assert deleted["results"][-1] == {"index": 50, "id": 999, "status": "not_found",
+                                      "error": "Model not found"}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM model_registry")).scalar() == 3
+
+    too_many = client.post("/api/v1/models/bulk/delete", json={"ids": list(range(1001))})
+    assert too_many.status_code == 422
+
+
+def test_predict_maps_bad_input_to_client_errors(client, monkeypatch):
+    """Test les codes 4xx pour un CSV illisible ou incompatible avec le modèle"""
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LinearRegression
+    from app.services.micro_batching import micro_batcher
+
+    X = pd.DataFrame({"a": np.arange(10.0), "b": np.arange(10.0) ** 2})
+    regressor = LinearRegression().fit(X, X["a"] + X["b"])
+    monkeypatch.setattr(models, "load_model", lambda *args, **kwargs: regressor)
+
+    def predict(content):
+        return client.post("/api/v1/models/1/predict", files={"file": ("x.csv", content)})
+
+    try:
+        response = predict(b"a,b\n1,1\n2,4\n")
+        assert response.status_code == 200
+        assert response.json()["predictions"] == pytest.approx([2.0, 6.0])
+        assert predict(b"").status_code == 400
+        assert predict(b"c\n1\n").status_code == 422
+        assert predict(b"a,b\nx,1\n").status_code == 422
+        assert client.post("/api/v1/models/99/predict",
+                           files={"file": ("x.csv", b"a,b\n1,1\n")}).status_code == 404
+    finally:
+        micro_batcher.close()
+
+
+def test_ensure_indexes_adds_missing_indexes(engine):
+    """Test l'ajout des index déclarés à une table existante"""
+    from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table, inspect
+    from app.db.migrations import ensure_indexes
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE dl (id INTEGER PRIMARY KEY, model_type VARCHAR, "
+                          "status VARCHAR, accuracy FLOAT)"))
+    table = Table("dl", MetaData(), Column("id", Integer, primary_key=True),
+                  Column("model_type", String), Column("status", String),
+                  Column("accuracy", Float, index=True),
+                  Index("ix_dl_type_status", "model_type", "status", "id"))
+
+    assert ensure_indexes(engine, [table]) == 2
+    assert ensure_indexes(engine, [table]) == 0
+    names = {i["name"] for i in inspect(engine).get_indexes("dl")}
+    assert names == {"ix_dl_accuracy", "ix_dl_type_status"}
+
+
+def test_async_database_url():
+    """Test le choix du pilote asynchrone selon le SGBD"""
+    assert async_database_url("sqlite:///./modelhub.db") == "sqlite+aiosqlite:///./modelhub.db"
+    assert async_database_url("postgres://u:p@db:5432/hub") == "postgresql+asyncpg://u:p@db:5432/hub"
+    assert async_database_url("postgresql+psycopg2://u@db/hub") == "postgresql+asyncpg://u@db/hub"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u@db/hub")
+
+
+def test_read_endpoints_cached_with_conditional_get(client, engine):
+    """Test le cache des lectures, les réponses 304 et l'invalidation par écriture"""
+    first = client.get("/api/v1/models", params={"sort": "id", "limit": 2})
+    etag = first.headers["ETag"]
+    assert "Last-Modified" not in first.headers
+    assert first.headers["X-Next-Cursor"]
+
+    # Modification hors API : la page servie vient du cache
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE model_registry SET name = 'hors-api' WHERE id = 3"))
+    again = client.get("/api/v1/models", params={"limit": 2, "sort": "id"})
+    assert again.json() == first.json() and again.headers["ETag"] == etag
+
+    not_modified = client.get("/api/v1/models", params={"sort": "id", "limit": 2},
+                              headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    # Une page de liste n'a pas de date de modification : ETag seulement
+    assert client.get("/api/v1/models", params={"sort": "id", "limit": 2}, headers={
+        "If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"
+    }).status_code == 200
+
+    single = client.get("/api/v1/models/1")
+    assert single.headers["Last-Modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert client.get("/api/v1/models/1",
+                      headers={"If-None-Match": single.headers["ETag"]}).status_code == 304
+    assert client.get("/api/v1/models/1", headers={
+        "If-Modified-Since": single.headers["Last-Modified"]
+    }).status_code == 304
+    assert client.get("/api/v1/models/1", headers={
+        "If-Modified-Since": "Sun, 31 Dec 2023 00:00:00 GMT"
+    }).status_code == 200
+    assert client.get("/api/v1/models/99").status_code == 404
+
+    # Une écriture par l'API vide le cache : nouvelle version, nouvel ETag
+    client.put("/api/v1/models/1", json={"accuracy": 0.99})
+    changed = client.get("/api/v1/models", params={"sort": "id", "limit": 2},
+                         headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert changed.json()[0]["name"] == "hors-api"
+    assert client.get("/api/v1/models/1", headers={
+        "If-None-Match": single.headers["ETag"]
+    }).json()["accuracy"] == 0.99
+    # updated_at a avancé : la date connue du client n'est plus à jour
+    assert client.get("/api/v1/models/1", headers={
+        "If-Modified-Since": single.headers["Last-Modified"]
+    }).status_code == 200
@@ -0,0 +1,441 @@
+import shutil
+import time
+import cv2
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg
+import pytest
+from app.preprocessing.image.image_preprocessor import ImagePreprocessor
+
+
+@pytest.fixture
+def images():
+    """Images de tailles et de nombres de canaux différents"""
+    rng = np.random.default_rng(0)
+    return [
+        rng.integers(0, 256, (48, 64, 3), dtype=np.uint8),
+        rng.integers(0, 256, (30, 20), dtype=np.uint8),
+        rng.integers(0, 256, (40, 40, 4), dtype=np.uint8),
+    ]
+
+
+def reference(preprocessor, image):
+    """Prétraitement historique, image par image"""
+    image = preprocessor._to_rgb(image)
+    image = cv2.resize(image, preprocessor.target_size).astype(np.float32) / 255.0
+    for i in range(3):
+        image[:, :, i] = (image[:, :, i] - preprocessor.mean[i]) / preprocessor.std[i]
+    return image
+
+
+def test_transform_batch_matches_per_image_path(images):
+    """Test que le lot reproduit le prétraitement image par image"""
+    preprocessor = ImagePreprocessor({"target_size": (32, 24), "num_workers": 2}).fit(images)
+    batch = preprocessor.transform(images)
+    assert batch.shape == (3, 24, 32, 3)
+    assert batch.dtype == np.float32
+    expected = np.stack([reference(preprocessor, image) for image in images])
+    np.testing.assert_allclose(batch, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_transform_batch_layout_and_dtype(images):
+    """Test la disposition NCHW et la sortie float16"""
+    preprocessor = ImagePreprocessor({"target_size": (32, 24)}).fit(images)
+    nhwc = preprocessor.transform_batch(images)
+    nchw = preprocessor.transform_batch(images, layout="NCHW", dtype=np.float16)
+    assert nchw.shape == (3, 3, 24, 32)
+    assert nchw.dtype == np.float16
+    np.testing.assert_allclose(nchw.transpose(0, 2, 3, 1), nhwc, atol=1e-2)
+
+    out = np.empty((3, 3, 24, 32), dtype=np.float32)
+    assert preprocessor.transform_batch(images, layout="NCHW", out=out) is out
+    with pytest.raises(ValueError):
+        preprocessor.transform_batch(images, out=out)
+
+
+def test_transform_batch_decodes_paths_and_bytes(tmp_path, images):
+    """Test le décodage des chemins et des octets encodés (BGR -> RGB)"""
+    rgb = images[0]
+    encoded = cv2.imencode(".png", cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))[1].tobytes()
+    path = tmp_path / "image.png"
+    path.write_bytes(encoded)
+
+    preprocessor = ImagePreprocessor({"target_size": (16, 16), "normalize": False}).fit([])
+    batch = preprocessor.transform_batch([rgb, str(path), encoded])
+    assert batch.dtype == np.uint8
+    np.testing.assert_array_equal(batch[1], batch[0])
+    np.testing.assert_array_equal(batch[2], batch[0])
+
+    with pytest.raises(ValueError):
+        preprocessor.transform_batch([b"not an image"])
+
+
+def test_transform_batch_without_normalization_keeps_source_dtype():
+    """Test que des images flottantes ne sont pas tronquées sans normalisation"""
+    from app.preprocessing.image import image_preprocessor
+
+    images = [np.full((8, 8, 3), 0.25, dtype=np.float32), np.full((8, 8, 3), 0.75, dtype=np.float32)]
+    preprocessor = ImagePreprocessor({"target_size": (4, 4), "normalize": False,
+                                      "num_workers": 2}).fit([])
+    batch = preprocessor.transform_batch(images)
+    assert batch.dtype == np.float32
+    np.testing.assert_allclose(batch[:, 0, 0, 0], [0.25, 0.75])
+
+    # Le pool de threads est créé une fois puis réutilisé
+    executor = image_preprocessor._executors[2]
+    preprocessor.transform_batch(images)
+    assert image_preprocessor._executors[2] is executor
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    """Dossier de 10 images PNG (dont une dans un sous-dossier) et un fichier ignoré"""
+    rng = np.random.default_rng(1)
+    (tmp_path / "sub").mkdir()
+    for i in range(10):
+        folder = tmp_path / "sub" if i == 9 else tmp_path
+        cv2.imwrite(str(folder / f"img{i}.png"), rng.integers(0, 256, (20, 30, 3), dtype=np.uint8))
+    (tmp_path / "notes.txt").write_text("pas une image")
+    return tmp_path
+
+
+@pytest.mark.parametrize("archive", [None, "zip", "gztar"])
+def test_iter_transform_streams_fixed_size_batches(tmp_path, image_dir, archive):
+    """Test le flux de lots depuis un dossier ou une archive"""
+    source = image_dir
+    if archive:
+        source = shutil.make_archive(str(tmp_path / "archive"), archive, root_dir=image_dir)
+
+    preprocessor = ImagePreprocessor({"target_size": (8, 8), "num_workers": 2}).fit([])
+    batches = list(preprocessor.iter_transform(source, batch_size=4, return_names=True))
+    assert [len(names) for names, _ in batches] == [4, 4, 2]
+    assert [batch.shape for _, batch in batches] == [(4, 8, 8, 3), (4, 8, 8, 3), (2, 8, 8, 3)]
+
+    paths = sorted(p for p in image_dir.rglob("*.png"))
+    expected = preprocessor.transform_batch([str(p) for p in paths])
+    by_name = {name.split("/")[-1]: row for names, batch in batches for name, row in zip(names, batch)}
+    for path, row in zip(paths, expected):
+        np.testing.assert_allclose(by_name[path.name], row)
+
+
+def test_iter_transform_prefetch_is_bounded(images):
+    """Test que la lecture anticipée reste bornée à quelques lots"""
+    consumed = []
+
+    def source():
+        for i in range(1000):
+            consumed.append(i)
+            yield images[0]
+
+    preprocessor = ImagePreprocessor({"target_size": (8, 8), "num_workers": 1}).fit([])
+    stream = preprocessor.iter_transform(source(), batch_size=10, prefetch=2)
+    next(stream)
+    time.sleep(0.2)
+    # Lot consommé + lots en file + lot en cours de production
+    assert len(consumed) <= 10 * 5
+    stream.close()
+
+
+def test_iter_transform_propagates_errors():
+    """Test qu'une image illisible interrompt le flux avec son erreur"""
+    preprocessor = ImagePreprocessor({"target_size": (8, 8)}).fit([])
+    with pytest.raises(ValueError):
+        list(preprocessor.iter_transform([b"not an image"], batch_size=2))
+
+
+@pytest.fixture
+def text_preprocessor():
+    """Préprocesseur sans ressource NLTK à télécharger"""
+    from app.preprocessing.text.text_preprocessor import TextPreprocessor
+    return TextPreprocessor({
+        "tokenizer": "regex", "stop_words": ["the", "a", "is"], "lemmatize": False
+    }).fit([])
+
+
+class UpperLemmatizer:
+    """Lemmatiseur factice qui compte ses appels"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def lemmatize(self, token):
+        self.calls += 1
+        return token.upper()
+
+
+def test_text_transform_cleans_and_filters(text_preprocessor):
+    """Test le nettoyage, la tokenisation par regex et les mots vides"""
+    docs = ["The cat is on a mat!", "  Dogs,  2 cats\tand   birds. "]
+    assert text_preprocessor.transform(docs) == ["cat on mat", "dogs cats and birds"]
+
+
+def test_text_lemmas_are_memoized(text_preprocessor):
+    """Test que chaque token distinct n'est lemmatisé qu'une fois"""
+    text_preprocessor.lemmatize = True
+    text_preprocessor.lemmatizer = UpperLemmatizer()
+    result = text_preprocessor.transform(["cats cats dogs", "dogs cats"])
+    assert result == ["CATS CATS DOGS", "DOGS CATS"]
+    assert text_preprocessor.lemmatizer.calls == 2
+    assert text_preprocessor.lemma_cache_info().hits == 3
+
+
+def test_text_transform_batch_matches_serial(text_preprocessor):
+    """Test la transformation multi-processus (ordre conservé) et le pickling"""
+    import pickle
+    docs = [f"Document number {i}: the value is {i * 3}, a word{i % 4}" for i in range(23)]
+    expected = text_preprocessor.transform(docs)
+    assert text_preprocessor.transform_batch(docs, n_jobs=2, chunksize=5) == expected
+
+    restored = pickle.loads(pickle.dumps(text_preprocessor))
+    assert restored.transform(docs) == expected
+
+
+CORPUS = [
+    "the cat sat on the mat",
+    "dogs and cats",
+    "the dog sat",
+    "birds fly over the cat",
+    "mat mat mat",
+]
+
+
+def test_vectorizer_vocabulary_matches_sklearn_tfidf():
+    """Test le TF-IDF incrémental face à TfidfVectorizer de scikit-learn"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from app.preprocessing.text.vectorizer import TextVectorizer
+
+    vectorizer = TextVectorizer({"mode": "vocabulary", "batch_size": 2})
+    vectorizer.partial_fit(CORPUS[:3]).partial_fit(iter(CORPUS[3:]))
+    matrix = vectorizer.transform(CORPUS)
+
+    reference = TfidfVectorizer(analyzer=str.split).fit(CORPUS)
+    order = [reference.vocabulary_[t] for t in sorted(vectorizer.vocabulary, key=vectorizer.vocabulary.get)]
+    expected = reference.transform(CORPUS)[:, order]
+    np.testing.assert_allclose(matrix.toarray(), expected.toarray())
+
+
+def test_vectorizer_streams_batches_and_round_trips(tmp_path):
+    """Test le flux par lots en mode hachage et la sauvegarde"""
+    from app.preprocessing.text.vectorizer import TextVectorizer
+
+    vectorizer = TextVectorizer({
+        "mode": "hashing", "n_features": 64, "batch_size": 2,
+        "preprocessor": {"tokenizer": "regex", "stop_words": ["the"], "lemmatize": False},
+    }).fit(CORPUS)
+    batches = list(vectorizer.iter_transform(iter(CORPUS)))
+    assert [b.shape for b in batches] == [(2, 64), (2, 64), (1, 64)]
+    assert all(isinstance(b, sp.csr_matrix) for b in batches)
+    np.testing.assert_allclose(sp.linalg.norm(sp.vstack(batches), axis=1), 1.0)
+
+    vectorizer.save(str(tmp_path / "vectorizer"))
+    restored = TextVectorizer.load(str(tmp_path / "vectorizer"))
+    np.testing.assert_allclose(restored.transform(CORPUS).toarray(),
+                               sp.vstack(batches).toarray())
+
+
+def test_vectorizer_max_features_bounds_vocabulary():
+    """Test que le vocabulaire est borné et que les tokens inconnus sont ignorés"""
+    from app.preprocessing.text.vectorizer import TextVectorizer
+
+    vectorizer = TextVectorizer({"mode": "vocabulary", "max_features": 3, "tfidf": False,
+                                 "norm": None}).fit(CORPUS)
+    assert vectorizer.vocabulary == {"the": 0, "cat": 1, "sat": 2}
+    matrix = vectorizer.transform(["the the cat zebra"])
+    assert matrix.toarray().tolist() == [[2.0, 1.0, 0.0]]
+
+
+def test_preprocessor_state_round_trip(tmp_path, images):
+    """Test le format d'état versionné (config + état, sans pickle)"""
+    import json
+    preprocessor = ImagePreprocessor({"target_size": (16, 12), "normalize": True}).fit(images)
+    preprocessor.save(str(tmp_path / "image"))
+    document = json.loads((tmp_path / "image" / "state.json").read_text())
+    assert document["format_version"] == 1
+    assert document["class"] == "ImagePreprocessor"
+
+    restored = ImagePreprocessor.load(str(tmp_path / "image"))
+    assert restored.is_fitted and restored.target_size == (16, 12)
+    np.testing.assert_array_equal(restored.transform(images), preprocessor.transform(images))
+
+    from app.preprocessing.text.vectorizer import TextVectorizer
+    with pytest.raises(TypeError):
+        TextVectorizer.load(str(tmp_path / "image"))
+
+
+def test_save_replaces_only_preprocessor_artifacts(tmp_path, images):
+    """Test que la sauvegarde remplace un artefact mais refuse tout autre chemin"""
+    first = ImagePreprocessor({"target_size": (8, 8)}).fit(images)
+    second = ImagePreprocessor({"target_size": (4, 6)}).fit(images)
+    first.save(str(tmp_path / "image"))
+    second.save(str(tmp_path / "image"))
+    assert ImagePreprocessor.load(str(tmp_path / "image")).target_size == (4, 6)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["image"]
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "train.csv").write_text("x\n1\n")
+    (tmp_path / "notes.txt").write_text("à garder")
+    for target in ("data", "notes.txt"):
+        with pytest.raises(FileExistsError):
+            second.save(str(tmp_path / target))
+    assert (tmp_path / "data" / "train.csv").read_text() == "x\n1\n"
+    assert (tmp_path / "notes.txt").read_text() == "à garder"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["data", "image", "notes.txt"]
+
+
+def test_vectorizer_state_is_memory_mapped(tmp_path):
+    """Test le chargement en mémoire mappée et la reprise de l'ajustement"""
+    from app.preprocessing.text.vectorizer import TextVectorizer
+
+    vectorizer = TextVectorizer({"mode": "vocabulary"}).fit(CORPUS[:3])
+    vectorizer.save(str(tmp_path / "vectorizer"))
+    restored = TextVectorizer.load(str(tmp_path / "vectorizer"))
+    assert isinstance(restored.document_frequency, np.memmap)
+
+    restored.partial_fit(CORPUS[3:])
+    vectorizer.partial_fit(CORPUS[3:])
+    assert restored.vocabulary == vectorizer.vocabulary
+    np.testing.assert_array_equal(restored.document_frequency, vectorizer.document_frequency)
+
+
+def test_legacy_pickle_requires_opt_in(tmp_path, images):
+    """Test que les anciens artefacts pickle ne sont chargés que sur demande"""
+    import pickle
+    from app.preprocessing.serialization import save_preprocessor
+    preprocessor = ImagePreprocessor({"target_size": (8, 8)}).fit(images)
+    path = tmp_path / "legacy.pkl"
+    path.write_bytes(pickle.dumps(preprocessor))
+
+    with pytest.raises(ValueError):
+        ImagePreprocessor.load(str(path))
+    assert ImagePreprocessor.load(str(path), allow_pickle=True).target_size == (8, 8)
+
+    class Custom(ImagePreprocessor):
+        pass
+
+    with pytest.raises(ValueError):
+        save_preprocessor(Custom().fit([]), str(tmp_path / "custom"))
+
+
+def test_pipeline_fuses_elementwise_steps_and_records_stats(text_preprocessor):
+    """Test l'enchaînement fusionné, paresseux, et les mesures par étape"""
+    from app.preprocessing.pipeline import Pipeline
+    from app.preprocessing.text.vectorizer import TextVectorizer
+
+    pipeline = Pipeline([
+        ("strip", str.strip),
+        ("clean", text_preprocessor),
+        ("tfidf", TextVectorizer({"mode": "vocabulary", "batch_size": 2})),
+    ]).fit(CORPUS)
+    assert [len(stage) for stage in pipeline._stages(pipeline.steps)] == [2, 1]
+
+    pulled = []
+
+    def source():
+        for doc in CORPUS:
+            pulled.append(doc)
+            yield f"  {doc}  "
+
+    stream = pipeline.iter_transform(source())
+    first = next(stream)
+    assert first.shape[0] == 2 and len(pulled) == 2
+    batches = [first, *stream]
+    expected = pipeline.named_steps["tfidf"].transform(text_preprocessor.transform(CORPUS))
+    np.testing.assert_allclose(sp.vstack(batches).toarray(), expected.toarray())
+
+    stats = {s["name"]: s for s in pipeline.stats()}
+    assert [s["name"] for s in pipeline.stats()] == ["strip", "clean", "tfidf"]
+    assert stats["strip"]["items_out"] == stats["clean"]["items_in"] == 5
+    assert stats["tfidf"]["items_in"] == 5 and stats["tfidf"]["items_out"] == 3
+    assert stats["tfidf"]["bytes_out"] > 0
+    assert all(s["seconds"] >= 0 for s in stats.values())
+
+
+def test_pipeline_batches_steps_without_iter_transform():
+    """Test une étape sans iter_transform, appelée par lots"""
+    from app.preprocessing.pipeline import FunctionStep, Pipeline
+
+    class Stack(FunctionStep):
+        elementwise = False
+
+        def transform(self, data):
+            return np.stack(data)
+
+    pipeline = Pipeline([Stack(None)], config={"batch_size": 2}).fit([])
+    out = pipeline.transform(np.zeros((3, 4)))
+    assert [o.shape for o in out] == [(2, 4), (1, 4)]
+
+
+def test_pipeline_state_round_trip(tmp_path, text_preprocessor):
+    """Test la sauvegarde d'un pipeline et de ses étapes"""
+    from app.preprocessing.pipeline import Pipeline
+    from app.preprocessing.text.vectorizer import TextVectorizer
+
+    pipeline = Pipeline([
+        text_preprocessor, TextVectorizer({"mode": "vocabulary"})
+    ]).fit(CORPUS)
+    pipeline.save(str(tmp_path / "pipeline"))
+    restored = Pipeline.load(str(tmp_path / "pipeline"))
+    assert [name for name, _ in restored.steps] == ["textpreprocessor", "textvectorizer"]
+    np.testing.assert_allclose(restored.transform(CORPUS)[0].toarray(),
+                               pipeline.transform(CORPUS)[0].toarray())
+
+    with pytest.raises(ValueError):
+        Pipeline([str.lower]).fit([]).save(str(tmp_path / "lambda"))
+
+
+class CountingTextPreprocessor:
+    """Compte les appels réels à transform()"""
+
+    def __init__(self, preprocessor):
+        self.calls = 0
+        original = preprocessor.transform
+
+        def transform(data):
+            self.calls += 1
+            return original(data)
+
+        preprocessor.transform = transform
+
+
+def test_transform_cache_memory_and_disk(tmp_path, text_preprocessor):
+    """Test les hits mémoire/disque et l'invalidation par la config"""
+    from app.preprocessing.cache import TransformCache
+
+    counter = CountingTextPreprocessor(text_preprocessor)
+    cache = TransformCache(path=str(tmp_path / "cache"))
+    text_preprocessor.set_cache(cache)
+    docs = ["The cat sat", "A dog"]
+
+    first = text_preprocessor.cached_transform(docs)
+    assert text_preprocessor.cached_transform(iter(docs)) == first == ["cat sat", "dog"]
+    assert counter.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    text_preprocessor.cached_transform(["another doc"])
+    text_preprocessor.config["lemmatize"] = True
+    text_preprocessor.cached_transform(docs)
+    assert counter.calls == 3
+
+    # Nouveau processus : seul le cache disque subsiste
+    restored = TransformCache(path=str(tmp_path / "cache"))
+    text_preprocessor.config["lemmatize"] = False
+    assert text_preprocessor.set_cache(restored).cached_transform(docs) == first
+    assert counter.calls == 3
+    assert restored.stats()["disk_hits"] == 1
+
+
+def test_transform_cache_evicts_by_size(images):
+    """Test l'éviction LRU bornée en octets et les résultats en lecture seule"""
+    from app.preprocessing.cache import TransformCache
+
+    preprocessor = ImagePreprocessor({"target_size": (8, 8)}).fit([])
+    one_result = 8 * 8 * 3 * 4
+    cache = TransformCache(max_bytes=2 * one_result)
+    preprocessor.set_cache(cache)
+
+    results = [preprocessor.cached_transform([image]) for image in images]
+    assert not results[0].flags.writeable
+    stats = cache.stats()
+    assert stats["items"] == 2 and stats["evictions"] == 1 and stats["bytes"] == 2 * one_result
+    preprocessor.cached_transform([images[0]])
+    assert cache.stats()["misses"] == 4
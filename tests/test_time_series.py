@@ -0,0 +1,284 @@
+import numpy as np
+import pytest
+from app.services.time_series_windows import make_windows, iter_window_batches
+
+
+def legacy_windows(data, sequence_length):
+    """Référence : ancienne boucle de TimeSeriesTrainer.prepare_data"""
+    data = data.reshape(-1, 1)
+    X, y = [], []
+    for i in range(len(data) - sequence_length):
+        X.append(data[i:(i + sequence_length)])
+        y.append(data[i + sequence_length])
+    return np.array(X), np.array(y)
+
+
+def test_make_windows_matches_legacy_loop():
+    """Test l'équivalence avec l'ancienne boucle pour une série univariée"""
+    data = np.arange(50, dtype=np.float64)
+    X, y = make_windows(data, 10)
+    X_ref, y_ref = legacy_windows(data, 10)
+
+    assert X.shape == X_ref.shape
+    assert y.shape == y_ref.shape
+    np.testing.assert_array_equal(X, X_ref)
+    np.testing.assert_array_equal(y, y_ref)
+
+
+def test_make_windows_is_zero_copy_view():
+    """Test que les fenêtres partagent la mémoire des données sauf copie explicite"""
+    data = np.random.rand(100, 1)
+    X, _ = make_windows(data, 5)
+    assert np.shares_memory(X, data)
+    assert not X.flags.writeable
+
+    X_copy, _ = make_windows(data, 5, copy=True)
+    assert not np.shares_memory(X_copy, data)
+    assert X_copy.flags.c_contiguous
+
+
+def test_make_windows_multivariate_stride_horizon():
+    """Test les séries multivariées avec pas et horizon"""
+    data = np.arange(60, dtype=np.float64).reshape(30, 2)
+    X, y = make_windows(data, 4, horizon=3, stride=2, target_columns=[1])
+
+    n_windows = (30 - 4 - 3) // 2 + 1
+    assert X.shape == (n_windows, 4, 2)
+    assert y.shape == (n_windows, 3)
+    np.testing.assert_array_equal(X[1], data[2:6])
+    np.testing.assert_array_equal(y[1], data[6:9, 1])
+
+
+def test_make_windows_too_short():
+    """Test une série trop courte pour la fenêtre demandée"""
+    with pytest.raises(ValueError):
+        make_windows(np.arange(5), 5)
+
+
+def test_iter_window_batches_covers_all_windows():
+    """Test que les lots couvrent chaque fenêtre une fois par époque"""
+    X, y = make_windows(np.arange(40, dtype=np.float64), 5)
+    batches = iter_window_batches(X, y, batch_size=8, seed=0)
+    n_batches = int(np.ceil(len(X) / 8))
+    seen = np.concatenate([next(batches)[1] for _ in range(n_batches)])
+    np.testing.assert_array_equal(np.sort(seen.ravel()), y.ravel())
+
+
+def test_backend_registry_imports_lazily():
+    """Test que les frameworks ne sont importés qu'à la première demande"""
+    from app.services import backends
+
+    backends.register_backend("fake", {"dumps": "json:dumps"})
+    assert not backends.is_loaded("fake")
+
+    backend = backends.get_backend("fake")
+    assert backends.is_loaded("fake")
+    assert backend.dumps([1]) == "[1]"
+    assert backends.get_backend("fake") is backend
+
+
+def test_backend_registry_unknown_model_type():
+    """Test un type de modèle sans framework associé"""
+    from app.services import backends
+
+    with pytest.raises(ValueError):
+        backends.get_model_backend("invalid_type")
+
+
+@pytest.fixture
+def ar_series():
+    """Série AR(1) synthétique"""
+    rng = np.random.default_rng(42)
+    values = np.zeros(120)
+    for t in range(1, len(values)):
+        values[t] = 0.7 * values[t - 1] + rng.normal()
+    return values
+
+
+def test_candidate_orders_grid():
+    """Test la génération de la grille, du plus simple au plus complexe"""
+    from app.services.order_search import candidate_orders
+
+    candidates = candidate_orders([0, 1], [0], [0, 1], P=[0, 1], s=12)
+    assert len(candidates) == 8
+    assert candidates[0] == ((0, 0, 0), (0, 0, 0, 12))
+    assert candidates[-1] == ((1, 0, 1), (1, 0, 0, 12))
+    assert candidate_orders([1], [1], [1])[0][1] == (0, 0, 0, 0)
+
+
+def test_search_orders_ranks_and_caches(ar_series):
+    """Test le classement par AIC et la réutilisation du cache"""
+    from app.services.order_search import OrderSearchCache, candidate_orders, search_orders
+
+    cache = OrderSearchCache()
+    candidates = candidate_orders([0, 1], [0], [0, 1])
+    ranking = search_orders(ar_series, candidates, criterion="aic", n_jobs=1, cache=cache)
+
+    assert len(ranking) == len(candidates)
+    ok = [r for r in ranking if r["status"] == "ok"]
+    assert ok and ok[0]["order"][0] == 1
+    assert [r["score"] for r in ok] == sorted(r["score"] for r in ok)
+
+    misses = cache.misses
+    search_orders(ar_series, candidates, criterion="aic", n_jobs=1, cache=cache)
+    assert cache.misses == misses
+    assert cache.hits >= len(candidates)
+
+
+def test_search_orders_prunes_clearly_worse(ar_series):
+    """Test l'élagage des candidats nettement moins bons au criblage"""
+    from app.services.order_search import search_orders
+
+    candidates = [((0, 0, 0), (0, 0, 0, 0)), ((1, 0, 0), (0, 0, 0, 0))]
+    ranking = search_orders(ar_series, candidates, n_jobs=1, prune_delta=1.0, cache=None)
+    statuses = {r["order"]: r["status"] for r in ranking}
+    assert statuses[(1, 0, 0)] == "ok"
+    assert statuses[(0, 0, 0)] == "pruned"
+
+
+def test_search_orders_holdout_requires_window(ar_series):
+    """Test le critère holdout sans fenêtre de validation"""
+    from app.services.order_search import search_orders
+
+    with pytest.raises(ValueError):
+        search_orders(ar_series, [((1, 0, 0), (0, 0, 0, 0))], criterion="holdout")
+
+
+@pytest.fixture
+def long_frame(ar_series):
+    """Table longue (series_id, ds, y) avec trois séries, dont une trop courte"""
+    import pandas as pd
+
+    frames = [
+        pd.DataFrame({
+            "series_id": series_id,
+            "ds": pd.date_range("2024-01-01", periods=n, freq="D"),
+            "y": ar_series[:n] + offset,
+        })
+        for series_id, n, offset in (("b", 60, 10.0), ("a", 80, 0.0), ("c", 2, 0.0))
+    ]
+    return pd.concat(frames).sample(frac=1, random_state=0)
+
+
+def test_split_series_groups_and_sorts(long_frame):
+    """Test le découpage d'une table longue en séries triées par date"""
+    from app.services.batch_forecasting import split_series
+
+    series = {sid: (ds, y) for sid, ds, y in split_series(long_frame)}
+    assert set(series) == {"a", "b", "c"}
+    ds, y = series["a"]
+    assert len(y) == 80
+    assert (np.diff(ds) > np.timedelta64(0)).all()
+
+
+def test_train_batch_streams_results_and_summary(long_frame):
+    """Test la prévision par lots avec résultats par série et résumé final"""
+    from app.services.time_series_training import TimeSeriesTrainer
+
+    results = list(TimeSeriesTrainer().train_batch(
+        long_frame, "arima", {"order": [1, 0, 0]}, horizon=5, holdout=5, max_workers=1
+    ))
+    summary = results[-1]["summary"]
+    by_id = {r["series_id"]: r for r in results[:-1]}
+
+    assert summary["series"] == 3
+    assert summary["failed"] == 1
+    assert summary["series_per_second"] > 0
+    assert by_id["c"]["status"] == "failed"
+    assert len(by_id["a"]["forecast"]["yhat"]) == 5
+    assert by_id["a"]["forecast"]["ds"][0].startswith("2024-03-21")
+    assert set(by_id["b"]["metrics"]) == {"rmse", "mae"}
+
+
+def test_train_batch_rejects_unsupported_type(long_frame):
+    """Test un type de modèle non pris en charge par lots"""
+    from app.services.time_series_training import TimeSeriesTrainer
+
+    with pytest.raises(ValueError):
+        TimeSeriesTrainer().train_batch(long_frame, "lstm", max_workers=1)
+
+
+def test_read_long_csv_in_chunks_matches_full_read(long_frame):
+    """Test la lecture par blocs d'une table longue"""
+    import io
+    import pandas as pd
+    from app.services.batch_forecasting import read_long_csv, split_series
+
+    content = long_frame.to_csv(index=False).encode()
+    frame = read_long_csv(io.BytesIO(content), chunksize=7)
+    reference = pd.read_csv(io.BytesIO(content))
+    assert len(frame) == len(long_frame)
+    assert frame["ds"].dtype == np.dtype("datetime64[ns]")
+    for (sid, ds, y), (ref_sid, ref_ds, ref_y) in zip(split_series(frame), split_series(reference)):
+        assert sid == ref_sid
+        np.testing.assert_array_equal(ds, ref_ds)
+        np.testing.assert_array_equal(y, ref_y)
+
+    with pytest.raises(ValueError):
+        read_long_csv(io.BytesIO(b"series_id,y\na,1\n"))
+
+
+class RecordingExecutor:
+    """Pool de threads qui garde ses futures et le pic de lots simultanés"""
+
+    def __init__(self, max_workers):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._pool = ThreadPoolExecutor(max_workers)
+        self._lock = threading.Lock()
+        self.futures, self.running, self.peak = [], 0, 0
+
+    def submit(self, fn, *args):
+        def run():
+            with self._lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        future = self._pool.submit(run)
+        self.futures.append(future)
+        return future
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def test_run_batch_bounds_chunks_in_flight(long_frame):
+    """Test que max_in_flight borne les lots soumis au pool"""
+    from app.services.batch_forecasting import run_batch
+    from app.services.time_series_training import TimeSeriesTrainer
+
+    executor = RecordingExecutor(4)
+    try:
+        results = list(run_batch(long_frame, "arima", {"order": [1, 0, 0]}, horizon=2,
+                                 executor=executor, chunk_size=1, max_in_flight=2))
+    finally:
+        executor.shutdown()
+    assert results[-1]["summary"]["series"] == 3
+    assert len(executor.futures) == 3 and executor.peak <= 2
+
+    with pytest.raises(ValueError):
+        TimeSeriesTrainer().train_batch(long_frame, max_workers=10_000)
+
+
+def test_run_batch_cancel_drops_pending_chunks(long_frame):
+    """Test l'annulation d'un lot (client déconnecté) : les lots en file sont annulés"""
+    from app.services.batch_forecasting import run_batch
+
+    executor = RecordingExecutor(1)
+    try:
+        results = run_batch(long_frame, "arima", {"order": [1, 0, 0]}, horizon=2,
+                            executor=executor, chunk_size=1, max_in_flight=3)
+        first = next(results)
+        results.cancel()
+        assert list(results) == []
+    finally:
+        executor.shutdown()
+    assert "series_id" in first
+    assert len(executor.futures) == 3
+    assert any(future.cancelled() for future in executor.futures)
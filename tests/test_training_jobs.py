@@ -0,0 +1,160 @@
+import time
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.time_series_models import TimeSeriesModel
+from app.services import training_jobs
+from app.services.training_jobs import (
+    CANCELLED, COMPLETED, FAILED, QUEUED, RUNNING, QueueFullError, TrainingJobManager, _run_job
+)
+
+
+@pytest.fixture
+def Session(tmp_path, monkeypatch):
+    """Base SQLite temporaire, partagée avec les workers (lancés en spawn)"""
+    url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    engine = create_engine(url)
+    TimeSeriesModel.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(training_jobs, "SessionLocal", Session)
+    return Session
+
+
+def add_row(Session, job_id, status):
+    with Session() as db:
+        row = TimeSeriesModel(name="arima_model", type="arima", job_id=job_id, status=status)
+        db.add(row)
+        db.commit()
+        return row.id
+
+
+def status_of(Session, job_id):
+    with Session() as db:
+        return db.query(TimeSeriesModel).filter(TimeSeriesModel.job_id == job_id).one().status
+
+
+def test_train_route_runs_job_in_background(Session, monkeypatch):
+    """Test le 202 de /train, le suivi de la tâche et sa persistance"""
+    from app.api.endpoints import time_series
+
+    manager = TrainingJobManager(max_workers=1)
+    monkeypatch.setattr(time_series, "job_manager", manager)
+    app = FastAPI()
+    app.include_router(time_series.router, prefix="/ts")
+    client = TestClient(app)
+    data = list(np.sin(np.arange(60) / 5) + np.arange(60) / 30)
+    try:
+        response = client.post("/ts/train", json={
+            "type": "arima", "parameters": {"data": data, "order": [1, 0, 0]}
+        })
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == QUEUED
+
+        deadline = time.monotonic() + 120
+        while job["status"] not in (COMPLETED, FAILED) and time.monotonic() < deadline:
+            time.sleep(0.2)
+            job = client.get(f"/ts/jobs/{job['job_id']}").json()
+        assert job["status"] == COMPLETED, job
+        assert job["progress"] == 1.0
+        assert status_of(Session, job["job_id"]) == COMPLETED
+        # Annuler une tâche terminée ne change rien
+        assert client.delete(f"/ts/jobs/{job['job_id']}").json()["status"] == COMPLETED
+        assert client.get("/ts/jobs/inconnue").status_code == 404
+    finally:
+        manager.shutdown()
+
+
+def test_failed_job_is_recorded(Session):
+    """Test qu'une erreur d'entraînement est exposée et persistée"""
+    manager = TrainingJobManager(max_workers=1)
+    try:
+        job = manager.submit({"type": "arima", "parameters": {}})
+        deadline = time.monotonic() + 120
+        while job["status"] not in (COMPLETED, FAILED) and time.monotonic() < deadline:
+            time.sleep(0.2)
+            job = manager.get(job["job_id"])
+        assert job["status"] == FAILED and job["error"]
+        assert status_of(Session, job["job_id"]) == FAILED
+    finally:
+        manager.shutdown()
+
+
+def test_submit_rejects_jobs_beyond_queue_limit(Session):
+    """Test la borne MAX_QUEUED_JOBS (429 côté API)"""
+    manager = TrainingJobManager(max_workers=1, max_queued=1)
+    try:
+        job = manager.submit({"type": "arima", "parameters": {}})
+        with pytest.raises(QueueFullError):
+            manager.submit({"type": "arima", "parameters": {}})
+        deadline = time.monotonic() + 120
+        while job["status"] not in (COMPLETED, FAILED) and time.monotonic() < deadline:
+            time.sleep(0.2)
+            job = manager.get(job["job_id"])
+    finally:
+        manager.shutdown()
+
+
+def test_cancel_job_known_only_in_database(Session):
+    """Test l'annulation d'une tâche d'une exécution précédente (pas d'état en mémoire)"""
+    add_row(Session, "ancienne", RUNNING)
+    manager = TrainingJobManager()
+    assert manager.cancel("ancienne")["status"] == CANCELLED
+    assert status_of(Session, "ancienne") == CANCELLED
+    assert manager.get("ancienne")["status"] == CANCELLED
+    assert manager.cancel("inconnue") is None
+
+
+def test_run_job_with_cancel_flag_sets_cancelled(Session):
+    """Test qu'une tâche annulée dans la file d'appel du pool passe à CANCELLED"""
+    model_id = add_row(Session, "en-file", QUEUED)
+    state = {"en-file": {"job_id": "en-file", "model_id": model_id, "status": QUEUED}}
+    job = _run_job("en-file", model_id, {"type": "arima"}, state, {"en-file": True})
+    assert job["status"] == CANCELLED and state["en-file"]["status"] == CANCELLED
+    assert status_of(Session, "en-file") == CANCELLED
+
+
+def test_reconcile_fails_interrupted_jobs(Session):
+    """Test qu'au démarrage les tâches restées en attente ou en cours passent en échec"""
+    add_row(Session, "a", QUEUED)
+    add_row(Session, "b", RUNNING)
+    add_row(Session, "c", COMPLETED)
+    assert TrainingJobManager().reconcile() == 2
+    assert [status_of(Session, j) for j in "abc"] == [FAILED, FAILED, COMPLETED]
+    assert TrainingJobManager().reconcile() == 0
+
+
+def _run_search_job(job_id, model_id, config, results):
+    """Exécute _run_job dans un processus enfant, sans pool imbriqué possible"""
+    from app.services import order_search
+
+    def nested_pool(*args, **kwargs):
+        raise AssertionError("pool de processus créé dans un worker")
+
+    order_search.ProcessPoolExecutor = nested_pool
+    state = {job_id: {"job_id": job_id, "model_id": model_id, "status": QUEUED}}
+    results.put(_run_job(job_id, model_id, config, state, {}))
+
+
+def test_order_search_in_job_worker_fits_sequentially(Session):
+    """Test qu'une recherche d'ordres dans une tâche n'ouvre pas de second pool"""
+    import multiprocessing
+
+    model_id = add_row(Session, "recherche", QUEUED)
+    data = list(np.sin(np.arange(60) / 5) + np.arange(60) / 30)
+    config = {"type": "arima", "parameters": {
+        "data": data, "search": {"p": [0, 1], "d": [0], "q": [0, 1], "n_jobs": 4}
+    }}
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    worker = context.Process(target=_run_search_job,
+                             args=("recherche", model_id, config, results))
+    worker.start()
+    job = results.get(timeout=120)
+    worker.join(timeout=30)
+    assert job["status"] == COMPLETED, job
+    assert status_of(Session, "recherche") == COMPLETED